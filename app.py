@@ -6,7 +6,7 @@ root_dir = os.path.dirname(os.path.abspath(__file__))
 if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
-from flask import Flask, abort, render_template, request, send_from_directory
+from flask import Flask, abort, jsonify, redirect, render_template, request, send_from_directory, url_for
 
 
 app = Flask(__name__)
@@ -20,7 +20,7 @@ UPLOAD_FOLDER = app.config['UPLOAD_FOLDER']
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 
-@app.route("/uploads/<filename>")
+@app.route("/uploads/<path:filename>")
 def uploaded_file(filename):
     path = os.path.join(UPLOAD_FOLDER, filename)
     if not os.path.isfile(path):
@@ -36,6 +36,59 @@ def uploaded_file(filename):
 def download_pdf():
     return send_from_directory(os.path.dirname(__file__), "Backend_Documentation.pdf", as_attachment=True)
 
+
+def _job_response(job):
+    """Job state as JSON, with output video names turned into download links."""
+    body = {
+        "id": job["id"],
+        "status": job["status"],
+        "options": job.get("options", {}),
+        "created": job.get("created"),
+        "started": job.get("started"),
+        "finished": job.get("finished"),
+        "error": job.get("error"),
+        "result": None,
+        "status_url": url_for("job_status", job_id=job["id"]),
+    }
+    result = job.get("result")
+    if result:
+        result = dict(result)
+        for key in ("output_video", "narrated_video", "smart_edit_video"):
+            if result.get(key):
+                name = "jobs/%s/%s" % (job["id"], result[key])
+                result[key + "_url"] = url_for("uploaded_file", filename=name)
+        body["result"] = result
+    return body
+
+
+@app.route("/jobs", methods=["POST"])
+def create_job():
+    from summarizer.jobs import JOB_OPTIONS, JobQueueFull, submit_job
+
+    video_file = request.files.get("video_file")
+    if not video_file or not video_file.filename:
+        return jsonify({"error": "Please upload a video."}), 400
+    options = {k: request.form.get(k) in ("on", "1", "true") for k in JOB_OPTIONS}
+    if not any(options.values()):
+        return jsonify({"error": "Please select at least one processing option."}), 400
+
+    try:
+        job = submit_job(UPLOAD_FOLDER, video_file, options)
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify(_job_response(job)), 202
+
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    from summarizer.jobs import load_job
+
+    job = load_job(UPLOAD_FOLDER, job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+    return jsonify(_job_response(job))
+
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     return handle_request('index.html')
@@ -56,7 +109,37 @@ def handle_request(template_name):
     youtube_title = ""
     # Common
     msg = ""
-    msg_type = "success"  # success | error
+    msg_type = "success"  # success | error | pending
+    job_status_url = ""
+
+    if request.method == "GET" and request.args.get("job"):
+        from summarizer.jobs import load_job
+
+        job = load_job(UPLOAD_FOLDER, request.args.get("job"))
+        if job is None:
+            msg = "Job not found."
+            msg_type = "error"
+        elif job["status"] == "done":
+            result = job["result"]
+            # Output names are relative to the job folder; the template links them under /uploads/
+            prefix = "jobs/%s/" % job["id"]
+            summary = result["summary"]
+            output_video = result["output_video"] and prefix + result["output_video"]
+            caption_text = result["caption_text"]
+            caption_srt = result["caption_srt"]
+            narrated_summary = result["narrated_summary"]
+            narrated_video = result["narrated_video"] and prefix + result["narrated_video"]
+            smart_edit_summary = result["smart_edit_summary"]
+            smart_edit_video = result["smart_edit_video"] and prefix + result["smart_edit_video"]
+            msg = result["msg"]
+            msg_type = result["msg_type"]
+        elif job["status"] == "error":
+            msg = job["error"]
+            msg_type = "error"
+        else:
+            msg = "Processing your video. Results will appear here when they are ready."
+            msg_type = "pending"
+            job_status_url = url_for("job_status", job_id=job["id"])
 
     if request.method == "POST":
         video_file = request.files.get("video_file")
@@ -72,61 +155,19 @@ def handle_request(template_name):
                 msg_type = "error"
             else:
                 try:
-                    input_path = os.path.join(UPLOAD_FOLDER, video_file.filename)
-                    video_file.save(input_path)
-
-                    if do_summary:
-                        from summarizer.video_summarizer import summarize_video
-                        output_path = os.path.join(UPLOAD_FOLDER, "summary_video.mp4")
-                        summary = summarize_video(input_path, output_path)
-                        output_video = "summary_video.mp4"
-
-                    if do_caption:
-                        from summarizer.auto_caption import transcribe_video
-                        cap = transcribe_video(input_path)
-                        if cap.get("error"):
-                            if msg:
-                                msg += " "
-                            msg += "Caption: " + cap["error"]
-                            msg_type = "error"
-                        else:
-                            caption_text = cap.get("text", "")
-                            caption_srt = cap.get("srt", "")
-
-                    if do_narrated:
-                        from summarizer.smart_cutter import create_narrated_summary
-                        narrated_output = os.path.join(UPLOAD_FOLDER, "narrated_summary.mp4")
-                        result = create_narrated_summary(input_path, narrated_output)
-                        if result.get("success"):
-                            narrated_summary = result.get("summary_text", "")
-                            narrated_video = "narrated_summary.mp4"
-                            if not msg:
-                                msg = "Narrated summary created successfully!"
-                        else:
-                            if msg:
-                                msg += " "
-                            msg += "Narrated Summary: " + (result.get("error") or "Unknown error")
-                            msg_type = "error"
-
-                    if do_smart_edit:
-                        from summarizer.smart_edit import create_smart_edit
-                        smart_edit_output = os.path.join(UPLOAD_FOLDER, "smart_edit.mp4")
-                        result = create_smart_edit(input_path, smart_edit_output)
-                        if result.get("success"):
-                            smart_edit_summary = result.get("summary_text", "")
-                            smart_edit_video = "smart_edit.mp4"
-                            if not msg:
-                                msg = "Smart edit created successfully!"
-                        else:
-                            if msg:
-                                msg += " "
-                            msg += "Smart Edit: " + (result.get("error") or "Unknown error")
-                            msg_type = "error"
-
-                    if msg_type != "error" and not msg:
-                        msg = "Video processed successfully!"
-                        msg_type = "success"
+                    from summarizer.jobs import JobQueueFull, submit_job
 
+                    job = submit_job(UPLOAD_FOLDER, video_file, {
+                        "do_summary": do_summary,
+                        "do_caption": do_caption,
+                        "do_narrated": do_narrated,
+                        "do_smart_edit": do_smart_edit,
+                    })
+                    # The job page polls GET /jobs/<id> and shows the results once it is done
+                    return redirect(url_for("index", job=job["id"]))
+                except JobQueueFull as e:
+                    msg = str(e)
+                    msg_type = "error"
                 except Exception as e:
                     msg = "Error processing video: " + str(e)
                     msg_type = "error"
@@ -214,6 +255,7 @@ def handle_request(template_name):
         youtube_title=youtube_title,
         msg=msg,
         msg_type=msg_type,
+        job_status_url=job_status_url,
     )
 
 
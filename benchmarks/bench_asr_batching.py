@@ -0,0 +1,86 @@
+"""
+Benchmark long-form Whisper transcription throughput vs. batch size on CPU.
+
+Runs transcribe_audio once in a single call (no chunking) and then in chunked
+mode with each batch size, each in a fresh process so peak RSS is comparable.
+Without an input file a synthetic tone/noise track is used (throughput is then
+dominated by the encoder; use real speech for decoder-heavy numbers).
+
+Usage:
+    python benchmarks/bench_asr_batching.py [video_or_audio] [--seconds 300] [--batch-sizes 1,2,4,8]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+import numpy as np
+
+
+def synthetic_audio(seconds, sr=16000):
+    """Tone bursts over low noise, so windows are not silent."""
+    t = np.arange(int(seconds * sr)) / sr
+    tone = 0.2 * np.sin(2 * np.pi * (220 + 40 * np.floor(t / 3) % 400) * t)
+    envelope = (np.sin(2 * np.pi * t / 4) > 0).astype(np.float32)
+    noise = 0.01 * np.random.default_rng(0).standard_normal(t.shape)
+    return (tone * envelope + noise).astype(np.float32)
+
+
+def _run(config, audio, queue):
+    from summarizer.auto_caption import _get_pipe, transcribe_audio
+
+    _get_pipe()  # load outside the timed region
+    chunk, batch = config
+    started = time.perf_counter()
+    out = transcribe_audio(audio, chunk_length_s=chunk, batch_size=batch)
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    queue.put((elapsed, peak_mb, len(out["segments"]), out["error"]))
+
+
+def run_config(config, audio):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(config, audio, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("media", nargs="?", help="video or audio file (default: synthetic audio)")
+    parser.add_argument("--seconds", type=float, default=300, help="length of the synthetic audio")
+    parser.add_argument("--chunk", type=float, default=30)
+    parser.add_argument("--batch-sizes", default="1,2,4,8")
+    args = parser.parse_args()
+
+    if args.media:
+        from summarizer.auto_caption import load_audio_16k
+
+        audio = load_audio_16k(args.media)
+        if audio["error"]:
+            sys.exit(audio["error"])
+    else:
+        audio = {"array": synthetic_audio(args.seconds), "sampling_rate": 16000, "error": None}
+    duration = len(audio["array"]) / audio["sampling_rate"]
+    print(f"Audio: {duration:.0f}s, torch threads per process: default")
+
+    configs = [(0, 1)] + [(args.chunk, int(b)) for b in args.batch_sizes.split(",")]
+    for chunk, batch in configs:
+        elapsed, peak_mb, segments, error = run_config((chunk, batch), audio)
+        label = "single call" if not chunk else f"chunked bs={batch}"
+        status = f"error: {error}" if error else f"{segments} segments"
+        print(f"  {label:<16} {elapsed:8.1f}s  {duration / elapsed:6.1f}x realtime  "
+              f"peak RSS {peak_mb:7.0f} MB  ({status})")
+
+
+if __name__ == "__main__":
+    main()
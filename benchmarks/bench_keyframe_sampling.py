@@ -0,0 +1,86 @@
+"""
+Benchmark keyframe sampling strategies used by summarize_video.
+
+Compares the legacy read-every-frame loop with grab()-based and seek-based
+sampling. Without an input video a synthetic 1080p clip is generated.
+
+Usage:
+    python benchmarks/bench_keyframe_sampling.py [video.mp4] [--interval 30] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+import cv2
+import numpy as np
+
+from summarizer.video_summarizer import SAMPLING_MODES, _iter_keyframes
+
+
+def make_synthetic_video(path, seconds=20, fps=30, size=(1920, 1080)):
+    """Write a moving-gradient test clip so every frame differs."""
+    w, h = size
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+    base = np.tile(np.linspace(0, 255, w, dtype=np.uint8), (h, 1))
+    for i in range(seconds * fps):
+        shifted = np.roll(base, i * 8, axis=1)
+        frame = cv2.merge([shifted, np.roll(shifted, h // 3, axis=0), 255 - shifted])
+        cv2.putText(frame, str(i), (50, 150), cv2.FONT_HERSHEY_SIMPLEX, 4, (255, 255, 255), 8)
+        out.write(frame)
+    out.release()
+
+
+def run_once(path, interval, sampling):
+    cap = cv2.VideoCapture(path)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    started = time.perf_counter()
+    indices = [index for index, _frame in _iter_keyframes(cap, total, interval, sampling)]
+    elapsed = time.perf_counter() - started
+    cap.release()
+    return elapsed, indices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", nargs="?", help="input video (default: synthetic 1080p clip)")
+    parser.add_argument("--interval", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    path = args.video
+    tmp = None
+    if not path:
+        fd, tmp = tempfile.mkstemp(suffix=".mp4")
+        os.close(fd)
+        print("Generating synthetic 1080p clip...")
+        make_synthetic_video(tmp)
+        path = tmp
+
+    try:
+        print(f"Video: {path}  interval={args.interval}")
+        reference = None
+        baseline = None
+        for sampling in ("read",) + tuple(m for m in SAMPLING_MODES if m != "read"):
+            times = []
+            for _ in range(args.repeat):
+                elapsed, indices = run_once(path, args.interval, sampling)
+                times.append(elapsed)
+            best = min(times)
+            if reference is None:
+                reference, baseline = indices, best
+            same = "same frames" if indices == reference else "DIFFERENT frames"
+            print(f"  {sampling:<5} {best:7.3f}s  {len(indices):5d} keyframes  "
+                  f"{baseline / best:5.2f}x vs read  ({same})")
+    finally:
+        if tmp:
+            os.remove(tmp)
+
+
+if __name__ == "__main__":
+    main()
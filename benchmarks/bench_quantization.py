@@ -0,0 +1,156 @@
+"""
+Benchmark int8 dynamic quantization against float32 for Whisper and BART on CPU.
+
+For each dtype a fresh process loads the model, runs every sample and reports
+mean latency and peak RSS. Output agreement uses the float32 output as the
+reference: word error rate for transcripts, ROUGE-1 / ROUGE-L F1 for summaries.
+
+Usage:
+    python benchmarks/bench_quantization.py clip1.mp4 [clip2.mp4 ...] [--skip-asr] [--skip-summary]
+
+Summaries are computed from the float32 transcripts of the clips, or from the
+built-in sample texts when no clips are given.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+SAMPLE_TEXTS = [
+    "The city council met on Tuesday to discuss the new public transport plan. Officials said the plan "
+    "would add three bus lines and extend service hours on weekends. Residents raised concerns about "
+    "the cost, which is expected to reach forty million dollars over five years. The mayor argued that "
+    "better transit would reduce traffic and pollution, and said funding would come partly from a state "
+    "grant. A final vote is scheduled for next month after a series of public hearings in each district.",
+    "Researchers at the university have developed a battery that charges in under ten minutes. The team "
+    "used a new electrode material made from layered carbon, which allows ions to move more freely. In "
+    "laboratory tests the battery kept ninety percent of its capacity after two thousand cycles. The "
+    "researchers say the design could be used in electric cars and phones, but warn that manufacturing "
+    "at scale will take several more years of work and significant investment from industry partners.",
+]
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level Levenshtein distance divided by the reference length."""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1] / float(len(ref))
+
+
+def _f1(overlap, n_ref, n_hyp):
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / float(n_hyp), overlap / float(n_ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_1(reference, hypothesis):
+    from collections import Counter
+
+    ref, hyp = Counter(reference.lower().split()), Counter(hypothesis.lower().split())
+    return _f1(sum((ref & hyp).values()), sum(ref.values()), sum(hyp.values()))
+
+
+def rouge_l(reference, hypothesis):
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    if not ref or not hyp:
+        return 0.0
+    prev = [0] * (len(hyp) + 1)
+    for r in ref:
+        cur = [0]
+        for j, h in enumerate(hyp, 1):
+            cur.append(prev[j - 1] + 1 if r == h else max(prev[j], cur[j - 1]))
+        prev = cur
+    return _f1(prev[-1], len(ref), len(hyp))
+
+
+def _worker(task, dtype, inputs, queue):
+    # Settings are read at import time, so set them before importing the modules
+    os.environ["WHISPER_DTYPE"] = dtype
+    os.environ["SUMMARIZER_DTYPE"] = dtype
+    os.environ["TRANSCRIPT_CACHE"] = "0"
+    outputs = []
+    started_load = time.perf_counter()
+    if task == "asr":
+        from summarizer.auto_caption import _get_pipe, load_audio_16k, transcribe_audio
+
+        _get_pipe()
+        load_s = time.perf_counter() - started_load
+        audios = [load_audio_16k(path) for path in inputs]
+        started = time.perf_counter()
+        for audio in audios:
+            result = transcribe_audio(audio)
+            outputs.append(result["error"] and "ERROR: " + result["error"] or result["text"])
+    else:
+        from summarizer.model_registry import TRANSFORMERS_SUMMARIZATION, get_model
+        from summarizer.text_summarizer import SUMMARIZER_DTYPE, SUMMARIZER_MODEL
+
+        summarizer = get_model(TRANSFORMERS_SUMMARIZATION, SUMMARIZER_MODEL, SUMMARIZER_DTYPE)
+        load_s = time.perf_counter() - started_load
+        started = time.perf_counter()
+        for text in inputs:
+            outputs.append(summarizer(text, max_length=150, min_length=30, do_sample=False)[0]["summary_text"])
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    queue.put((outputs, elapsed / max(1, len(inputs)), load_s, peak_mb))
+
+
+def run(task, dtype, inputs):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_worker, args=(task, dtype, inputs, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def compare(task, inputs, metrics):
+    ref_out, ref_latency, ref_load, ref_rss = run(task, "float32", inputs)
+    q_out, q_latency, q_load, q_rss = run(task, "int8", inputs)
+    print(f"\n{task.upper()} ({len(inputs)} samples)")
+    print(f"  {'dtype':<8} {'latency/sample':>15} {'load':>8} {'peak RSS':>10}")
+    print(f"  {'float32':<8} {ref_latency:14.2f}s {ref_load:7.1f}s {ref_rss:8.0f} MB")
+    print(f"  {'int8':<8} {q_latency:14.2f}s {q_load:7.1f}s {q_rss:8.0f} MB"
+          f"   ({ref_latency / q_latency:.2f}x faster)")
+    for name, fn in metrics:
+        scores = [fn(r, q) for r, q in zip(ref_out, q_out)]
+        print(f"  {name} vs float32: {sum(scores) / len(scores):.3f}")
+    return ref_out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="*", help="sample video/audio clips for the ASR comparison")
+    parser.add_argument("--skip-asr", action="store_true")
+    parser.add_argument("--skip-summary", action="store_true")
+    args = parser.parse_args()
+
+    texts = SAMPLE_TEXTS
+    if args.clips and not args.skip_asr:
+        transcripts = compare("asr", args.clips, [("WER", word_error_rate)])
+        long_enough = [t for t in transcripts if len(t.split()) >= 50 and not t.startswith("ERROR")]
+        if long_enough:
+            texts = long_enough
+    elif not args.clips and not args.skip_asr:
+        print("No clips given: skipping the ASR comparison.")
+
+    if not args.skip_summary:
+        compare("summary", texts, [("ROUGE-1 F1", rouge_1), ("ROUGE-L F1", rouge_l)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark summarizer backends (SUMMARIZER_MODEL) on CPU.
+
+Each model runs in a fresh process that loads it, summarizes every transcript
+with summarize_text (token-budget chunks, batched) and reports input
+tokens/sec, p50/p95 latency per transcript and peak RSS. Quality is ROUGE-1 /
+ROUGE-L F1 against reference summaries (hand-written ones ship with the
+built-in samples). Inputs without references are scored against the first
+model's output instead: that column only measures agreement with the
+baseline, and the baseline row itself is left blank.
+
+Usage:
+    python benchmarks/bench_summarizer.py [inputs ...] [--models bart-large-cnn,distilbart-cnn-12-6]
+                                          [--dtype float32] [--repeat 1]
+
+Inputs are .txt transcripts or .jsonl files with {"text": ..., "reference": ...}
+per line. Without inputs the built-in sample texts are used. Models are short
+names from text_summarizer.SUMMARIZER_MODELS, Hugging Face ids or local paths;
+run once with network access so they are in the local cache.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from bench_quantization import SAMPLE_TEXTS, rouge_1, rouge_l
+
+# Hand-written reference summaries of bench_quantization.SAMPLE_TEXTS, in order
+SAMPLE_REFERENCES = [
+    "The city council discussed a transport plan adding three bus lines and longer weekend service. "
+    "Residents worried about the forty million dollar cost, while the mayor said transit would cut "
+    "traffic and pollution and be partly funded by a state grant. A vote follows public hearings next month.",
+    "University researchers built a battery that charges in under ten minutes using a layered carbon "
+    "electrode. It kept ninety percent of its capacity after two thousand cycles and could suit cars "
+    "and phones, but large-scale manufacturing is still years away.",
+]
+
+
+def load_inputs(paths):
+    """[(name, text, reference or None)] from .txt / .jsonl files."""
+    samples = []
+    for path in paths:
+        name = os.path.basename(path)
+        with open(path, encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                for i, line in enumerate(f):
+                    if line.strip():
+                        item = json.loads(line)
+                        samples.append(("%s:%d" % (name, i + 1), item["text"], item.get("reference")))
+            else:
+                samples.append((name, f.read(), None))
+    return samples
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * q / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _worker(model, dtype, texts, repeat, queue):
+    # Settings are read at import time, so set them before importing the modules
+    os.environ["SUMMARIZER_MODEL"] = model
+    os.environ["SUMMARIZER_DTYPE"] = dtype
+    os.environ.pop("MODEL_SERVER_SOCKET", None)
+    from summarizer.text_summarizer import _get_local_summarizer, get_tokenizer, summarize_text
+
+    started_load = time.perf_counter()
+    _get_local_summarizer()
+    load_s = time.perf_counter() - started_load
+    tokenizer = get_tokenizer()
+    n_tokens = sum(len(tokenizer(text, add_special_tokens=False)["input_ids"]) for text in texts)
+
+    outputs, latencies = [], []
+    for _ in range(repeat):
+        outputs = []
+        for text in texts:
+            started = time.perf_counter()
+            outputs.append(summarize_text(text))
+            latencies.append(time.perf_counter() - started)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    queue.put((outputs, latencies, n_tokens * repeat, load_s, peak_mb))
+
+
+def run(model, dtype, texts, repeat):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_worker, args=(model, dtype, texts, repeat, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="*", help=".txt transcripts or .jsonl {text, reference} files")
+    parser.add_argument("--models", default="bart-large-cnn,distilbart-cnn-12-6")
+    parser.add_argument("--dtype", default="float32")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the inputs (latency samples)")
+    args = parser.parse_args()
+
+    if args.inputs:
+        samples = load_inputs(args.inputs)
+    else:
+        samples = [("sample%d" % (i + 1), text, ref)
+                   for i, (text, ref) in enumerate(zip(SAMPLE_TEXTS, SAMPLE_REFERENCES))]
+    texts = [text for _name, text, _ref in samples]
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    has_references = all(ref for _name, _text, ref in samples)
+    print(f"{len(samples)} transcripts, {sum(len(t.split()) for t in texts)} words")
+    if has_references:
+        print("ROUGE against the reference summaries")
+    else:
+        print(f"No references: ROUGE is agreement with {models[0]} (a pseudo-reference), not summary quality")
+
+    rows = []
+    references = [ref for _name, _text, ref in samples] if has_references else None
+    for model in models:
+        outputs, latencies, n_tokens, load_s, peak_mb = run(model, args.dtype, texts, max(1, args.repeat))
+        if references is None:
+            # The baseline would score 1.0 against itself
+            references = outputs
+            r1 = rl = None
+        else:
+            r1 = sum(rouge_1(r, o) for r, o in zip(references, outputs)) / len(outputs)
+            rl = sum(rouge_l(r, o) for r, o in zip(references, outputs)) / len(outputs)
+        rows.append((model, n_tokens / sum(latencies), percentile(latencies, 50), percentile(latencies, 95),
+                     load_s, peak_mb, r1, rl))
+
+    label = "" if has_references else " vs " + models[0]
+    w = max(8, len("ROUGE-1" + label))
+    print(f"\n{'model':<32} {'tokens/s':>9} {'p50':>7} {'p95':>7} {'load':>7} {'peak RSS':>10} "
+          f"{'ROUGE-1' + label:>{w}} {'ROUGE-L' + label:>{w}}")
+    for model, tps, p50, p95, load_s, peak_mb, r1, rl in rows:
+        scores = f"{'-':>{w}} {'-':>{w}}" if r1 is None else f"{r1:{w}.3f} {rl:{w}.3f}"
+        print(f"{model:<32} {tps:9.1f} {p50:6.2f}s {p95:6.2f}s {load_s:6.1f}s {peak_mb:8.0f} MB {scores}")
+
+
+if __name__ == "__main__":
+    main()
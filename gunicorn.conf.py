@@ -0,0 +1,30 @@
+"""
+Gunicorn hooks (loaded automatically from the working directory).
+Starts one shared model-server process before the web workers are forked, so
+Whisper and BART are loaded once instead of once per worker. Set
+MODEL_SERVER=0 to keep models inside each worker; SUMMARIZER_WARMUP=1 then
+loads the summarizer in each worker as it boots.
+"""
+import os
+
+
+def on_starting(server):
+    if os.getenv("MODEL_SERVER", "1").lower() not in ("1", "true", "yes", "on"):
+        return
+    from summarizer.model_server import start_server_process
+
+    proc = start_server_process()
+    server.log.info("Model server started (pid %s) on %s", proc.pid, os.environ["MODEL_SERVER_SOCKET"])
+
+
+def on_exit(server):
+    from summarizer.model_server import stop_server_process
+
+    stop_server_process()
+
+
+def post_fork(server, worker):
+    from summarizer.text_summarizer import SUMMARIZER_WARMUP, warm_up
+
+    if SUMMARIZER_WARMUP:
+        warm_up()
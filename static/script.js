@@ -179,6 +179,35 @@
     document.body.removeChild(textarea);
   }
 
+  // ----- Background Job Polling -----
+  // Uploads run as background jobs; reload the page once the job has finished
+  // so the server renders its results.
+  var jobStatus = document.getElementById('jobStatus');
+
+  if (jobStatus) {
+    var statusUrl = jobStatus.getAttribute('data-status-url');
+
+    var pollJob = function () {
+      fetch(statusUrl, { headers: { 'Accept': 'application/json' } })
+        .then(function (res) {
+          return res.json();
+        })
+        .then(function (job) {
+          if (job.status === 'queued' || job.status === 'running') {
+            setTimeout(pollJob, 3000);
+          } else {
+            window.location.reload();
+          }
+        })
+        .catch(function () {
+          // Server busy or restarting: keep polling
+          setTimeout(pollJob, 5000);
+        });
+    };
+
+    setTimeout(pollJob, 3000);
+  }
+
   // ----- SRT Download -----
   var srtData = document.getElementById('srtData');
   var downloadSrt = document.getElementById('downloadSrt');
@@ -0,0 +1,121 @@
+"""
+Multi-process speech recognition.
+Splits 16 kHz audio at quiet points into roughly equal shards, transcribes each
+shard in its own worker process with a fixed torch thread count, and merges the
+segments back with offset-corrected timestamps. A single Whisper process only
+uses a few intra-op threads well, so on many-core hosts this scales close to
+linearly with ASR_WORKERS.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+# Shards shorter than this are not worth a worker process (model load ~ seconds)
+MIN_SHARD_SECONDS = 60.0
+
+_FRAME_SECONDS = 0.05
+_SEARCH_SECONDS = 15.0
+_SMOOTH_FRAMES = 6
+
+
+def find_split_points(array, sampling_rate, n_shards):
+    """
+    Sample offsets that cut `array` into n_shards pieces of roughly equal length.
+    Each cut is moved to the quietest point (lowest smoothed RMS) within
+    +/- 15 s of the ideal position, so words are not split between shards.
+    """
+    total = len(array)
+    if n_shards <= 1 or total == 0:
+        return []
+
+    hop = max(1, int(sampling_rate * _FRAME_SECONDS))
+    n_frames = total // hop
+    frames = array[:n_frames * hop].reshape(n_frames, hop)
+    rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    smooth = np.convolve(rms, np.ones(_SMOOTH_FRAMES) / _SMOOTH_FRAMES, mode="same")
+
+    shard_frames = n_frames / float(n_shards)
+    radius = int(min(_SEARCH_SECONDS / _FRAME_SECONDS, shard_frames / 4))
+    cuts = []
+    for k in range(1, n_shards):
+        target = int(round(k * shard_frames))
+        lo = max(target - radius, (cuts[-1] // hop + 1) if cuts else 1)
+        hi = min(target + radius + 1, n_frames - 1)
+        if hi <= lo:
+            continue
+        quietest = lo + int(np.argmin(smooth[lo:hi]))
+        cuts.append(quietest * hop + hop // 2)
+    return cuts
+
+
+def _transcribe_shard(task):
+    """Worker entry point: transcribe one shard and shift its timestamps by its offset."""
+    from .auto_caption import transcribe_audio
+
+    array, sampling_rate, offset = task
+    result = transcribe_audio({"array": array, "sampling_rate": sampling_rate, "error": None},
+                              workers=1, vad=False, use_cache=False)
+    for chunk in result["segments"]:
+        ts = chunk.get("timestamp")
+        if ts:
+            chunk["timestamp"] = tuple(None if t is None else t + offset for t in ts)
+    return result
+
+
+def _merge(results, last_end):
+    """Join shard results in order; an open-ended chunk ends where the next shard starts."""
+    from .auto_caption import _chunks_to_srt
+
+    texts = []
+    segments = []
+    for i, result in enumerate(results):
+        if result["text"]:
+            texts.append(result["text"])
+        for chunk in result["segments"]:
+            start, end = chunk.get("timestamp") or (None, None)
+            if end is None:
+                end = last_end[i]
+            segments.append({**chunk, "timestamp": (start, end)})
+    return {"text": " ".join(texts), "srt": _chunks_to_srt(segments), "segments": segments, "error": None}
+
+
+def transcribe_sharded(audio, workers, threads_per_worker=None):
+    """
+    Transcribe load_audio_16k output with `workers` processes.
+    Returns the same {"text", "srt", "segments", "error"} dict as transcribe_audio.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    from .model_registry import init_worker_process
+
+    array = audio["array"]
+    sr = audio["sampling_rate"]
+    n_shards = int(min(workers, max(1, len(array) // int(sr * MIN_SHARD_SECONDS))))
+    if threads_per_worker is None:
+        threads_per_worker = max(1, (os.cpu_count() or 1) // n_shards)
+
+    bounds = [0] + find_split_points(array, sr, n_shards) + [len(array)]
+    tasks = [(array[a:b], sr, a / float(sr)) for a, b in zip(bounds, bounds[1:])]
+    last_end = [b / float(sr) for b in bounds[1:]]
+
+    print(f"[ASR] Transcribing {len(array) / sr:.0f}s in {len(tasks)} shards "
+          f"({threads_per_worker} torch threads each)...")
+    sys.stdout.flush()
+    started = time.time()
+
+    # spawn: forking a process that already runs torch/OpenMP threads can deadlock
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(tasks), mp_context=ctx,
+                             initializer=init_worker_process, initargs=(threads_per_worker,)) as pool:
+        results = list(pool.map(_transcribe_shard, tasks))
+
+    for result in results:
+        if result.get("error"):
+            return {"text": "", "srt": "", "segments": [], "error": result["error"]}
+
+    print(f"[ASR] Sharded transcription finished in {time.time() - started:.1f}s")
+    sys.stdout.flush()
+    return _merge(results, last_end)
@@ -5,7 +5,7 @@ Works with Python 3.8+ including 3.14; does not require the openai-whisper packa
 """
 import os
 import subprocess
-import tempfile
+import sys
 
 
 def _get_ffmpeg_cmd():
@@ -13,42 +13,130 @@ def _get_ffmpeg_cmd():
     return _f()
 
 
-def _extract_audio_16k(video_path):
-    """Extract 16 kHz mono WAV for Whisper. Returns (path to temp WAV or None, error_detail or None)."""
-    ffmpeg = _get_ffmpeg_cmd()
-    fd, wav = tempfile.mkstemp(suffix=".wav")
-    os.close(fd)
+# Extraction is aborted only when ffmpeg produces no output for this long,
+# so long inputs are not cut off by a fixed wall-clock limit
+AUDIO_IDLE_TIMEOUT = float(os.getenv("AUDIO_IDLE_TIMEOUT", "60"))
 
-    def _rm():
-        try:
-            os.remove(wav)
-        except OSError:
-            pass
+_SAMPLE_RATE = 16000
+_READ_BYTES = 1 << 20
+
+
+class AudioStreamError(Exception):
+    """ffmpeg could not be started or failed while decoding audio."""
 
+
+def _iter_pcm_16k(video_path, idle_timeout=None):
+    """
+    Stream 16 kHz mono s16le PCM from ffmpeg's stdout.
+    Yields int16 ndarrays that are only valid until the next iteration (the read
+    buffer is reused). Raises AudioStreamError if ffmpeg fails or stalls.
+    """
+    import threading
+    import time
+
+    import numpy as np
+
+    idle_timeout = AUDIO_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
     try:
-        r = subprocess.run(
+        proc = subprocess.Popen(
             [
-                ffmpeg, "-y", "-i", video_path, "-vn",
-                "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1",
-                wav,
+                _get_ffmpeg_cmd(), "-nostdin", "-i", video_path, "-vn",
+                "-f", "s16le", "-acodec", "pcm_s16le", "-ar", str(_SAMPLE_RATE), "-ac", "1",
+                "pipe:1",
             ],
-            capture_output=True,
-            timeout=120,
-            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
         )
-        if r.returncode == 0 and os.path.isfile(wav):
-            return (wav, None)
-        _rm()
-        err = (r.stderr or r.stdout or "")[:400].strip() or ("ffmpeg exited %s" % r.returncode)
-        return (None, err)
     except FileNotFoundError:
-        _rm()
-        return (None, "ffmpeg not found")
-    except (subprocess.TimeoutExpired, OSError) as e:
-        _rm()
-        return (None, str(e)[:200])
-    _rm()
-    return (None, None)
+        raise AudioStreamError("ffmpeg not found")
+    except OSError as e:
+        raise AudioStreamError(str(e)[:200])
+
+    # Drain stderr (keeping the tail for errors) so ffmpeg never blocks on it
+    stderr_tail = []
+
+    def _drain():
+        for line in proc.stderr:
+            stderr_tail.append(line)
+            del stderr_tail[:-20]
+
+    # Kill ffmpeg if it stops producing audio for idle_timeout seconds. Only time
+    # spent waiting in readinto counts: while the consumer holds a chunk (e.g. a
+    # slow ASR window) ffmpeg is blocked on the full pipe, not stalled
+    last_progress = [time.monotonic()]
+    reading = threading.Event()
+    stalled = threading.Event()
+
+    def _watchdog():
+        while proc.poll() is None:
+            if reading.is_set() and time.monotonic() - last_progress[0] > idle_timeout:
+                stalled.set()
+                proc.kill()
+                return
+            time.sleep(0.5)
+
+    threading.Thread(target=_drain, daemon=True).start()
+    threading.Thread(target=_watchdog, daemon=True).start()
+
+    chunk = bytearray(_READ_BYTES)
+    view = memoryview(chunk)
+    pending = b""
+    total = 0
+    try:
+        while True:
+            last_progress[0] = time.monotonic()
+            reading.set()
+            n = proc.stdout.readinto(view)
+            reading.clear()
+            if not n:
+                break
+            data = pending + bytes(view[:n]) if pending else view[:n]
+            usable = len(data) - (len(data) % 2)
+            pending = bytes(data[usable:])
+            if usable:
+                total += usable // 2
+                yield np.frombuffer(data[:usable], dtype="<i2")
+        proc.wait()
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    if stalled.is_set():
+        raise AudioStreamError("ffmpeg produced no audio for %.0fs" % idle_timeout)
+    if proc.returncode != 0 or total == 0:
+        err = b"".join(stderr_tail).decode("utf-8", "replace")[-400:].strip()
+        raise AudioStreamError(err or ("ffmpeg exited %s" % proc.returncode))
+
+
+def _extract_audio_16k(video_path, idle_timeout=None):
+    """
+    Decode 16 kHz mono audio by streaming s16le PCM from ffmpeg's stdout.
+    Samples are converted chunk by chunk into one preallocated float32 buffer
+    (sized from the probed duration), so there is no temp file and no second copy.
+    Returns (float32 ndarray or None, error_detail or None).
+    """
+    import numpy as np
+
+    from .ffmpeg_render import probe_media
+
+    duration = probe_media(video_path)["duration"]
+    capacity = int((duration or 600.0) * _SAMPLE_RATE) + _SAMPLE_RATE
+    out = np.empty(capacity, dtype=np.float32)
+    pos = 0
+    try:
+        for samples in _iter_pcm_16k(video_path, idle_timeout):
+            if pos + len(samples) > len(out):
+                out = np.resize(out, max(len(out) * 3 // 2, pos + len(samples)))
+            np.multiply(samples, 1.0 / 32768.0, out=out[pos:pos + len(samples)], casting="unsafe")
+            pos += len(samples)
+    except AudioStreamError as e:
+        return (None, str(e))
+
+    # Drop the unused tail only when it is large enough to matter
+    if pos < len(out) * 0.9:
+        return (out[:pos].copy(), None)
+    return (out[:pos], None)
 
 
 def _format_srt_time(sec):
@@ -72,53 +160,306 @@ def _chunks_to_srt(chunks):
     return "\n".join(srt) if srt else ""
 
 
-_pipe = None
+WHISPER_DTYPE = os.getenv("WHISPER_DTYPE", "float32")
+
+# Long-form mode: audio longer than one window is cut into overlapping windows
+# (ASR_STRIDE_S seconds of context on each side) that run through Whisper
+# ASR_BATCH_SIZE at a time. ASR_CHUNK_LENGTH_S=0 transcribes in a single call.
+ASR_CHUNK_LENGTH_S = float(os.getenv("ASR_CHUNK_LENGTH_S", "30"))
+ASR_STRIDE_S = float(os.getenv("ASR_STRIDE_S", "5"))
+ASR_BATCH_SIZE = max(1, int(os.getenv("ASR_BATCH_SIZE", "4")))
+# Parallel mode: split at silences into ASR_WORKERS shards, one process each
+ASR_WORKERS = max(1, int(os.getenv("ASR_WORKERS", "1")))
+# Streaming mode: inputs of at least ASR_STREAM_MIN_SECONDS (0 disables) are
+# decoded and transcribed ASR_STREAM_WINDOW_S seconds at a time, so memory
+# stays constant regardless of length
+ASR_STREAM_MIN_SECONDS = float(os.getenv("ASR_STREAM_MIN_SECONDS", "1800"))
+ASR_STREAM_WINDOW_S = float(os.getenv("ASR_STREAM_WINDOW_S", "300"))
+# Each window is cut at the quietest point in its last few seconds
+_STREAM_TAIL_S = 20.0
+# Voice activity detection: only speech regions are sent to Whisper
+ASR_VAD = os.getenv("ASR_VAD", "1").lower() in ("1", "true", "yes", "on")
+# Skip the VAD gate when speech already covers most of the audio
+_VAD_MAX_COVERAGE = 0.9
+# Peak amplitude below which audio with no speech regions counts as silent (-50 dBFS)
+_SILENCE_PEAK = 10 ** (-50 / 20.0)
+
+
+def _get_local_pipe():
+    from .model_registry import TRANSFORMERS_ASR, get_model
+
+    return get_model(TRANSFORMERS_ASR, "base", WHISPER_DTYPE)
 
 
 def _get_pipe():
-    global _pipe
-    if _pipe is None:
-        from transformers import pipeline
-        _pipe = pipeline(
-            "automatic-speech-recognition",
-            model="openai/whisper-base",
-            return_timestamps=True,
-        )
-    return _pipe
+    """The ASR pipeline: the shared model server if one is running, else in-process."""
+    from .model_server import remote_pipeline
 
+    return remote_pipeline("asr") or _get_local_pipe()
 
-def transcribe_video(video_path):
+
+def load_audio_16k(video_path):
     """
-    Transcribe video/audio and return text + SRT.
-    Returns: {"text": str, "srt": str, "segments": list, "error": str|None}
+    Extract and decode 16 kHz mono audio for Whisper.
+    Returns: {"array": float32 ndarray|None, "sampling_rate": int, "error": str|None}
     """
-    wav, ext_err = _extract_audio_16k(video_path)
-    if not wav:
+    data, ext_err = _extract_audio_16k(video_path)
+    if data is None:
         base = "Could not extract audio. "
         if ext_err == "ffmpeg not found":
             base += "FFmpeg not found. Download ffmpeg-release-essentials.zip from https://www.gyan.dev/ffmpeg/builds/ , extract, and put ffmpeg.exe in a folder. Then set that path in ffmpeg_path.txt or in FFMPEG_PATH / FFMPEG_BIN. See FFMPEG.md."
         else:
             base += "FFmpeg: %s" % (ext_err or "unknown error")
-        return {"text": "", "srt": "", "segments": [], "error": base}
+        return {"array": None, "sampling_rate": _SAMPLE_RATE, "error": base}
+    return {"array": data, "sampling_rate": _SAMPLE_RATE, "error": None}
 
-    try:
-        import soundfile as sf
 
-        data, sr = sf.read(wav, dtype="float32")
-        if data.ndim > 1:
-            data = data.mean(axis=1)
+def _long_form_kwargs(audio, chunk_length_s, batch_size, stride_s):
+    """
+    Pipeline arguments for chunked, batched inference (empty for short audio).
+    Batching caps the model's per-call work, not the audio: the whole decoded
+    array is still in memory (see iter_transcript_segments for that).
+    """
+    duration = len(audio["array"]) / float(audio["sampling_rate"])
+    if not chunk_length_s or duration <= chunk_length_s:
+        return {}
+    return {
+        "chunk_length_s": chunk_length_s,
+        "stride_length_s": min(stride_s, chunk_length_s / 6.0),
+        "batch_size": batch_size,
+    }
+
+
+def _transcribe_speech_only(audio, **kwargs):
+    """
+    Run VAD, transcribe only the speech regions and map timestamps back.
+    Returns None when VAD would not remove enough audio to be worth it.
+    The compacted speech is a copy, held alongside the full decoded array;
+    only streaming mode keeps memory independent of the input length.
+    """
+    import numpy as np
+
+    from .vad import compact_audio, detect_speech, remap_time, speech_coverage
+
+    array, sr = audio["array"], audio["sampling_rate"]
+    duration = len(array) / float(sr)
+    regions = detect_speech(array, sr)
+    coverage = speech_coverage(regions, duration)
+    if coverage >= _VAD_MAX_COVERAGE:
+        return None
+    if not regions:
+        # Steady sound with no energy contrast (e.g. speech over loud music) gives
+        # no regions; only skip ASR entirely when the audio is actually silent
+        if len(array) and float(np.max(np.abs(array))) > _SILENCE_PEAK:
+            return None
+        print(f"[VAD] No speech in {duration:.0f}s of silent audio")
+        sys.stdout.flush()
+        return {"text": "", "srt": "", "segments": [], "speech_regions": [], "error": None}
+
+    print(f"[VAD] {len(regions)} speech regions, {coverage * 100:.0f}% of {duration:.0f}s sent to ASR")
+    sys.stdout.flush()
+
+    compact, offsets = compact_audio(array, sr, regions)
+    result = transcribe_audio({"array": compact, "sampling_rate": sr, "error": None}, vad=False,
+                              use_cache=False, **kwargs)
+    if result.get("error"):
+        return result
+    for chunk in result["segments"]:
+        ts = chunk.get("timestamp")
+        if ts:
+            chunk["timestamp"] = tuple(remap_time(t, offsets) for t in ts)
+    result["srt"] = _chunks_to_srt(result["segments"])
+    result["speech_regions"] = [list(r) for r in regions]
+    return result
+
+
+def _transcript_model_id():
+    """Transcript cache model key: model plus every setting that changes the output."""
+    return "whisper-base/%s/chunk%g/stride%g/vad%d" % (
+        WHISPER_DTYPE, ASR_CHUNK_LENGTH_S, ASR_STRIDE_S, int(ASR_VAD))
+
+
+def transcribe_audio(audio, chunk_length_s=None, batch_size=None, stride_s=None, workers=None, vad=None,
+                     use_cache=True):
+    """
+    Transcribe audio returned by load_audio_16k.
+    Long audio is transcribed in overlapping, batched windows whose timestamps
+    are stitched back by the pipeline (see ASR_CHUNK_LENGTH_S / ASR_BATCH_SIZE).
+    With workers > 1 (ASR_WORKERS) long audio is split at silences and the
+    shards are transcribed in parallel processes (see asr_shards).
+    With VAD on (ASR_VAD) silence and music are cut out first; the result then
+    also carries "speech_regions" on the original timeline.
+    Results are kept in the persistent transcript store, keyed by an audio
+    fingerprint (use_cache=False for partial audio such as shards and windows).
+    Returns: {"text": str, "srt": str, "segments": list, "error": str|None}
+    """
+    if audio.get("error") or audio.get("array") is None:
+        return {"text": "", "srt": "", "segments": [], "error": audio.get("error") or "No audio"}
+
+    if use_cache:
+        from . import transcript_store
+        if transcript_store.TRANSCRIPT_CACHE_ENABLED and chunk_length_s is None and stride_s is None and vad is None:
+            fingerprint = transcript_store.audio_fingerprint(audio["array"])
+            hit = transcript_store.get(fingerprint, _transcript_model_id())
+            if hit is not None:
+                return hit
+            result = transcribe_audio(audio, batch_size=batch_size, workers=workers, use_cache=False)
+            if not result.get("error"):
+                transcript_store.put(fingerprint, _transcript_model_id(), "auto", result)
+            return result
+
+    if ASR_VAD if vad is None else vad:
+        result = _transcribe_speech_only(audio, chunk_length_s=chunk_length_s, batch_size=batch_size,
+                                         stride_s=stride_s, workers=workers)
+        if result is not None:
+            return result
+
+    workers = ASR_WORKERS if workers is None else workers
+    if workers > 1:
+        from .asr_shards import MIN_SHARD_SECONDS, transcribe_sharded
+        if len(audio["array"]) >= 2 * MIN_SHARD_SECONDS * audio["sampling_rate"]:
+            try:
+                return transcribe_sharded(audio, workers)
+            except Exception as e:
+                print(f"[ASR] Sharded transcription failed, using one process: {e}")
+                sys.stdout.flush()
+
+    kwargs = _long_form_kwargs(
+        audio,
+        ASR_CHUNK_LENGTH_S if chunk_length_s is None else chunk_length_s,
+        ASR_BATCH_SIZE if batch_size is None else batch_size,
+        ASR_STRIDE_S if stride_s is None else stride_s,
+    )
+    try:
         pipe = _get_pipe()
         # Pass raw array so transformers doesn't call ffmpeg to load the file (avoids "ffmpeg was not found")
-        out = pipe({"array": data, "sampling_rate": int(sr)})
+        out = pipe({"array": audio["array"], "sampling_rate": audio["sampling_rate"]}, **kwargs)
     except Exception as e:
         return {"text": "", "srt": "", "segments": [], "error": str(e)}
-    finally:
-        try:
-            os.remove(wav)
-        except OSError:
-            pass
 
     text = (out.get("text") or "").strip()
     chunks = out.get("chunks") or []
     srt = _chunks_to_srt(chunks)
     return {"text": text, "srt": srt, "segments": chunks, "error": None}
+
+
+def iter_transcript_segments(video_path, window_s=None, speech_regions=None):
+    """
+    Transcribe video/audio window by window, yielding segments (chunks with
+    timestamps on the original timeline) as soon as each window is done.
+    Only one window of float32 audio is held in memory. VAD speech regions (the
+    whole window when VAD is skipped) are appended to the speech_regions list if
+    one is given. Raises AudioStreamError
+    on extraction failure and RuntimeError if transcription fails.
+    """
+    import numpy as np
+
+    from .vad import quietest_point
+
+    window_s = ASR_STREAM_WINDOW_S if window_s is None else window_s
+    sr = _SAMPLE_RATE
+    window = np.empty(int((window_s + _STREAM_TAIL_S) * sr), dtype=np.float32)
+    tail = int(_STREAM_TAIL_S * sr)
+    fill = 0
+    offset = 0.0
+
+    def _transcribe(samples, offset):
+        end = offset + len(samples) / float(sr)
+        print(f"[ASR] Streaming window {offset:.0f}s - {end:.0f}s")
+        sys.stdout.flush()
+        # Sharding a single window would reload the model in every worker
+        result = transcribe_audio({"array": samples, "sampling_rate": sr, "error": None}, workers=1,
+                                  use_cache=False)
+        if result.get("error"):
+            raise RuntimeError(result["error"])
+        if speech_regions is not None:
+            if "speech_regions" in result:
+                speech_regions.extend([r[0] + offset, r[1] + offset] for r in result["speech_regions"])
+            else:
+                # VAD was skipped (mostly speech, or disabled): the whole window was transcribed
+                speech_regions.append([offset, end])
+        for chunk in result["segments"]:
+            ts = chunk.get("timestamp") or (None, None)
+            start = None if ts[0] is None else ts[0] + offset
+            stop = end if ts[1] is None else ts[1] + offset
+            yield {**chunk, "timestamp": (start, stop)}
+
+    for samples in _iter_pcm_16k(video_path):
+        while len(samples):
+            n = min(len(samples), len(window) - fill)
+            np.multiply(samples[:n], 1.0 / 32768.0, out=window[fill:fill + n], casting="unsafe")
+            fill += n
+            samples = samples[n:]
+            if fill == len(window):
+                cut = quietest_point(window, sr, fill - tail, fill)
+                yield from _transcribe(window[:cut], offset)
+                window[:fill - cut] = window[cut:fill]
+                fill -= cut
+                offset += cut / float(sr)
+    if fill:
+        yield from _transcribe(window[:fill], offset)
+
+
+def transcribe_video_streaming(video_path, window_s=None, on_segment=None):
+    """
+    Bounded-memory transcription for long recordings (see iter_transcript_segments).
+    on_segment, if given, is called with every segment as it is produced.
+    Returns: {"text": str, "srt": str, "segments": list, "error": str|None}
+    """
+    from . import transcript_store
+
+    # A cheap decode-only pass fingerprints the audio for the transcript store
+    fingerprint = None
+    if transcript_store.TRANSCRIPT_CACHE_ENABLED:
+        hasher = transcript_store.PcmFingerprint()
+        try:
+            for samples in _iter_pcm_16k(video_path):
+                hasher.update(samples)
+            fingerprint = hasher.hexdigest()
+        except AudioStreamError as e:
+            return {"text": "", "srt": "", "segments": [], "error": "Could not extract audio. FFmpeg: %s" % e}
+        hit = transcript_store.get(fingerprint, _transcript_model_id())
+        if hit is not None:
+            if on_segment is not None:
+                for chunk in hit["segments"]:
+                    on_segment(chunk)
+            return hit
+
+    segments = []
+    regions = []
+    try:
+        for chunk in iter_transcript_segments(video_path, window_s, regions):
+            segments.append(chunk)
+            if on_segment is not None:
+                on_segment(chunk)
+    except AudioStreamError as e:
+        return {"text": "", "srt": "", "segments": [], "error": "Could not extract audio. FFmpeg: %s" % e}
+    except RuntimeError as e:
+        return {"text": "", "srt": "", "segments": [], "error": str(e)}
+
+    text = " ".join((c.get("text") or "").strip() for c in segments).strip()
+    result = {"text": text, "srt": _chunks_to_srt(segments), "segments": segments, "error": None}
+    if regions:
+        result["speech_regions"] = regions
+    transcript_store.put(fingerprint, _transcript_model_id(), "auto", result)
+    return result
+
+
+def should_stream(video_path):
+    """True if the input is long enough for streaming transcription."""
+    if not ASR_STREAM_MIN_SECONDS:
+        return False
+    from .ffmpeg_render import probe_media
+
+    return probe_media(video_path)["duration"] >= ASR_STREAM_MIN_SECONDS
+
+
+def transcribe_video(video_path):
+    """
+    Transcribe video/audio and return text + SRT.
+    Long inputs (ASR_STREAM_MIN_SECONDS) are transcribed in streaming windows.
+    Returns: {"text": str, "srt": str, "segments": list, "error": str|None}
+    """
+    if should_stream(video_path):
+        return transcribe_video_streaming(video_path)
+    return transcribe_audio(load_audio_16k(video_path))
@@ -0,0 +1,153 @@
+"""
+Extractive summarization engine (English and Telugu).
+A transcript is split and tokenized once into a SentenceIndex: a sparse
+sublinear TF-IDF matrix with L2-normalized rows (scipy.sparse) and TextRank
+scores for each sentence. Main idea, key points and facts are all read from that
+index. TextRank runs matrix-free: the cosine-similarity graph X·Xᵀ is never
+built, so each power iteration costs two sparse products, O(nnz). A
+100k-word transcript takes well under a second.
+"""
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+# Words: Latin/other word characters plus the whole Telugu block (vowel signs
+# and virama are combining marks that \w does not match)
+_TOKEN = re.compile(r"[\w\u0C00-\u0C7F]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?\u0964])\s+|\n+")
+# Unpunctuated captions are cut into pseudo-sentences of this many words
+_MAX_SENTENCE_WORDS = 40
+
+DAMPING = 0.85
+_MAX_ITERATIONS = 100
+_TOLERANCE = 1e-6
+
+# Word stems (matched as prefixes of the transcript's words)
+IMPORTANT_STEMS = (
+    'important', 'key', 'main', 'first', 'second', 'finally',
+    'conclusion', 'summary', 'example', 'because', 'therefore',
+    'ముఖ్య', 'మొదటి', 'రెండవ', 'చివరగా', 'ఉదాహరణ', 'ఎందుకంటే', 'కారణంగా', 'అంటే', 'సారాంశం',
+)
+FACT_STEMS = ('fact', 'discover', 'result', 'research', 'shows', 'found',
+              'వాస్తవ', 'పరిశోధన', 'ఫలిత', 'కనుగొన')
+EXAMPLE_STEMS = ('example', 'instance', 'such as', 'ఉదాహరణ')
+# Score multiplier for sentences containing an IMPORTANT_STEMS word
+_IMPORTANT_BOOST = 1.5
+
+
+def split_sentences(text: str, max_words: int = _MAX_SENTENCE_WORDS) -> List[str]:
+    """Split on sentence punctuation (. ! ? and the danda) and line breaks; cut run-ons."""
+    sentences = []
+    for part in _SENTENCE_END.split(text):
+        words = part.split()
+        for i in range(0, len(words), max_words):
+            sentences.append(' '.join(words[i:i + max_words]))
+    return [s for s in sentences if s]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def textrank(matrix, damping: float = DAMPING) -> np.ndarray:
+    """
+    PageRank over the cosine-similarity graph of the rows of `matrix`
+    (L2-normalized), without materializing the n x n similarity matrix.
+    """
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    matrix_t = matrix.T.tocsr()
+    self_similarity = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+    degree = matrix @ (matrix_t @ np.ones(n)) - self_similarity
+    connected = degree > 1e-12
+    inv_degree = np.where(connected, 1.0 / np.where(connected, degree, 1.0), 0.0)
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(_MAX_ITERATIONS):
+        share = rank * inv_degree
+        spread = matrix @ (matrix_t @ share) - self_similarity * share
+        # Sentences with no neighbours pass their rank to everyone
+        dangling = rank[~connected].sum()
+        updated = (1.0 - damping) / n + damping * (spread + dangling / n)
+        if np.abs(updated - rank).sum() < _TOLERANCE:
+            rank = updated
+            break
+        rank = updated
+    return rank
+
+
+class SentenceIndex:
+    """Sentences of one transcript with their TF-IDF rows and TextRank scores."""
+
+    def __init__(self, text: str, min_chars: int = 20):
+        self.sentences = [s for s in split_sentences(text) if len(s) > min_chars]
+        self.vocabulary: Dict[str, int] = {}
+        rows, cols = [], []
+        for i, sentence in enumerate(self.sentences):
+            for token in tokenize(sentence):
+                rows.append(i)
+                cols.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+
+        shape = (len(self.sentences), len(self.vocabulary))
+        counts = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+        counts.sum_duplicates()
+        self.tfidf = self._tfidf(counts)
+        self.scores = textrank(self.tfidf)
+        if len(self.sentences):
+            self.scores = self.scores * np.where(self.contains(IMPORTANT_STEMS), _IMPORTANT_BOOST, 1.0)
+
+    @staticmethod
+    def _tfidf(counts):
+        n = counts.shape[0]
+        df = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+        matrix = counts.copy()
+        matrix.data = (1.0 + np.log(matrix.data)) * idf[matrix.indices]
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ matrix
+
+    def contains(self, stems: Sequence[str]) -> np.ndarray:
+        """Boolean mask of sentences with a word starting with one of `stems` (multi-word stems match the text)."""
+        mask = np.zeros(len(self.sentences), dtype=bool)
+        words = tuple(s for s in stems if ' ' not in s)
+        phrases = [s for s in stems if ' ' in s]
+        columns = [j for term, j in self.vocabulary.items() if term.startswith(words)] if words else []
+        if columns:
+            mask |= np.asarray(self.tfidf[:, columns].getnnz(axis=1)).ravel() > 0
+        for phrase in phrases:
+            mask |= np.array([phrase in s.lower() for s in self.sentences], dtype=bool)
+        return mask
+
+    def ranked(self, mask: Optional[np.ndarray] = None) -> List[int]:
+        """Sentence positions by descending score (optionally only where mask is set)."""
+        order = np.argsort(-self.scores, kind='stable')
+        if mask is not None:
+            order = order[mask[order]]
+        return order.tolist()
+
+    def top(self, n: int, exclude=(), mask: Optional[np.ndarray] = None, in_order: bool = False) -> List[str]:
+        excluded = set(exclude)
+        picked = [i for i in self.ranked(mask) if i not in excluded][:n]
+        if in_order:
+            picked.sort()
+        return [self.sentences[i] for i in picked]
+
+    def main_idea(self, n: int = 3) -> str:
+        """The n most central sentences, in transcript order."""
+        return ' '.join(self.top(n, in_order=True))
+
+    def key_points(self, n: int = 5, skip_main_idea: int = 0) -> List[str]:
+        """Top-ranked sentences, best first, after the first skip_main_idea (used for the main idea)."""
+        return self.top(n, exclude=self.ranked()[:skip_main_idea])
+
+    def facts(self, n: int = 3) -> List[str]:
+        """Best-ranked sentences stating findings/facts, else examples, in transcript order."""
+        for stems in (FACT_STEMS, EXAMPLE_STEMS):
+            mask = self.contains(stems)
+            if mask.any():
+                return self.top(n, mask=mask, in_order=True)
+        return []
@@ -0,0 +1,215 @@
+"""
+Native ffmpeg rendering of clip lists.
+Cuts a list of (start, end) ranges out of one video and joins them in a single
+ffmpeg process (trim/atrim + concat filtergraph), or with stream copy at
+keyframe boundaries for a fast cut with no re-encode. Narrated summaries use
+the same graph with the original audio replaced by a voice-over track.
+"""
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+
+def _get_ffmpeg_cmd():
+    from .video_summarizer import _get_ffmpeg_cmd as _f
+    return _f()
+
+
+# Longer graphs go through a script file to stay under command-line limits (Windows: ~32k)
+_MAX_INLINE_GRAPH = 24000
+
+
+def probe_media(path: str) -> Dict:
+    """
+    Read duration and stream layout from `ffmpeg -i` (ffprobe is not always installed).
+    Returns {"duration": float, "has_video": bool, "has_audio": bool, "error": str|None}
+    """
+    info = {"duration": 0.0, "has_video": False, "has_audio": False, "error": None}
+    try:
+        r = subprocess.run(
+            [_get_ffmpeg_cmd(), "-hide_banner", "-i", path],
+            capture_output=True, text=True, timeout=60,
+        )
+    except FileNotFoundError:
+        info["error"] = "ffmpeg not found"
+        return info
+    except (subprocess.TimeoutExpired, OSError) as e:
+        info["error"] = str(e)[:200]
+        return info
+
+    out = r.stderr or ""
+    m = re.search(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)", out)
+    if m:
+        info["duration"] = int(m.group(1)) * 3600 + int(m.group(2)) * 60 + float(m.group(3))
+    info["has_video"] = re.search(r"Stream #.*: Video:", out) is not None
+    info["has_audio"] = re.search(r"Stream #.*: Audio:", out) is not None
+    if not m and not info["has_video"] and not info["has_audio"]:
+        info["error"] = out.strip().splitlines()[-1][:200] if out.strip() else "unreadable media"
+    return info
+
+
+def build_trim_concat_graph(clips: List[Tuple[float, float]], with_audio: bool = True) -> str:
+    """
+    Filtergraph that trims every clip from input 0 and concatenates them.
+    Outputs are labelled [outv] and, with audio, [outa].
+    """
+    parts = []
+    inputs = []
+    for i, (start, end) in enumerate(clips):
+        parts.append(f"[0:v]trim=start={start:.3f}:end={end:.3f},setpts=PTS-STARTPTS[v{i}]")
+        inputs.append(f"[v{i}]")
+        if with_audio:
+            parts.append(f"[0:a]atrim=start={start:.3f}:end={end:.3f},asetpts=PTS-STARTPTS[a{i}]")
+            inputs.append(f"[a{i}]")
+    audio_flag = 1 if with_audio else 0
+    outputs = "[outv][outa]" if with_audio else "[outv]"
+    parts.append(f"{''.join(inputs)}concat=n={len(clips)}:v=1:a={audio_flag}{outputs}")
+    return ";".join(parts)
+
+
+def _run_ffmpeg(args: List[str], timeout: int = 3600) -> Optional[str]:
+    """Run ffmpeg; returns None on success, else a short error message."""
+    try:
+        r = subprocess.run([_get_ffmpeg_cmd()] + args, capture_output=True, text=True, timeout=timeout)
+    except FileNotFoundError:
+        return "ffmpeg not found"
+    except (subprocess.TimeoutExpired, OSError) as e:
+        return str(e)[:200]
+    if r.returncode != 0:
+        return (r.stderr or "").strip()[-400:] or f"ffmpeg exited {r.returncode}"
+    return None
+
+
+def _filter_args(graph: str, tmp_dir: str) -> List[str]:
+    if len(graph) <= _MAX_INLINE_GRAPH:
+        return ["-filter_complex", graph]
+    script = os.path.join(tmp_dir, "graph.txt")
+    with open(script, "w", encoding="utf-8") as f:
+        f.write(graph)
+    return ["-filter_complex_script", script]
+
+
+def keyframe_times(video_path: str) -> List[float]:
+    """Timestamps (seconds) of the video keyframes, decoding keyframes only."""
+    try:
+        r = subprocess.run(
+            [
+                _get_ffmpeg_cmd(), "-hide_banner", "-skip_frame", "nokey", "-i", video_path,
+                "-map", "0:v:0", "-vf", "showinfo", "-f", "null", "-",
+            ],
+            capture_output=True, text=True, timeout=600,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+        return []
+    times = [float(t) for t in re.findall(r"pts_time:\s*(-?\d+(?:\.\d+)?)", r.stderr or "")]
+    return sorted(set(times))
+
+
+def snap_clips_to_keyframes(clips: List[Tuple[float, float]], keyframes: List[float]) -> List[Tuple[float, float]]:
+    """Move each clip start back to the keyframe at or before it and merge overlaps."""
+    import bisect
+
+    if not keyframes:
+        return list(clips)
+    snapped = []
+    for start, end in sorted(clips):
+        k = bisect.bisect_right(keyframes, start + 1e-3) - 1
+        start = keyframes[k] if k >= 0 else 0.0
+        if snapped and start <= snapped[-1][1]:
+            snapped[-1] = (snapped[-1][0], max(snapped[-1][1], end))
+        else:
+            snapped.append((start, end))
+    return snapped
+
+
+def render_clips(video_path: str, clips: List[Tuple[float, float]], output_path: str,
+                 keep_audio: bool = True, fast_cut: bool = False) -> Optional[str]:
+    """
+    Cut `clips` out of video_path and join them into output_path in native code.
+
+    Default: one ffmpeg pass with a trim/atrim + concat filtergraph, encoded as
+    H.264/AAC with +faststart. fast_cut=True snaps cuts to keyframes and
+    stream-copies each clip, then joins them with the concat demuxer (no re-encode;
+    clips may start slightly earlier than requested).
+    Returns None on success, else an error message.
+    """
+    if not clips:
+        return "No clips to render"
+    info = probe_media(video_path)
+    if info["error"]:
+        return info["error"]
+    with_audio = keep_audio and info["has_audio"]
+
+    tmp_dir = tempfile.mkdtemp(prefix="render_", dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        if fast_cut:
+            return _render_stream_copy(video_path, clips, output_path, with_audio, tmp_dir)
+
+        graph = build_trim_concat_graph(clips, with_audio)
+        args = ["-y", "-i", video_path] + _filter_args(graph, tmp_dir) + ["-map", "[outv]"]
+        if with_audio:
+            args += ["-map", "[outa]", "-c:a", "aac"]
+        args += ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-movflags", "+faststart", output_path]
+        print(f"[RENDER] ffmpeg trim/concat of {len(clips)} clips...")
+        sys.stdout.flush()
+        return _run_ffmpeg(args)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def render_narrated(video_path: str, clips: List[Tuple[float, float]], voiceover_path: str,
+                    output_path: str) -> Optional[str]:
+    """
+    Cut `clips` out of video_path, join them without their original audio and lay
+    voiceover_path over the result, all in one ffmpeg pass.
+    The output ends with the shorter of the joined clips and the voice-over.
+    Returns None on success, else an error message.
+    """
+    if not clips:
+        return "No clips to render"
+    if not os.path.isfile(voiceover_path):
+        return "Voice-over file not found"
+
+    tmp_dir = tempfile.mkdtemp(prefix="render_", dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        graph = build_trim_concat_graph(clips, with_audio=False)
+        args = ["-y", "-i", video_path, "-i", voiceover_path] + _filter_args(graph, tmp_dir)
+        args += [
+            "-map", "[outv]", "-map", "1:a:0",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p", "-c:a", "aac",
+            "-shortest", "-movflags", "+faststart", output_path,
+        ]
+        print(f"[RENDER] ffmpeg trim/concat of {len(clips)} clips with voice-over...")
+        sys.stdout.flush()
+        return _run_ffmpeg(args)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _render_stream_copy(video_path, clips, output_path, with_audio, tmp_dir):
+    clips = snap_clips_to_keyframes(clips, keyframe_times(video_path))
+    print(f"[RENDER] Stream-copy fast cut of {len(clips)} keyframe-aligned clips...")
+    sys.stdout.flush()
+
+    list_path = os.path.join(tmp_dir, "parts.txt")
+    with open(list_path, "w", encoding="utf-8") as listing:
+        for i, (start, end) in enumerate(clips):
+            part = os.path.join(tmp_dir, f"part{i:04d}.mp4")
+            args = ["-y", "-ss", f"{start:.3f}", "-i", video_path, "-t", f"{end - start:.3f}",
+                    "-map", "0:v:0"]
+            if with_audio:
+                args += ["-map", "0:a:0"]
+            args += ["-c", "copy", "-avoid_negative_ts", "make_zero", part]
+            error = _run_ffmpeg(args)
+            if error:
+                return error
+            listing.write("file '%s'\n" % os.path.abspath(part).replace("'", "'\\''"))
+
+    return _run_ffmpeg([
+        "-y", "-f", "concat", "-safe", "0", "-i", list_path,
+        "-c", "copy", "-movflags", "+faststart", output_path,
+    ])
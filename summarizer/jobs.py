@@ -0,0 +1,260 @@
+"""
+Background video processing jobs.
+Each job gets its own folder under uploads/jobs/<job_id>/ holding the outputs
+and a job.json status file; the upload itself is stored once per content hash
+by summarizer.result_cache. Jobs run in a bounded process pool so
+heavy work never blocks the web request thread, and because status lives on
+disk any gunicorn worker can answer a status poll.
+"""
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+JOB_WORKERS = max(1, int(os.getenv("JOB_WORKERS", "2")))
+MAX_PENDING_JOBS = max(1, int(os.getenv("MAX_PENDING_JOBS", "16")))
+# Queued/running jobs older than this (or whose web worker is gone) are marked failed
+JOB_TIMEOUT_S = float(os.getenv("JOB_TIMEOUT_S", str(6 * 3600)))
+
+JOB_OPTIONS = ("do_summary", "do_caption", "do_narrated", "do_smart_edit")
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = 0
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already queued in this web worker."""
+
+
+def jobs_root(upload_folder):
+    return os.path.join(upload_folder, "jobs")
+
+
+def job_dir(upload_folder, job_id):
+    return os.path.join(jobs_root(upload_folder), job_id)
+
+
+def _valid_job_id(job_id):
+    try:
+        return uuid.UUID(job_id).hex == job_id
+    except (ValueError, TypeError, AttributeError):
+        return False
+
+
+def _write_state(path, state):
+    """Atomically replace job.json so pollers never read a half-written file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def _read_state(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (OSError, TypeError):
+        return True  # exists but not ours, or no pid recorded
+    return True
+
+
+def _expire_if_stale(path, state):
+    """
+    Mark a queued/running job failed when it can no longer finish: the web
+    worker that owns its pool has exited (e.g. a gunicorn restart) or it
+    exceeded JOB_TIMEOUT_S. Returns the (possibly updated) state.
+    """
+    if state.get("status") not in ("queued", "running"):
+        return state
+    owner = state.get("owner_pid")
+    if owner is not None and owner != os.getpid() and not _pid_alive(owner):
+        reason = "Job was interrupted by a server restart."
+    elif time.time() - state.get("created", 0) > JOB_TIMEOUT_S:
+        reason = "Job timed out."
+    else:
+        return state
+    state["status"] = "error"
+    state["error"] = reason
+    state["finished"] = time.time()
+    try:
+        _write_state(path, state)
+    except OSError:
+        pass
+    print(f"[JOB] {state.get('id')} expired: {reason}")
+    sys.stdout.flush()
+    return state
+
+
+def load_job(upload_folder, job_id):
+    """Return the job state dict, or None if the id is unknown."""
+    if not _valid_job_id(job_id):
+        return None
+    path = os.path.join(job_dir(upload_folder, job_id), "job.json")
+    try:
+        return _expire_if_stale(path, _read_state(path))
+    except (OSError, ValueError):
+        return None
+
+
+def active_jobs(upload_folder):
+    """States of the queued and running jobs (stale ones are expired on the way)."""
+    root = jobs_root(upload_folder)
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return []
+    states = []
+    for name in names:
+        state = load_job(upload_folder, name)
+        if state is not None and state.get("status") in ("queued", "running"):
+            states.append(state)
+    return states
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: a forked web worker may hold torch threads or model-registry locks
+            _executor = ProcessPoolExecutor(max_workers=JOB_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _reset_executor(broken):
+    """Drop a pool that lost a worker process (e.g. OOM) so the next job gets a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is not broken:
+            return
+        _executor = None
+    print("[JOB] Worker pool broken; starting a new one for the next job")
+    sys.stdout.flush()
+    broken.shutdown(wait=False)
+
+
+def _run_job(directory):
+    """Worker process entry point: run process_video for one job directory."""
+    state_path = os.path.join(directory, "job.json")
+    state = _read_state(state_path)
+    state["status"] = "running"
+    state["started"] = time.time()
+    _write_state(state_path, state)
+
+    try:
+        from .processing import process_video
+
+        print(f"[JOB] {state['id']} started ({state['original_filename']})")
+        sys.stdout.flush()
+        options = state.get("options", {})
+        result = process_video(
+            state["input_path"],
+            directory,
+            upload_hash=state["upload_hash"],
+            upload_folder=state["upload_folder"],
+            **{k: bool(options.get(k)) for k in JOB_OPTIONS}
+        )
+        state["status"] = "done"
+        state["result"] = result
+        print(f"[JOB] {state['id']} finished")
+        sys.stdout.flush()
+    except Exception as e:
+        traceback.print_exc()
+        sys.stdout.flush()
+        state["status"] = "error"
+        state["error"] = "Error processing video: " + str(e)
+
+    state["finished"] = time.time()
+    _write_state(state_path, state)
+    return state["status"]
+
+
+def _on_job_done(state_path, executor, future):
+    """Release the pending slot; record crashes the worker could not report itself."""
+    global _pending
+    with _executor_lock:
+        _pending -= 1
+    exc = future.exception()
+    if exc is None:
+        return
+    if isinstance(exc, BrokenProcessPool):
+        _reset_executor(executor)
+    print(f"[JOB] Worker failed: {exc}")
+    sys.stdout.flush()
+    try:
+        state = _read_state(state_path)
+        if state.get("status") in ("queued", "running"):
+            state["status"] = "error"
+            state["error"] = "Worker process failed: " + str(exc)
+            state["finished"] = time.time()
+            _write_state(state_path, state)
+    except (OSError, ValueError):
+        pass
+
+
+def submit_job(upload_folder, video_file, options):
+    """
+    Store the uploaded file and queue it for processing.
+    video_file is a werkzeug FileStorage; options maps JOB_OPTIONS names to bools.
+    Returns the job state dict. Raises JobQueueFull when the pool is saturated.
+    """
+    global _pending
+    with _executor_lock:
+        if _pending >= MAX_PENDING_JOBS:
+            raise JobQueueFull("Too many jobs in progress, please retry shortly.")
+        _pending += 1
+
+    try:
+        from .result_cache import save_upload
+
+        job_id = uuid.uuid4().hex
+        directory = job_dir(upload_folder, job_id)
+        os.makedirs(directory, exist_ok=True)
+
+        input_path, upload_hash = save_upload(video_file, upload_folder)
+
+        state = {
+            "id": job_id,
+            "status": "queued",
+            "input_path": os.path.abspath(input_path),
+            "upload_hash": upload_hash,
+            "upload_folder": os.path.abspath(upload_folder),
+            "original_filename": video_file.filename,
+            "options": {k: bool(options.get(k)) for k in JOB_OPTIONS},
+            "created": time.time(),
+            "owner_pid": os.getpid(),
+            "started": None,
+            "finished": None,
+            "result": None,
+            "error": None,
+        }
+        state_path = os.path.join(directory, "job.json")
+        _write_state(state_path, state)
+
+        executor = _get_executor()
+        try:
+            future = executor.submit(_run_job, directory)
+        except BrokenProcessPool:
+            _reset_executor(executor)
+            executor = _get_executor()
+            future = executor.submit(_run_job, directory)
+    except BaseException:
+        with _executor_lock:
+            _pending -= 1
+        raise
+
+    future.add_done_callback(lambda f: _on_job_done(state_path, executor, f))
+    return state
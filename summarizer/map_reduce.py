@@ -0,0 +1,133 @@
+"""
+Map-reduce summarization for long transcripts.
+Map: the transcript is packed into token-budget chunks that are summarized in
+one batched call, or split across SUMMARY_MAP_WORKERS worker processes when no
+model server is running. Reduce: the joined partial summaries are packed and
+summarized again, round after round, until they fit a target word count.
+Callers derive the target from the desired narration length, so TTS and
+rendering time follow the size of the output instead of the input.
+"""
+import os
+import sys
+import time
+
+from .text_summarizer import SENTENCE_END
+
+# Worker processes for the map stage (each loads its own copy of the summarizer,
+# so this trades memory for speed); ignored when the model server is running
+SUMMARY_MAP_WORKERS = max(1, int(os.getenv("SUMMARY_MAP_WORKERS", "1")))
+# Narration length the summary is reduced to, and the TTS speaking rate
+NARRATION_TARGET_SECONDS = float(os.getenv("NARRATION_TARGET_SECONDS", "90"))
+NARRATION_WORDS_PER_MINUTE = float(os.getenv("NARRATION_WORDS_PER_MINUTE", "150"))
+
+_MAX_REDUCE_ROUNDS = 4
+# BPE tokens per English word, to turn a word target into generation lengths
+_TOKENS_PER_WORD = 1.4
+_MAP_KWARGS = {"max_length": 150, "min_length": 30, "do_sample": False}
+
+
+def words_for_duration(seconds, words_per_minute=None):
+    """Number of words the narration can hold in `seconds`."""
+    wpm = words_per_minute or NARRATION_WORDS_PER_MINUTE
+    return max(1, int(seconds * wpm / 60.0))
+
+
+def _summarize_group(task):
+    """Worker entry point: summarize one contiguous group of chunks."""
+    from .text_summarizer import summarize_packed
+
+    chunks, kwargs = task
+    return summarize_packed(chunks, **kwargs)
+
+
+def map_summaries(text, workers=None, **kwargs):
+    """
+    Summarize every chunk of text and return the partial summaries in order.
+    With workers > 1 (SUMMARY_MAP_WORKERS) and no model server, contiguous
+    groups of chunks are summarized in parallel processes.
+    """
+    from .model_server import remote_pipeline
+    from .text_summarizer import pack_chunks, summarize_packed
+
+    kwargs = {**_MAP_KWARGS, **kwargs}
+    chunks = pack_chunks(text)
+    workers = min(SUMMARY_MAP_WORKERS if workers is None else workers, len(chunks))
+    # The model server already batches every chunk into one call
+    if workers <= 1 or remote_pipeline("summarize") is not None:
+        return summarize_packed(chunks, **kwargs)
+
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    from .model_registry import init_worker_process
+
+    size = -(-len(chunks) // workers)
+    groups = [chunks[i:i + size] for i in range(0, len(chunks), size)]
+    threads = max(1, (os.cpu_count() or 1) // len(groups))
+    print(f"[SUMMARY] Map: {len(chunks)} chunks in {len(groups)} processes ({threads} torch threads each)...")
+    sys.stdout.flush()
+
+    # spawn: forking a process that already runs torch/OpenMP threads can deadlock
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(groups), mp_context=ctx,
+                             initializer=init_worker_process, initargs=(threads,)) as pool:
+        parts = list(pool.map(_summarize_group, [(group, kwargs) for group in groups]))
+    return [summary for part in parts for summary in part]
+
+
+def _trim_to_words(text, max_words):
+    """Keep whole sentences up to max_words (at least the first sentence)."""
+    kept, used = [], 0
+    for sentence in SENTENCE_END.split(text.strip()):
+        n = len(sentence.split())
+        if kept and used + n > max_words:
+            break
+        kept.append(sentence)
+        used += n
+    return " ".join(kept)
+
+
+def reduce_summaries(partials, target_words):
+    """
+    Summarize the joined partial summaries until they fit target_words.
+    Each round packs the text into chunks and gives every chunk a share of the
+    target, so the next round usually fits in a single chunk.
+    """
+    from .text_summarizer import pack_chunks, summarize_packed
+
+    summary = " ".join(p.strip() for p in partials if p.strip())
+    rounds = 0
+    while len(summary.split()) > target_words and rounds < _MAX_REDUCE_ROUNDS:
+        rounds += 1
+        chunks = pack_chunks(summary)
+        max_length = int(target_words * _TOKENS_PER_WORD / len(chunks))
+        max_length = max(56, min(max_length, 1024 if len(chunks) == 1 else 150))
+        reduced = " ".join(summarize_packed(chunks, max_length=max_length,
+                                            min_length=max(10, max_length // 2), do_sample=False))
+        print(f"[SUMMARY] Reduce round {rounds}: {len(summary.split())} -> {len(reduced.split())} words "
+              f"({len(chunks)} chunks, target {target_words})")
+        sys.stdout.flush()
+        if len(reduced.split()) >= len(summary.split()):
+            break
+        summary = reduced
+
+    if len(summary.split()) > target_words:
+        print(f"[SUMMARY] Trimming {len(summary.split())} words to the {target_words}-word target")
+        sys.stdout.flush()
+        summary = _trim_to_words(summary, target_words)
+    return summary
+
+
+def summarize_for_narration(text, narration_seconds=None, workers=None):
+    """
+    Map-reduce summary of text sized for narration_seconds of speech
+    (NARRATION_TARGET_SECONDS by default).
+    """
+    target_words = words_for_duration(narration_seconds or NARRATION_TARGET_SECONDS)
+    started = time.time()
+    partials = map_summaries(text, workers=workers)
+    summary = reduce_summaries(partials, target_words)
+    print(f"[SUMMARY] {len(text.split())} words -> {len(partials)} partial summaries -> "
+          f"{len(summary.split())} words in {time.time() - started:.1f}s")
+    sys.stdout.flush()
+    return summary
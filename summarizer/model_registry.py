@@ -0,0 +1,200 @@
+"""
+Process-wide registry of loaded models.
+Models are loaded lazily on first use, shared by every request in the process
+and keyed by (backend, model size, dtype), so the transformers Whisper pipeline
+used for uploads, the openai-whisper model used for YouTube audio and the BART
+summarizer live in one place. When the estimated size of all loaded models
+exceeds MODEL_REGISTRY_MAX_MB the least recently used ones are dropped.
+
+dtype "int8" loads the float32 weights and applies torch dynamic int8
+quantization to every nn.Linear layer (CPU inference only).
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+MODEL_REGISTRY_MAX_MB = int(os.getenv("MODEL_REGISTRY_MAX_MB", "2048"))
+
+# Backends
+TRANSFORMERS_ASR = "transformers-asr"
+TRANSFORMERS_SUMMARIZATION = "transformers-summarization"
+OPENAI_WHISPER = "openai-whisper"
+
+DTYPES = ("float32", "float16", "bfloat16", "int8")
+
+_models = OrderedDict()   # (backend, size, dtype) -> (model, bytes)
+_lock = threading.Lock()
+_load_locks = {}
+
+
+def init_worker_process(threads):
+    """
+    ProcessPoolExecutor initializer for workers that load their own models:
+    pin torch to `threads` intra-op threads before anything is loaded, and
+    stop the worker from forwarding its work to the model server (which
+    would run the workers' calls one after another).
+    """
+    os.environ.pop("MODEL_SERVER_SOCKET", None)
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    import torch
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+
+def _torch_dtype(dtype):
+    import torch
+
+    return {"float32": torch.float32, "float16": torch.float16, "bfloat16": torch.bfloat16}[dtype]
+
+
+def quantize_int8(module):
+    """Dynamic int8 quantization of the nn.Linear layers of a torch module (CPU)."""
+    import torch
+
+    module.eval()
+    return torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_transformers_asr(size, dtype):
+    from transformers import pipeline
+
+    pipe = pipeline(
+        "automatic-speech-recognition",
+        model="openai/whisper-%s" % size,
+        torch_dtype=_torch_dtype("float32" if dtype == "int8" else dtype),
+        return_timestamps=True,
+    )
+    if dtype == "int8":
+        pipe.model = quantize_int8(pipe.model)
+    return pipe
+
+
+def _load_transformers_summarization(name, dtype):
+    from transformers import pipeline
+
+    pipe = pipeline(
+        "summarization",
+        model=name,
+        torch_dtype=_torch_dtype("float32" if dtype == "int8" else dtype),
+    )
+    if dtype == "int8":
+        pipe.model = quantize_int8(pipe.model)
+    return pipe
+
+
+def _load_openai_whisper(size, dtype):
+    import whisper
+
+    model = whisper.load_model(size, device="cpu")
+    if dtype == "int8":
+        import torch
+
+        # whisper wraps nn.Linear in a subclass (it only adds dtype casting) that
+        # quantize_dynamic does not match by type
+        for module in model.modules():
+            if isinstance(module, torch.nn.Linear):
+                module.__class__ = torch.nn.Linear
+        model = quantize_int8(model)
+    elif dtype != "float32":
+        model = model.to(_torch_dtype(dtype))
+    return model
+
+
+_LOADERS = {
+    TRANSFORMERS_ASR: _load_transformers_asr,
+    TRANSFORMERS_SUMMARIZATION: _load_transformers_summarization,
+    OPENAI_WHISPER: _load_openai_whisper,
+}
+
+
+def _tensor_bytes(value):
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(v) for v in value)
+    try:
+        return value.numel() * value.element_size()
+    except (AttributeError, TypeError, RuntimeError):
+        return 0
+
+
+def _estimate_bytes(model):
+    """
+    Weight bytes of the torch module behind model (0 if unknown).
+    Uses the state dict so packed int8 Linear weights are counted too.
+    """
+    module = getattr(model, "model", model)
+    try:
+        return sum(_tensor_bytes(v) for v in module.state_dict().values())
+    except (AttributeError, TypeError):
+        return 0
+
+
+def _evict(max_bytes, keep):
+    """Drop least recently used models until the registry fits max_bytes. Call with _lock held."""
+    total = sum(size for _model, size in _models.values())
+    for key in list(_models):
+        if total <= max_bytes:
+            break
+        if key == keep:
+            continue
+        _model, size = _models.pop(key)
+        total -= size
+        print(f"[MODELS] Evicted {key[0]}/{key[1]} ({key[2]}, {size // (1024 * 1024)} MB)")
+        sys.stdout.flush()
+
+
+def get_model(backend, size="base", dtype="float32"):
+    """
+    Return the shared model for (backend, size, dtype), loading it on first use.
+    backend is TRANSFORMERS_ASR / TRANSFORMERS_SUMMARIZATION (transformers
+    pipelines; size is the Whisper size or the summarization model id) or
+    OPENAI_WHISPER.
+    """
+    if backend not in _LOADERS:
+        raise ValueError("Unknown model backend: %s" % backend)
+    if dtype not in DTYPES:
+        raise ValueError("Unknown dtype: %s (expected one of %s)" % (dtype, ", ".join(DTYPES)))
+    key = (backend, size, dtype)
+
+    with _lock:
+        if key in _models:
+            _models.move_to_end(key)
+            return _models[key][0]
+        load_lock = _load_locks.setdefault(key, threading.Lock())
+
+    # Load outside the registry lock so other models stay available meanwhile;
+    # the per-key lock makes concurrent requests for the same model wait for one load.
+    with load_lock:
+        with _lock:
+            if key in _models:
+                _models.move_to_end(key)
+                return _models[key][0]
+
+        print(f"[MODELS] Loading {backend}/{size} ({dtype})...")
+        sys.stdout.flush()
+        model = _LOADERS[backend](size, dtype)
+        nbytes = _estimate_bytes(model)
+
+        with _lock:
+            _models[key] = (model, nbytes)
+            _evict(MODEL_REGISTRY_MAX_MB * 1024 * 1024, keep=key)
+        print(f"[MODELS] Loaded {backend}/{size} ({nbytes // (1024 * 1024)} MB)")
+        sys.stdout.flush()
+        return model
+
+
+def loaded_models():
+    """Keys and estimated sizes (bytes) of the loaded models, least recently used first."""
+    with _lock:
+        return [(key, size) for key, (_model, size) in _models.items()]
+
+
+def clear():
+    """Drop every loaded model (e.g. before forking worker processes)."""
+    with _lock:
+        _models.clear()
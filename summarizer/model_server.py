@@ -0,0 +1,300 @@
+"""
+Local inference server shared by all web worker processes.
+One process owns the Whisper (transformers) and summarization pipelines and
+serves requests over a Unix socket (multiprocessing.connection), so gunicorn
+workers and job processes do not each load their own copy of the models.
+Concurrent requests with the same generation settings are batched into a
+single pipeline call.
+
+Start it with gunicorn (see gunicorn.conf.py) or standalone:
+    MODEL_SERVER_SOCKET=/tmp/models.sock MODEL_SERVER_AUTHKEY=<hex> python -m summarizer.model_server
+Clients use it when MODEL_SERVER_SOCKET is set and fall back to in-process
+models if the server cannot be reached.
+"""
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+MODEL_SERVER_SOCKET = os.getenv("MODEL_SERVER_SOCKET", "")
+MODEL_SERVER_MAX_BATCH = max(1, int(os.getenv("MODEL_SERVER_MAX_BATCH", "8")))
+# How long the server waits for more requests to join a batch
+MODEL_SERVER_BATCH_WAIT_MS = float(os.getenv("MODEL_SERVER_BATCH_WAIT_MS", "20"))
+# While waiting for a reply, a client pings the server this often; a server that
+# stops answering pings fails the request (queued work alone never does)
+MODEL_SERVER_PING_S = float(os.getenv("MODEL_SERVER_PING_S", "30"))
+
+OPS = ("asr", "summarize")
+
+_local = threading.local()
+_server_process = None
+
+
+def _authkey():
+    return bytes.fromhex(os.getenv("MODEL_SERVER_AUTHKEY", "")) or b"video-summarizer"
+
+
+def _local_pipeline(op):
+    """The in-process pipeline for op (what the server itself runs)."""
+    if op == "asr":
+        from .auto_caption import _get_local_pipe
+        return _get_local_pipe()
+    from .text_summarizer import _get_local_summarizer
+    return _get_local_summarizer()
+
+
+# --- server -----------------------------------------------------------------
+
+class _Request:
+    def __init__(self, inputs, kwargs):
+        self.inputs = inputs
+        self.kwargs = kwargs
+        self.is_list = isinstance(inputs, list)
+        # batch_size only changes how the work is split, not the output
+        self.key = tuple(sorted((k, repr(v)) for k, v in kwargs.items() if k != "batch_size"))
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Batcher:
+    """Collects concurrent requests for one pipeline and runs them as one call."""
+
+    def __init__(self, op, max_batch, wait_s):
+        self.op = op
+        self.max_batch = max_batch
+        self.wait_s = wait_s
+        self.queue = queue.Queue()
+        threading.Thread(target=self._loop, name="batcher-%s" % op, daemon=True).start()
+
+    def submit(self, inputs, kwargs):
+        request = _Request(inputs, kwargs)
+        self.queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise RuntimeError(request.error)
+        return request.result
+
+    def _loop(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.wait_s
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            groups = {}
+            for request in batch:
+                groups.setdefault(request.key, []).append(request)
+            for requests in groups.values():
+                self._run(requests)
+
+    def _run(self, requests):
+        items = []
+        for request in requests:
+            items.extend(request.inputs if request.is_list else [request.inputs])
+        kwargs = dict(requests[0].kwargs)
+        # Merging requests makes one call, not bigger forward passes than a caller asked for
+        kwargs["batch_size"] = min(max(r.kwargs.get("batch_size", 1) for r in requests), self.max_batch)
+        try:
+            outputs = _local_pipeline(self.op)(items, **kwargs)
+            if len(items) == 1 and not isinstance(outputs, list):
+                outputs = [outputs]
+        except Exception as e:
+            for request in requests:
+                request.error = "%s: %s" % (type(e).__name__, e)
+                request.done.set()
+            return
+
+        if len(requests) > 1 or len(items) > 1:
+            print(f"[MODEL SERVER] {self.op}: {len(items)} inputs from {len(requests)} requests in one batch")
+            sys.stdout.flush()
+        position = 0
+        for request in requests:
+            n = len(request.inputs) if request.is_list else 1
+            part = outputs[position:position + n]
+            position += n
+            if request.is_list:
+                request.result = part
+            elif self.op == "summarize":
+                request.result = part  # a single text gives a one-element list, as the pipeline does
+            else:
+                request.result = part[0]
+            request.done.set()
+
+
+def _handle(conn, batchers):
+    with conn:
+        while True:
+            try:
+                op, inputs, kwargs = conn.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                if op == "ping":
+                    reply = ("ok", "pong")
+                else:
+                    reply = ("ok", batchers[op].submit(inputs, kwargs))
+            except Exception as e:
+                reply = ("error", str(e))
+            try:
+                conn.send(reply)
+            except (OSError, ValueError):
+                return
+
+
+def serve(address=None, preload=False):
+    """Run the model server on a Unix socket until the process is killed."""
+    address = address or MODEL_SERVER_SOCKET
+    if not address:
+        raise ValueError("MODEL_SERVER_SOCKET is not set")
+    try:
+        os.remove(address)
+    except OSError:
+        pass
+
+    batchers = {op: _Batcher(op, MODEL_SERVER_MAX_BATCH, MODEL_SERVER_BATCH_WAIT_MS / 1000.0) for op in OPS}
+    if preload:
+        for op in OPS:
+            _local_pipeline(op)
+
+    listener = Listener(address, family="AF_UNIX", authkey=_authkey())
+    print(f"[MODEL SERVER] Listening on {address}")
+    sys.stdout.flush()
+    while True:
+        try:
+            conn = listener.accept()
+        except Exception as e:  # failed handshake, e.g. wrong authkey
+            print(f"[MODEL SERVER] Rejected connection: {e}")
+            sys.stdout.flush()
+            continue
+        threading.Thread(target=_handle, args=(conn, batchers), daemon=True).start()
+
+
+def start_server_process(address=None, timeout=30.0):
+    """
+    Launch `python -m summarizer.model_server` and export its socket and
+    authkey to this process's environment, so processes started (or forked)
+    afterwards use it. Returns the Popen handle.
+    """
+    global _server_process
+    import secrets
+    import tempfile
+
+    address = address or os.path.join(tempfile.gettempdir(), "video_summarizer_models_%d.sock" % os.getpid())
+    os.environ["MODEL_SERVER_SOCKET"] = address
+    os.environ.setdefault("MODEL_SERVER_AUTHKEY", secrets.token_hex(16))
+
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    _server_process = subprocess.Popen([sys.executable, "-m", "summarizer.model_server"], cwd=root_dir)
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(address) and time.monotonic() < deadline:
+        if _server_process.poll() is not None:
+            break
+        time.sleep(0.1)
+    return _server_process
+
+
+def stop_server_process():
+    global _server_process
+    if _server_process is not None and _server_process.poll() is None:
+        _server_process.terminate()
+        try:
+            _server_process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            _server_process.kill()
+    _server_process = None
+    try:
+        os.remove(os.environ.get("MODEL_SERVER_SOCKET", ""))
+    except OSError:
+        pass
+
+
+# --- client -----------------------------------------------------------------
+
+def _connection():
+    """One connection per thread (and per process: reconnect after fork)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "pid", None) == os.getpid():
+        return conn
+    conn = Client(os.environ["MODEL_SERVER_SOCKET"], family="AF_UNIX", authkey=_authkey())
+    _local.conn = conn
+    _local.pid = os.getpid()
+    return conn
+
+
+def _drop_connection():
+    conn = getattr(_local, "conn", None)
+    _local.conn = None
+    if conn is not None:
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+
+def _server_responds(timeout):
+    """True if the server accepts a new connection and answers a ping within timeout."""
+    answered = threading.Event()
+
+    def _ping():
+        try:
+            with Client(os.environ["MODEL_SERVER_SOCKET"], family="AF_UNIX", authkey=_authkey()) as conn:
+                conn.send(("ping", None, None))
+                if conn.poll(timeout) and conn.recv() == ("ok", "pong"):
+                    answered.set()
+        except (OSError, EOFError, KeyError):
+            pass
+
+    # The authkey handshake has no timeout of its own, so ping from a thread
+    thread = threading.Thread(target=_ping, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return answered.is_set()
+
+
+class RemotePipeline:
+    """Callable stand-in for a transformers pipeline that runs on the model server."""
+
+    def __init__(self, op):
+        self.op = op
+
+    def __call__(self, inputs, **kwargs):
+        try:
+            conn = _connection()
+            conn.send((self.op, inputs, kwargs))
+            # Requests may queue behind other work for a long time: keep waiting
+            # as long as the server itself is alive and answering
+            while not conn.poll(MODEL_SERVER_PING_S):
+                if not _server_responds(MODEL_SERVER_PING_S):
+                    _drop_connection()
+                    raise RuntimeError("Model server stopped responding")
+            status, value = conn.recv()
+        except (OSError, EOFError) as e:
+            # Connection refused or lost: the server is gone, so nothing runs twice
+            _drop_connection()
+            print(f"[MODEL SERVER] Unreachable ({e}); using an in-process model")
+            sys.stdout.flush()
+            return _local_pipeline(self.op)(inputs, **kwargs)
+        if status != "ok":
+            raise RuntimeError(value)
+        return value
+
+
+def remote_pipeline(op):
+    """RemotePipeline for op when a model server is configured, else None."""
+    address = os.environ.get("MODEL_SERVER_SOCKET", "")
+    if not address or not os.path.exists(address):
+        return None
+    return RemotePipeline(op)
+
+
+if __name__ == "__main__":
+    serve(preload=os.getenv("MODEL_SERVER_PRELOAD", "").lower() in ("1", "true", "yes", "on"))
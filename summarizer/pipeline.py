@@ -0,0 +1,188 @@
+"""
+Stage graph for processing one uploaded video.
+Stages are declared with their dependencies and evaluated lazily; every
+stage output is memoized, so a request runs the union of the stages its
+options need exactly once (e.g. audio extraction and Whisper transcription
+are shared by captions, narrated summary and smart edit).
+"""
+import os
+import sys
+import time
+
+KEYFRAME_INTERVAL = max(1, int(os.getenv("KEYFRAME_INTERVAL", "30")))
+KEYFRAME_MODE = os.getenv("KEYFRAME_MODE", "fixed")  # fixed | scene
+# Max dHash distance (bits of 64) for collapsing near-identical keyframes; empty (default) disables
+KEYFRAME_DEDUP_DISTANCE = os.getenv("KEYFRAME_DEDUP_DISTANCE", "")
+KEYFRAME_DEDUP_DISTANCE = int(KEYFRAME_DEDUP_DISTANCE) if KEYFRAME_DEDUP_DISTANCE.strip() else None
+# With dedup on, still keep at least one keyframe every this many seconds
+KEYFRAME_DEDUP_MAX_GAP_S = float(os.getenv("KEYFRAME_DEDUP_MAX_GAP_S", "10"))
+# Worker processes for the keyframe summary (output is identical, so not part of the cache key)
+KEYFRAME_WORKERS = max(1, int(os.getenv("KEYFRAME_WORKERS", "1")))
+# Smart edit: snap cuts to keyframes and stream-copy instead of re-encoding
+SMART_EDIT_FAST_CUT = os.getenv("SMART_EDIT_FAST_CUT", "").lower() in ("1", "true", "yes", "on")
+
+
+class PipelineError(Exception):
+    """Raised for unknown stages or dependency cycles."""
+
+
+class Pipeline:
+    """Lazily evaluated stage graph with memoized outputs."""
+
+    def __init__(self):
+        self._stages = {}
+        self._outputs = {}
+        self._running = set()
+
+    def add_stage(self, name, func, deps=()):
+        """Register func(*dep_outputs) as stage `name`."""
+        self._stages[name] = (func, tuple(deps))
+        return self
+
+    def stage(self, name, deps=()):
+        """Decorator form of add_stage."""
+        def decorator(func):
+            self.add_stage(name, func, deps)
+            return func
+        return decorator
+
+    def has_run(self, name):
+        return name in self._outputs
+
+    def get(self, name):
+        """Return the output of `name`, running it (and its dependencies) on first use."""
+        if name in self._outputs:
+            return self._outputs[name]
+        if name not in self._stages:
+            raise PipelineError(f"Unknown pipeline stage: {name}")
+        if name in self._running:
+            raise PipelineError(f"Dependency cycle at pipeline stage: {name}")
+
+        func, deps = self._stages[name]
+        self._running.add(name)
+        try:
+            inputs = [self.get(d) for d in deps]
+            started = time.time()
+            print(f"[PIPELINE] Running stage '{name}'...")
+            sys.stdout.flush()
+            output = func(*inputs)
+            print(f"[PIPELINE] Stage '{name}' done in {time.time() - started:.1f}s")
+            sys.stdout.flush()
+        finally:
+            self._running.discard(name)
+
+        self._outputs[name] = output
+        return output
+
+    def run(self, targets):
+        """Evaluate several stages; returns {name: output}."""
+        return {name: self.get(name) for name in targets}
+
+
+def build_video_pipeline(input_path, output_dir, upload_hash=None, upload_folder=None):
+    """
+    Declare the stages used by the upload form for one input video.
+
+    Stages:
+        audio       -> 16 kHz mono audio (auto_caption.load_audio_16k)
+        transcript  -> Whisper transcription of `audio`
+        keyframes   -> keyframe summary video + statistics text
+        narrated    -> narrated summary built from `transcript`
+        smart_edit  -> trimmed video built from `transcript`
+
+    When upload_hash and upload_folder are given, successful results of the
+    transcript, keyframes, narrated and smart_edit stages are served from and
+    saved to the content-addressed result cache (summarizer.result_cache).
+    """
+    pipeline = Pipeline()
+    use_cache = bool(upload_hash and upload_folder)
+
+    def cached(name, deps=(), params=None, artifacts=(), ok=lambda r: True):
+        """Register a stage whose successful output is stored in the result cache."""
+        def decorator(func):
+            def run():
+                from . import result_cache
+                if use_cache:
+                    hit = result_cache.lookup(upload_folder, upload_hash, name, params, output_dir)
+                    if hit is not None:
+                        return _with_output_path(hit, output_dir)
+                # Dependencies are resolved only on a miss, so a hit skips them entirely
+                inputs = [pipeline.get(d) for d in deps]
+                # Never write through a hard link shared with a cache entry
+                for artifact in artifacts:
+                    try:
+                        os.remove(os.path.join(output_dir, artifact))
+                    except OSError:
+                        pass
+                result = func(*inputs)
+                if use_cache and ok(result):
+                    stored = dict(result)
+                    if stored.get("output_video"):
+                        stored["output_video"] = os.path.basename(stored["output_video"])
+                    result_cache.store(upload_folder, upload_hash, name, params, stored,
+                                       output_dir, artifacts)
+                return result
+            pipeline.add_stage(name, run)
+            return func
+        return decorator
+
+    @pipeline.stage("audio")
+    def _audio():
+        from .auto_caption import load_audio_16k
+        return load_audio_16k(input_path)
+
+    from .auto_caption import (ASR_CHUNK_LENGTH_S, ASR_STREAM_MIN_SECONDS, ASR_STREAM_WINDOW_S,
+                               ASR_STRIDE_S, ASR_VAD, WHISPER_DTYPE)
+
+    @cached("transcript",
+            params={"model": "openai/whisper-base", "dtype": WHISPER_DTYPE,
+                    "chunk_length_s": ASR_CHUNK_LENGTH_S, "stride_s": ASR_STRIDE_S, "vad": ASR_VAD,
+                    "stream": [ASR_STREAM_MIN_SECONDS, ASR_STREAM_WINDOW_S]},
+            ok=lambda r: not r.get("error"))
+    def _transcript():
+        from .auto_caption import should_stream, transcribe_audio, transcribe_video_streaming
+        # Long recordings never materialize the whole decoded audio
+        if should_stream(input_path):
+            return transcribe_video_streaming(input_path)
+        return transcribe_audio(pipeline.get("audio"))
+
+    @cached("keyframes", params={"interval": KEYFRAME_INTERVAL, "mode": KEYFRAME_MODE,
+                                 "dedup": KEYFRAME_DEDUP_DISTANCE, "dedup_max_gap_s": KEYFRAME_DEDUP_MAX_GAP_S},
+            artifacts=("summary_video.mp4",))
+    def _keyframes():
+        from .video_summarizer import summarize_video
+        output_path = os.path.join(output_dir, "summary_video.mp4")
+        summary = summarize_video(input_path, output_path, interval=KEYFRAME_INTERVAL, mode=KEYFRAME_MODE,
+                                  dedup_distance=KEYFRAME_DEDUP_DISTANCE,
+                                  dedup_max_gap_seconds=KEYFRAME_DEDUP_MAX_GAP_S, workers=KEYFRAME_WORKERS)
+        return {"summary": summary, "output_video": output_path}
+
+    from .map_reduce import NARRATION_TARGET_SECONDS, NARRATION_WORDS_PER_MINUTE
+    from .text_summarizer import SUMMARIZER_DTYPE, SUMMARIZER_MODEL
+
+    @cached("narrated", deps=("transcript",), artifacts=("narrated_summary.mp4",),
+            params={"model": SUMMARIZER_MODEL, "dtype": SUMMARIZER_DTYPE,
+                    "narration_seconds": NARRATION_TARGET_SECONDS, "wpm": NARRATION_WORDS_PER_MINUTE},
+            ok=lambda r: r.get("success"))
+    def _narrated(transcript):
+        from .smart_cutter import create_narrated_summary
+        output_path = os.path.join(output_dir, "narrated_summary.mp4")
+        return create_narrated_summary(input_path, output_path, transcript_result=transcript)
+
+    @cached("smart_edit", deps=("transcript",), params={"fast_cut": SMART_EDIT_FAST_CUT},
+            artifacts=("smart_edit.mp4",), ok=lambda r: r.get("success"))
+    def _smart_edit(transcript):
+        from .smart_edit import create_smart_edit
+        output_path = os.path.join(output_dir, "smart_edit.mp4")
+        return create_smart_edit(input_path, output_path, transcript_result=transcript,
+                                 fast_cut=SMART_EDIT_FAST_CUT)
+
+    return pipeline
+
+
+def _with_output_path(result, output_dir):
+    """Point a cached result's output_video back at output_dir."""
+    result = dict(result)
+    if result.get("output_video"):
+        result["output_video"] = os.path.join(output_dir, result["output_video"])
+    return result
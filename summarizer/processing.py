@@ -0,0 +1,84 @@
+"""
+Run the selected video processing options (keyframe summary, captions,
+narrated summary, smart edit) for one uploaded file.
+Shared by the synchronous form handler and the background job workers.
+Stages shared between options (audio extraction, transcription) run once
+per request via summarizer.pipeline.
+"""
+import os
+
+
+def process_video(input_path, output_dir, do_summary=False, do_caption=False,
+                  do_narrated=False, do_smart_edit=False, upload_hash=None, upload_folder=None):
+    """
+    Process an uploaded video and write any output videos into output_dir.
+    With upload_hash (from result_cache.save_upload) and upload_folder, results
+    are reused from and saved to the content-addressed result cache.
+
+    Returns a dict with the same fields the index template renders:
+        summary, output_video, caption_text, caption_srt,
+        narrated_summary, narrated_video, smart_edit_summary, smart_edit_video,
+        msg, msg_type
+    Output video fields hold file names relative to output_dir ("" when not produced).
+    """
+    result = {
+        "summary": "",
+        "output_video": "",
+        "caption_text": "",
+        "caption_srt": "",
+        "narrated_summary": "",
+        "narrated_video": "",
+        "smart_edit_summary": "",
+        "smart_edit_video": "",
+        "msg": "",
+        "msg_type": "success",
+    }
+
+    def _add_error(text):
+        if result["msg"]:
+            result["msg"] += " "
+        result["msg"] += text
+        result["msg_type"] = "error"
+
+    from .pipeline import build_video_pipeline
+    pipeline = build_video_pipeline(input_path, output_dir, upload_hash=upload_hash,
+                                    upload_folder=upload_folder)
+
+    if do_summary:
+        keyframes = pipeline.get("keyframes")
+        result["summary"] = keyframes["summary"]
+        result["output_video"] = os.path.basename(keyframes["output_video"])
+
+    if do_caption:
+        cap = pipeline.get("transcript")
+        if cap.get("error"):
+            _add_error("Caption: " + cap["error"])
+        else:
+            result["caption_text"] = cap.get("text", "")
+            result["caption_srt"] = cap.get("srt", "")
+
+    if do_narrated:
+        narrated = pipeline.get("narrated")
+        if narrated.get("success"):
+            result["narrated_summary"] = narrated.get("summary_text", "")
+            result["narrated_video"] = os.path.basename(narrated.get("output_video") or "narrated_summary.mp4")
+            if not result["msg"]:
+                result["msg"] = "Narrated summary created successfully!"
+        else:
+            _add_error("Narrated Summary: " + (narrated.get("error") or "Unknown error"))
+
+    if do_smart_edit:
+        edited = pipeline.get("smart_edit")
+        if edited.get("success"):
+            result["smart_edit_summary"] = edited.get("summary_text", "")
+            result["smart_edit_video"] = os.path.basename(edited.get("output_video") or "smart_edit.mp4")
+            if not result["msg"]:
+                result["msg"] = "Smart edit created successfully!"
+        else:
+            _add_error("Smart Edit: " + (edited.get("error") or "Unknown error"))
+
+    if result["msg_type"] != "error" and not result["msg"]:
+        result["msg"] = "Video processed successfully!"
+        result["msg_type"] = "success"
+
+    return result
@@ -0,0 +1,264 @@
+"""
+Content-addressed cache for processing results.
+Uploads are hashed (SHA-256) while they are streamed to disk and stored once
+per hash under uploads/cache/<sha256>/. Stage results (keyframe summary,
+transcript/SRT, narrated summary, smart edit) are stored next to the upload,
+keyed by stage name plus processing parameters, so re-uploading the same file
+returns the previous artifacts instead of reprocessing.
+The uploads directory is kept under RESULT_CACHE_MAX_MB with LRU eviction.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+RESULT_CACHE_MAX_MB = int(os.getenv("RESULT_CACHE_MAX_MB", "2048"))
+# Entries used this recently may belong to a job that is still being submitted
+# (the upload is saved before its job record is written) and are not evicted
+RESULT_CACHE_MIN_AGE_S = float(os.getenv("RESULT_CACHE_MIN_AGE_S", "3600"))
+
+# Bump when stage outputs change so stale entries are not reused
+CACHE_VERSION = 1
+
+_CHUNK = 1024 * 1024
+
+
+def cache_root(upload_folder):
+    return os.path.join(upload_folder, "cache")
+
+
+def save_upload(file_storage, upload_folder):
+    """
+    Stream an uploaded werkzeug FileStorage to disk while hashing it.
+    Returns (path to the stored upload, sha256 hex digest).
+    Identical uploads are stored once, at uploads/cache/<sha256>/source<ext>.
+    """
+    root = cache_root(upload_folder)
+    os.makedirs(root, exist_ok=True)
+    ext = os.path.splitext(file_storage.filename or "")[1].lower()
+
+    sha = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(suffix=ext, dir=root)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = file_storage.stream.read(_CHUNK)
+                if not chunk:
+                    break
+                sha.update(chunk)
+                f.write(chunk)
+        digest = sha.hexdigest()
+        entry = os.path.join(root, digest)
+        os.makedirs(entry, exist_ok=True)
+        path = os.path.join(entry, "source" + ext)
+        if os.path.isfile(path):
+            os.remove(tmp)
+        else:
+            os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+    _touch(entry)
+    return path, digest
+
+
+def _params_key(stage, params):
+    blob = json.dumps({"v": CACHE_VERSION, "params": params or {}}, sort_keys=True)
+    return "%s-%s" % (stage, hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16])
+
+
+def _touch(path):
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def _link_or_copy(src, dst):
+    """Hard-link src to dst (replacing dst); fall back to a copy across filesystems."""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return
+    # Unique per writer: two requests may store the same entry at once
+    tmp = "%s.%d-%d.tmp" % (dst, os.getpid(), threading.get_ident())
+    try:
+        os.remove(tmp)
+    except OSError:
+        pass
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def lookup(upload_folder, upload_hash, stage, params, output_dir):
+    """
+    Return the cached result for (upload_hash, stage, params), or None.
+    Cached artifacts are linked into output_dir under their original names.
+    """
+    entry = os.path.join(cache_root(upload_folder), upload_hash, _params_key(stage, params))
+    meta_path = os.path.join(entry, "result.json")
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        os.makedirs(output_dir, exist_ok=True)
+        for name in meta.get("artifacts", []):
+            _link_or_copy(os.path.join(entry, name), os.path.join(output_dir, name))
+    except (OSError, ValueError):
+        return None
+
+    _touch(meta_path)
+    _touch(os.path.dirname(entry))
+    print(f"[CACHE] Hit for {stage} ({upload_hash[:12]})")
+    sys.stdout.flush()
+    return meta.get("result")
+
+
+def store(upload_folder, upload_hash, stage, params, result, output_dir, artifacts=()):
+    """
+    Save a JSON-serializable stage result plus artifact files (names inside output_dir).
+    Errors are logged and ignored; caching is best effort.
+    """
+    entry = os.path.join(cache_root(upload_folder), upload_hash, _params_key(stage, params))
+    try:
+        os.makedirs(entry, exist_ok=True)
+        for name in artifacts:
+            _link_or_copy(os.path.join(output_dir, name), os.path.join(entry, name))
+        meta_path = os.path.join(entry, "result.json")
+        tmp = "%s.%d-%d.tmp" % (meta_path, os.getpid(), threading.get_ident())
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "params": params, "artifacts": list(artifacts),
+                       "result": result, "created": time.time()}, f)
+        os.replace(tmp, meta_path)
+        _touch(os.path.dirname(entry))
+    except (OSError, TypeError, ValueError) as e:
+        print(f"[CACHE] Could not store {stage} result: {e}")
+        sys.stdout.flush()
+        return
+
+    enforce_size_limit(upload_folder, keep=(upload_hash,))
+
+
+def _file_usage(path, seen_inodes):
+    """Size of one file, or 0 if it was already counted through another hard link."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 0
+    if (st.st_dev, st.st_ino) in seen_inodes:
+        return 0
+    seen_inodes.add((st.st_dev, st.st_ino))
+    return st.st_size
+
+
+def _tree_usage(path, seen_inodes):
+    """Bytes used under path, counting hard-linked files once."""
+    total = 0
+    last_used = 0.0
+    for dirpath, _dirs, files in os.walk(path):
+        for name in files:
+            path_name = os.path.join(dirpath, name)
+            try:
+                last_used = max(last_used, os.stat(path_name).st_mtime)
+            except OSError:
+                continue
+            total += _file_usage(path_name, seen_inodes)
+    return total, last_used
+
+
+def _freed_usage(path):
+    """
+    Bytes that removing the tree at path would free: files whose every hard
+    link is inside the tree (files still linked from elsewhere stay on disk).
+    """
+    links = {}
+    for dirpath, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                st = os.stat(os.path.join(dirpath, name))
+            except OSError:
+                continue
+            key = (st.st_dev, st.st_ino)
+            size, nlink, count = links.get(key, (st.st_size, st.st_nlink, 0))
+            links[key] = (size, nlink, count + 1)
+    return sum(size for size, nlink, count in links.values() if count >= nlink)
+
+
+def enforce_size_limit(upload_folder, max_bytes=None, keep=()):
+    """
+    Evict least recently used cache entries and finished job folders until the
+    uploads directory fits max_bytes. Names in `keep`, uploads referenced by
+    queued or running jobs and entries used within RESULT_CACHE_MIN_AGE_S are
+    never evicted.
+    """
+    from .jobs import active_jobs
+
+    if max_bytes is None:
+        max_bytes = RESULT_CACHE_MAX_MB * 1024 * 1024
+    keep = set(keep) | {job.get("upload_hash") for job in active_jobs(upload_folder)}
+    recent = time.time() - RESULT_CACHE_MIN_AGE_S
+
+    candidates = []
+    seen = set()
+    total = 0
+    for parent in (cache_root(upload_folder), os.path.join(upload_folder, "jobs")):
+        try:
+            names = os.listdir(parent)
+        except OSError:
+            continue
+        for name in names:
+            path = os.path.join(parent, name)
+            if not os.path.isdir(path):
+                continue
+            size, last_used = _tree_usage(path, seen)
+            try:
+                last_used = max(last_used, os.stat(path).st_mtime)
+            except OSError:
+                pass
+            total += size
+            if name in keep or last_used >= recent or not _evictable(path):
+                continue
+            candidates.append((last_used, path))
+
+    # Loose files in the uploads folder count toward the limit but are not evicted
+    try:
+        for name in os.listdir(upload_folder):
+            path = os.path.join(upload_folder, name)
+            if os.path.isfile(path):
+                total += _file_usage(path, seen)
+    except OSError:
+        pass
+
+    if total <= max_bytes:
+        return
+
+    candidates.sort()
+    for _last_used, path in candidates:
+        if total <= max_bytes:
+            break
+        # Files still linked from a job folder or cache entry are not freed by this removal
+        freed = _freed_usage(path)
+        shutil.rmtree(path, ignore_errors=True)
+        total -= freed
+        print(f"[CACHE] Evicted {path} ({freed // 1024} KB freed)")
+        sys.stdout.flush()
+
+
+def _evictable(path):
+    """Job folders may only be evicted once the job has finished."""
+    state_path = os.path.join(path, "job.json")
+    if not os.path.isfile(state_path):
+        return True
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("status") in ("done", "error")
+    except (OSError, ValueError):
+        return False
@@ -12,29 +12,19 @@ from typing import Optional, Dict, List, Tuple
 
 # Import existing modules
 from .auto_caption import transcribe_video
+from .ffmpeg_render import probe_media, render_narrated
 
 
-def _generate_summary_text(transcript: str) -> str:
-    """Generate a cohesive summary from the transcript using BART."""
+def _generate_summary_text(transcript: str, narration_seconds: Optional[float] = None) -> str:
+    """
+    Generate a cohesive summary from the transcript using BART.
+    Chunks are summarized (map) and the partial summaries condensed (reduce)
+    until the text fits narration_seconds of voice-over.
+    """
     try:
-        from transformers import pipeline
-        
-        # Initialize summarizer
-        summarizer = pipeline('summarization', model='facebook/bart-large-cnn')
-        
-        # BART has a max token limit, so chunk if needed
-        max_chunk = 1024
-        chunks = []
-        words = transcript.split()
+        from .map_reduce import summarize_for_narration
         
-        for i in range(0, len(words), max_chunk):
-            chunk = ' '.join(words[i:i + max_chunk])
-            if len(chunk.strip()) > 50:  # Only summarize meaningful chunks
-                result = summarizer(chunk, max_length=150, min_length=30, do_sample=False)
-                chunks.append(result[0]['summary_text'])
-        
-        # Combine all summaries
-        summary = ' '.join(chunks)
+        summary = summarize_for_narration(transcript, narration_seconds)
         
         # Make it more conversational for voice-over
         summary = summary.replace('. ', '. \n')  # Add pauses
@@ -121,9 +111,15 @@ def _get_audio_duration(audio_path: str) -> float:
     except Exception as e:
         print(f"Wave method failed: {e}")
     
-    # Method 2: Try moviepy
+    # Method 2: Ask ffmpeg (handles MP3 from edge-tts)
+    info = probe_media(audio_path)
+    if info["duration"] > 0:
+        print(f"Audio duration (ffmpeg): {info['duration']}s")
+        return info["duration"]
+    
+    # Method 3: Try moviepy
     try:
-        from moviepy.editor import AudioFileClip
+        from moviepy import AudioFileClip
         clip = AudioFileClip(audio_path)
         duration = clip.duration
         clip.close()
@@ -133,7 +129,7 @@ def _get_audio_duration(audio_path: str) -> float:
     except Exception as e:
         print(f"MoviePy method failed: {e}")
     
-    # Method 3: Use mutagen for MP3/other formats
+    # Method 4: Use mutagen for MP3/other formats
     try:
         from mutagen.mp3 import MP3
         audio = MP3(audio_path)
@@ -144,7 +140,7 @@ def _get_audio_duration(audio_path: str) -> float:
     except Exception as e:
         print(f"Mutagen method failed: {e}")
     
-    # Method 4: Estimate from file size (very rough)
+    # Method 5: Estimate from file size (very rough)
     # MP3 at 128 kbps ≈ 16 KB/s, so duration ≈ file_size / 16000
     estimated = file_size / 16000.0
     print(f"Estimated duration from file size: {estimated}s")
@@ -157,11 +153,10 @@ def _select_video_clips(video_path: str, segments: List[Dict], target_duration:
     Returns list of (start_time, end_time) tuples.
     """
     try:
-        from moviepy.editor import VideoFileClip
-        
-        video = VideoFileClip(video_path)
-        total_duration = video.duration
-        video.close()
+        info = probe_media(video_path)
+        if info["error"] or info["duration"] <= 0:
+            raise ValueError(info["error"] or "unknown video duration")
+        total_duration = info["duration"]
         
         # Strategy: Select segments evenly distributed across the video
         # to give a comprehensive overview
@@ -221,6 +216,22 @@ def _select_video_clips(video_path: str, segments: List[Dict], target_duration:
 
 def _create_edited_video(video_path: str, clips: List[Tuple[float, float]], voiceover_path: str, output_path: str) -> bool:
     """Create final video by combining selected clips with voice-over."""
+    print(f"Creating video with {len(clips)} clips")
+    sys.stdout.flush()
+    
+    error = render_narrated(video_path, clips, voiceover_path, output_path)
+    if error is None and os.path.isfile(output_path):
+        print("Video creation complete!")
+        sys.stdout.flush()
+        return True
+    
+    print(f"[RENDER] ffmpeg render failed, falling back to moviepy: {error}")
+    sys.stdout.flush()
+    return _create_edited_video_moviepy(video_path, clips, voiceover_path, output_path)
+
+
+def _create_edited_video_moviepy(video_path: str, clips: List[Tuple[float, float]], voiceover_path: str, output_path: str) -> bool:
+    """Fallback renderer: cut, concatenate and dub the clips frame by frame with moviepy."""
     try:
         print(f"Creating video with {len(clips)} clips")
         sys.stdout.flush()
@@ -314,9 +325,12 @@ def _create_edited_video(video_path: str, clips: List[Tuple[float, float]], voic
         return False
 
 
-def create_narrated_summary(video_path: str, output_path: str) -> Dict[str, any]:
+def create_narrated_summary(video_path: str, output_path: str, transcript_result: Optional[Dict] = None,
+                            narration_seconds: Optional[float] = None) -> Dict[str, any]:
     """
     Main function to create a narrated video summary.
+    Pass transcript_result (from transcribe_video) to reuse an existing transcription.
+    narration_seconds sets the target voice-over length (default NARRATION_TARGET_SECONDS).
     
     Returns:
         {
@@ -328,8 +342,9 @@ def create_narrated_summary(video_path: str, output_path: str) -> Dict[str, any]
     """
     try:
         print("Step 1/5: Transcribing video...")
-        # 1. Transcribe video
-        transcript_result = transcribe_video(video_path)
+        # 1. Transcribe video (unless the caller already did)
+        if transcript_result is None:
+            transcript_result = transcribe_video(video_path)
         
         if transcript_result.get('error'):
             return {
@@ -352,7 +367,7 @@ def create_narrated_summary(video_path: str, output_path: str) -> Dict[str, any]
         
         print("Step 2/5: Generating summary...")
         # 2. Generate summary text
-        summary_text = _generate_summary_text(transcript_text)
+        summary_text = _generate_summary_text(transcript_text, narration_seconds)
         
         print("Step 3/5: Creating voice-over narration...")
         # 3. Generate voice-over
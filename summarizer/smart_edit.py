@@ -6,9 +6,11 @@ with the speaker's original voice.
 import os
 import sys
 import traceback
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 
 from .auto_caption import transcribe_video
+from .ffmpeg_render import probe_media, render_clips
+from .vad import intersect_regions
 
 
 def _analyze_important_segments(segments: List[Dict], full_text: str) -> List[Tuple[float, float]]:
@@ -78,7 +80,57 @@ def _merge_adjacent_clips(clips: List[Tuple[float, float]], max_gap: float = 1.0
     return merged
 
 
-def create_smart_edit(video_path: str, output_path: str, target_ratio: float = 0.5) -> Dict:
+def _render_with_moviepy(video_path: str, clips: List[Tuple[float, float]], output_path: str) -> Tuple[float, float]:
+    """Fallback renderer: cut and join clips frame-by-frame with moviepy. Returns (original, edited) durations."""
+    from moviepy import VideoFileClip, concatenate_videoclips
+    
+    video = VideoFileClip(video_path)
+    original_duration = video.duration
+    
+    video_clips = []
+    for i, (start, end) in enumerate(clips):
+        print(f"   Extracting clip {i+1}/{len(clips)}: {start:.1f}s - {end:.1f}s")
+        sys.stdout.flush()
+        
+        # Keep FULL clip with original audio
+        video_clips.append(video.subclipped(start, end))
+    
+    print("   Joining clips...")
+    sys.stdout.flush()
+    
+    if len(video_clips) > 1:
+        final_video = concatenate_videoclips(video_clips, method="compose")
+    else:
+        final_video = video_clips[0]
+    
+    edited_duration = final_video.duration
+    
+    print(f"   Writing output video ({edited_duration:.1f}s)...")
+    sys.stdout.flush()
+    
+    final_video.write_videofile(
+        output_path,
+        codec='libx264',
+        audio_codec='aac'
+    )
+    
+    print("   Cleaning up...")
+    sys.stdout.flush()
+    
+    final_video.close()
+    video.close()
+    for clip in video_clips:
+        try:
+            clip.close()
+        except:
+            pass
+    
+    return original_duration, edited_duration
+
+
+def create_smart_edit(video_path: str, output_path: str, target_ratio: float = 0.5,
+                      transcript_result: Optional[Dict] = None, fast_cut: bool = False,
+                      speech_regions: Optional[List[Tuple[float, float]]] = None) -> Dict:
     """
     Create an intelligently edited version of the video with original audio.
     Removes unnecessary parts while keeping the speaker's voice.
@@ -87,6 +139,10 @@ def create_smart_edit(video_path: str, output_path: str, target_ratio: float = 0
         video_path: Path to input video
         output_path: Path for output video
         target_ratio: Target length as ratio of original (0.5 = 50% of original)
+        transcript_result: Existing transcribe_video() result to reuse (optional)
+        fast_cut: Snap cuts to keyframes and stream-copy instead of re-encoding
+        speech_regions: VAD speech regions (seconds); defaults to the transcript's
+            "speech_regions". Kept segments are trimmed to them to drop silence.
     
     Returns:
         {
@@ -102,8 +158,9 @@ def create_smart_edit(video_path: str, output_path: str, target_ratio: float = 0
         print("[SMART EDIT] Step 1/4: Analyzing video content...")
         sys.stdout.flush()
         
-        # 1. Transcribe to understand content
-        transcript_result = transcribe_video(video_path)
+        # 1. Transcribe to understand content (unless the caller already did)
+        if transcript_result is None:
+            transcript_result = transcribe_video(video_path)
         
         if transcript_result.get('error'):
             return {
@@ -150,80 +207,61 @@ def create_smart_edit(video_path: str, output_path: str, target_ratio: float = 0
         print(f"   Identified {len(important_clips)} important segments")
         sys.stdout.flush()
         
+        # Trim kept segments to detected speech so long pauses inside them are dropped
+        if speech_regions is None:
+            speech_regions = transcript_result.get('speech_regions')
+        if speech_regions:
+            trimmed = intersect_regions(important_clips, [tuple(r) for r in speech_regions])
+            if trimmed:
+                print(f"   Trimmed to speech: {sum(e - s for s, e in important_clips):.1f}s -> "
+                      f"{sum(e - s for s, e in trimmed):.1f}s")
+                sys.stdout.flush()
+                important_clips = trimmed
+        
         # 3. Merge adjacent clips for smooth editing
         merged_clips = _merge_adjacent_clips(important_clips, max_gap=1.5)
         print(f"   Merged into {len(merged_clips)} smooth sections")
         sys.stdout.flush()
         
-        print("[SMART EDIT] Step 3/4: Loading video...")
+        print("[SMART EDIT] Step 3/4: Probing video...")
         sys.stdout.flush()
         
-        from moviepy import VideoFileClip, concatenate_videoclips
-        
-        video = VideoFileClip(video_path)
-        original_duration = video.duration
+        info = probe_media(video_path)
+        original_duration = info["duration"]
+        if original_duration > 0:
+            merged_clips = [(s, min(e, original_duration)) for s, e in merged_clips if s < original_duration]
         
         print(f"   Original video: {original_duration:.1f}s")
         sys.stdout.flush()
         
-        # 4. Extract clips WITH original audio
-        print("[SMART EDIT] Step 4/4: Creating edited video...")
-        sys.stdout.flush()
-        
-        video_clips = []
-        total_kept = 0
-        
-        for i, (start, end) in enumerate(merged_clips):
-            print(f"   Extracting clip {i+1}/{len(merged_clips)}: {start:.1f}s - {end:.1f}s")
+        total_kept = sum(end - start for start, end in merged_clips)
+        if original_duration > 0:
+            print(f"   Total content kept: {total_kept:.1f}s ({total_kept/original_duration*100:.1f}%)")
             sys.stdout.flush()
-            
-            # Keep FULL clip with original audio
-            clip = video.subclipped(start, end)
-            video_clips.append(clip)
-            total_kept += (end - start)
-        
-        print(f"   Total content kept: {total_kept:.1f}s ({total_kept/original_duration*100:.1f}%)")
-        sys.stdout.flush()
         
-        # 5. Concatenate clips
-        print("   Joining clips...")
+        # 4. Cut and join clips WITH original audio in one native ffmpeg pass
+        print("[SMART EDIT] Step 4/4: Creating edited video...")
         sys.stdout.flush()
         
-        if len(video_clips) > 1:
-            final_video = concatenate_videoclips(video_clips, method="compose")
+        render_error = render_clips(video_path, merged_clips, output_path, keep_audio=True, fast_cut=fast_cut)
+        if render_error:
+            print(f"   ffmpeg render failed ({render_error[:200]}), falling back to moviepy...")
+            sys.stdout.flush()
+            original_duration, edited_duration = _render_with_moviepy(video_path, merged_clips, output_path)
         else:
-            final_video = video_clips[0]
-        
-        edited_duration = final_video.duration
-        
-        # 6. Write output
-        print(f"   Writing output video ({edited_duration:.1f}s)...")
-        sys.stdout.flush()
-        
-        final_video.write_videofile(
-    output_path,
-    codec='libx264',
-    audio_codec='aac'
-)
-        # 7. Cleanup
-        print("   Cleaning up...")
-        sys.stdout.flush()
-        
-        final_video.close()
-        video.close()
-        for clip in video_clips:
-            try:
-                clip.close()
-            except:
-                pass
+            edited_duration = probe_media(output_path)["duration"] or total_kept
         
         # Create summary
-        reduction = (1 - edited_duration / original_duration) * 100
+        # The probe can report 0 (unknown duration), so no percentage then
+        if original_duration > 0:
+            reduction = f"{(1 - edited_duration / original_duration) * 100:.1f}% shorter"
+        else:
+            reduction = "n/a"
         summary_text = f"""Smart Edit Complete!
 
 Original Duration: {original_duration:.1f} seconds
 Edited Duration: {edited_duration:.1f} seconds
-Reduction: {reduction:.1f}% shorter
+Reduction: {reduction}
 
 The video has been intelligently edited to remove pauses, filler words, and less important content while preserving the speaker's original voice and maintaining natural pacing.
 
@@ -1,5 +1,139 @@
-from transformers import pipeline
-summarizer=pipeline('summarization',model='facebook/bart-large-cnn')
+"""
+Shared summarization service.
+The summarization pipeline (SUMMARIZER_MODEL: BART by default, or e.g.
+distilbart or a local model path) is loaded lazily on first use (or warmed at
+worker boot) and reused by every caller: the model server when one is
+running, otherwise one in-process copy whose calls are serialized with a lock.
+"""
+import os
+import re
+import threading
+
+# Short names for known models; any other value is a Hugging Face id or a local model path
+SUMMARIZER_MODELS = {
+ "bart-large-cnn": "facebook/bart-large-cnn",
+ "distilbart-cnn-12-6": "sshleifer/distilbart-cnn-12-6",
+ "distilbart-cnn-6-6": "sshleifer/distilbart-cnn-6-6",
+}
+SUMMARIZER_MODEL = os.getenv("SUMMARIZER_MODEL", "facebook/bart-large-cnn")
+SUMMARIZER_MODEL = SUMMARIZER_MODELS.get(SUMMARIZER_MODEL, SUMMARIZER_MODEL)
+# "int8" = dynamic int8 quantization of the Linear layers (CPU), see model_registry
+SUMMARIZER_DTYPE = os.getenv("SUMMARIZER_DTYPE", "float32")
+# Load the model in the background when a web worker starts
+SUMMARIZER_WARMUP = os.getenv("SUMMARIZER_WARMUP", "").lower() in ("1", "true", "yes", "on")
+
+# Chunks fed to the model per forward pass
+SUMMARIZER_BATCH_SIZE = max(1, int(os.getenv("SUMMARIZER_BATCH_SIZE", "4")))
+
+_lock = threading.Lock()
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+# Room for differences between per-sentence and joined tokenization
+_TOKEN_MARGIN = 8
+# Sentence boundaries (. ! ? and the danda), shared with map_reduce
+SENTENCE_END = re.compile(r'(?<=[.!?\u0964])\s+')
+
+
+def _get_local_summarizer():
+ from .model_registry import TRANSFORMERS_SUMMARIZATION, get_model
+ return get_model(TRANSFORMERS_SUMMARIZATION, SUMMARIZER_MODEL, SUMMARIZER_DTYPE)
+
+def get_summarizer():
+ """Shared summarization pipeline: the model server if one is running, else loaded in-process on first use."""
+ from .model_server import remote_pipeline
+ return remote_pipeline("summarize") or _get_local_summarizer()
+
+def summarize(texts, **kwargs):
+ """
+ Run the shared summarizer on a text (or list of texts) with pipeline kwargs.
+ Returns what the pipeline returns: a list of {"summary_text": str}.
+ """
+ from .model_server import remote_pipeline
+ remote = remote_pipeline("summarize")
+ if remote is not None:
+  return remote(texts, **kwargs)
+ # transformers pipelines are not safe to call from several threads at once
+ with _lock:
+  return _get_local_summarizer()(texts, **kwargs)
+
+def warm_up(background=True):
+ """Load the summarizer now (in a daemon thread by default) so the first request does not pay for it."""
+ from .model_server import remote_pipeline
+ if remote_pipeline("summarize") is not None:
+  return None
+ if not background:
+  _get_local_summarizer()
+  return None
+ thread = threading.Thread(target=_get_local_summarizer, name="summarizer-warmup", daemon=True)
+ thread.start()
+ return thread
+
+def get_tokenizer():
+ """The summarizer's tokenizer (loaded locally even when the model runs on the model server)."""
+ global _tokenizer
+ with _tokenizer_lock:
+  if _tokenizer is None:
+   from transformers import AutoTokenizer
+   _tokenizer = AutoTokenizer.from_pretrained(SUMMARIZER_MODEL)
+  return _tokenizer
+
+def _token_budget(tokenizer):
+ limit = min(tokenizer.model_max_length, 1024)
+ return limit - tokenizer.num_special_tokens_to_add() - _TOKEN_MARGIN
+
+def pack_chunks(text, max_tokens=None):
+ """
+ Split text into chunks that fit the model's input: whole sentences are
+ packed greedily up to the token budget; a sentence longer than the budget
+ is cut into token windows. Nothing is dropped.
+ """
+ tokenizer = get_tokenizer()
+ budget = max_tokens or _token_budget(tokenizer)
+ sentences = [x for x in SENTENCE_END.split(text.strip()) if x.strip()]
+ if not sentences:
+  return []
+ # Leading space so counts match the sentence's tokens inside a joined chunk
+ counts = [len(ids) for ids in tokenizer([" " + x for x in sentences], add_special_tokens=False)["input_ids"]]
+
+ pieces = []
+ for sentence, count in zip(sentences, counts):
+  if count <= budget:
+   pieces.append((sentence, count))
+   continue
+  ids = tokenizer(" " + sentence, add_special_tokens=False)["input_ids"]
+  for i in range(0, len(ids), budget):
+   window = ids[i:i + budget]
+   pieces.append((tokenizer.decode(window).strip(), len(window)))
+
+ chunks = []
+ current, used = [], 0
+ for piece, count in pieces:
+  if current and used + count > budget:
+   chunks.append(" ".join(current))
+   current, used = [], 0
+  current.append(piece)
+  used += count
+ if current:
+  chunks.append(" ".join(current))
+ return chunks
+
+def summarize_packed(chunks, batch_size=None, min_chunk_chars=50, **kwargs):
+ """
+ Summarize pack_chunks output, batch_size chunks per forward pass, in one
+ call. Chunks of min_chunk_chars or less (at most the tail) are too short to
+ summarize and are kept as they are. Returns one summary per chunk, in order.
+ """
+ to_model = [c for c in chunks if len(c.strip()) > min_chunk_chars]
+ summaries = {}
+ if to_model:
+  kwargs.setdefault("truncation", True)  # guard only: chunks already fit the budget
+  results = summarize(to_model, batch_size=batch_size or SUMMARIZER_BATCH_SIZE, **kwargs)
+  summaries = dict(zip(to_model, (r['summary_text'] for r in results)))
+ return [summaries.get(c, c.strip()) for c in chunks]
+
+def summarize_chunks(text, batch_size=None, min_chunk_chars=50, **kwargs):
+ """Summarize every token-budget chunk of text in one batched call (see summarize_packed)."""
+ return summarize_packed(pack_chunks(text), batch_size=batch_size, min_chunk_chars=min_chunk_chars, **kwargs)
 
 def summarize_text(text):
- return summarizer(text[:3000])[0]['summary_text']
\ No newline at end of file
+ return " ".join(summarize_chunks(text))
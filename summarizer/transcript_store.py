@@ -0,0 +1,151 @@
+"""
+Persistent transcript cache.
+Transcripts are stored in a local SQLite database keyed by a fingerprint of the
+decoded 16 kHz audio (or another stable source id, e.g. a YouTube video id),
+the model and the language, so re-processing the same audio from any pipeline
+(captions, narrated summary, smart edit, YouTube) skips transcription.
+Entries expire after TRANSCRIPT_CACHE_TTL_DAYS and the least recently used are
+evicted once the stored data exceeds TRANSCRIPT_CACHE_MAX_MB.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE", "1").lower() in ("1", "true", "yes", "on")
+# Flask's instance folder, outside UPLOAD_FOLDER so /uploads/<path> never serves it
+TRANSCRIPT_CACHE_DB = os.getenv(
+    "TRANSCRIPT_CACHE_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instance", "transcript_cache.sqlite3"),
+)
+TRANSCRIPT_CACHE_TTL_DAYS = float(os.getenv("TRANSCRIPT_CACHE_TTL_DAYS", "30"))
+TRANSCRIPT_CACHE_MAX_MB = float(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "256"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    key        TEXT PRIMARY KEY,
+    source     TEXT NOT NULL,
+    model      TEXT NOT NULL,
+    language   TEXT NOT NULL,
+    result     TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    created    REAL NOT NULL,
+    last_used  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transcripts_last_used ON transcripts (last_used);
+"""
+
+_BLOCK_SAMPLES = 1 << 20
+_local = threading.local()
+
+
+def audio_fingerprint(array):
+    """
+    SHA-256 of 16 kHz float32 audio, hashed as s16le PCM so it matches
+    PcmFingerprint over the same ffmpeg output. Hashed in blocks to bound memory.
+    """
+    import numpy as np
+
+    sha = hashlib.sha256()
+    for i in range(0, len(array), _BLOCK_SAMPLES):
+        block = np.asarray(array[i:i + _BLOCK_SAMPLES], dtype=np.float32)
+        sha.update(np.clip(np.rint(block * 32768.0), -32768, 32767).astype("<i2").tobytes())
+    return sha.hexdigest()
+
+
+class PcmFingerprint:
+    """Incremental audio_fingerprint over s16le int16 chunks."""
+
+    def __init__(self):
+        self._sha = hashlib.sha256()
+
+    def update(self, samples):
+        self._sha.update(samples.astype("<i2", copy=False).tobytes())
+
+    def hexdigest(self):
+        return self._sha.hexdigest()
+
+
+def _key(source, model, language):
+    return hashlib.sha256(("%s\0%s\0%s" % (source, model, language)).encode("utf-8")).hexdigest()
+
+
+def _connect():
+    """One connection per thread (and per process: reconnect after fork)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "pid", None) == os.getpid():
+        return conn
+    directory = os.path.dirname(os.path.abspath(TRANSCRIPT_CACHE_DB))
+    os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(TRANSCRIPT_CACHE_DB, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    _local.conn = conn
+    _local.pid = os.getpid()
+    return conn
+
+
+def get(source, model, language="auto"):
+    """Return the cached transcript dict for (source, model, language), or None."""
+    if not TRANSCRIPT_CACHE_ENABLED or not source:
+        return None
+    key = _key(source, model, language)
+    now = time.time()
+    try:
+        conn = _connect()
+        row = conn.execute("SELECT result, created FROM transcripts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if now - row[1] > TRANSCRIPT_CACHE_TTL_DAYS * 86400:
+            with conn:
+                conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+            return None
+        with conn:
+            conn.execute("UPDATE transcripts SET last_used = ? WHERE key = ?", (now, key))
+        result = json.loads(row[0])
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"[TRANSCRIPTS] Cache read failed: {e}")
+        sys.stdout.flush()
+        return None
+    print(f"[TRANSCRIPTS] Cache hit ({model}, {language})")
+    sys.stdout.flush()
+    return result
+
+
+def put(source, model, language, result):
+    """Store a JSON-serializable transcript dict. Best effort: errors are logged."""
+    if not TRANSCRIPT_CACHE_ENABLED or not source:
+        return
+    now = time.time()
+    try:
+        blob = json.dumps(result)
+        conn = _connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO transcripts "
+                "(key, source, model, language, result, size, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (_key(source, model, language), source, model, language, blob, len(blob), now, now),
+            )
+        _evict(conn, now)
+    except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+        print(f"[TRANSCRIPTS] Could not store transcript: {e}")
+        sys.stdout.flush()
+
+
+def _evict(conn, now):
+    """Drop expired entries, then least recently used ones until under the size limit."""
+    max_bytes = int(TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024)
+    with conn:
+        conn.execute("DELETE FROM transcripts WHERE created < ?", (now - TRANSCRIPT_CACHE_TTL_DAYS * 86400,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+        if total <= max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM transcripts ORDER BY last_used").fetchall():
+            if total <= max_bytes:
+                break
+            conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+            total -= size
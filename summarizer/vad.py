@@ -0,0 +1,159 @@
+"""
+Energy-based voice activity detection on 16 kHz PCM.
+Frames the signal, computes RMS energy and zero-crossing rate with NumPy,
+applies hysteresis thresholds relative to the estimated noise floor and
+returns speech regions in seconds. Used to send only speech to Whisper (and
+to map the resulting timestamps back to the original timeline) and to trim
+silence from smart edits.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+FRAME_SECONDS = 0.03
+
+# Thresholds in dB above the noise floor (10th percentile of frame energy)
+_ENTER_DB = 12.0
+_STAY_DB = 6.0
+# Unvoiced consonants are quiet but noisy: high ZCR keeps them inside a region
+_FRICATIVE_DB = 3.0
+_FRICATIVE_ZCR = 0.25
+# Absolute floor so near-digital-silence is never treated as speech
+_MIN_ENTER_DBFS = -50.0
+
+
+def _frame_features(array: np.ndarray, sampling_rate: int):
+    hop = max(1, int(sampling_rate * FRAME_SECONDS))
+    n = len(array) // hop
+    frames = array[:n * hop].reshape(n, hop).astype(np.float32)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1) + 1e-12)
+    db = 20.0 * np.log10(rms + 1e-9)
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    return db, zcr, hop
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """[start, end) index pairs of the True runs in a boolean array."""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+
+def detect_speech(array: np.ndarray, sampling_rate: int = 16000, min_speech: float = 0.25,
+                  min_silence: float = 0.5, pad: float = 0.2) -> List[Tuple[float, float]]:
+    """
+    Return speech regions as sorted, non-overlapping (start, end) seconds.
+
+    Hysteresis: a region starts on frames at least 12 dB above the noise floor
+    and extends over neighbouring frames above 6 dB (or quiet, high-ZCR
+    frames). Regions shorter than min_speech are dropped, gaps shorter than
+    min_silence are bridged and each region is padded by `pad` seconds.
+    """
+    if array is None or len(array) == 0:
+        return []
+    db, zcr, hop = _frame_features(array, sampling_rate)
+    if len(db) == 0:
+        return []
+
+    floor = float(np.percentile(db, 10))
+    enter = db >= max(floor + _ENTER_DB, _MIN_ENTER_DBFS)
+    stay = (db >= floor + _STAY_DB) | ((db >= floor + _FRICATIVE_DB) & (zcr >= _FRICATIVE_ZCR))
+    stay |= enter
+
+    # Keep the "stay" runs that contain at least one "enter" frame
+    enter_count = np.concatenate(([0], np.cumsum(enter)))
+    frame_s = hop / float(sampling_rate)
+    regions = []
+    for start, end in _runs(stay):
+        if enter_count[end] - enter_count[start] == 0:
+            continue
+        s, e = start * frame_s, end * frame_s
+        if regions and s - regions[-1][1] < min_silence:
+            regions[-1] = (regions[-1][0], e)
+        else:
+            regions.append((s, e))
+
+    duration = len(array) / float(sampling_rate)
+    padded = []
+    for s, e in regions:
+        if e - s < min_speech:
+            continue
+        s, e = max(0.0, s - pad), min(duration, e + pad)
+        if padded and s <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], e)
+        else:
+            padded.append((s, e))
+    return padded
+
+
+def quietest_point(array: np.ndarray, sampling_rate: int, lo: int, hi: int) -> int:
+    """Sample index of the quietest 30 ms frame in array[lo:hi] (hi if the range is empty)."""
+    lo = max(0, lo)
+    if hi - lo < 2 * int(sampling_rate * FRAME_SECONDS):
+        return hi
+    db, _zcr, hop = _frame_features(array[lo:hi], sampling_rate)
+    return lo + int(np.argmin(db)) * hop + hop // 2
+
+
+def speech_coverage(regions: List[Tuple[float, float]], duration: float) -> float:
+    """Fraction of `duration` covered by regions."""
+    if duration <= 0:
+        return 0.0
+    return min(1.0, sum(e - s for s, e in regions) / duration)
+
+
+def compact_audio(array: np.ndarray, sampling_rate: int, regions: List[Tuple[float, float]]):
+    """
+    Concatenate only the speech regions.
+    Returns (compacted array, offsets) where offsets is a list of
+    (compact_start, original_start, length) in seconds, for remap_time.
+    """
+    pieces = []
+    offsets = []
+    position = 0.0
+    for s, e in regions:
+        a, b = int(round(s * sampling_rate)), int(round(e * sampling_rate))
+        piece = array[a:b]
+        if len(piece) == 0:
+            continue
+        length = len(piece) / float(sampling_rate)
+        pieces.append(piece)
+        offsets.append((position, s, length))
+        position += length
+    if not pieces:
+        return array[:0], []
+    return np.concatenate(pieces), offsets
+
+
+def remap_time(t, offsets):
+    """Map a time on the compacted timeline back to the original timeline."""
+    if t is None or not offsets:
+        return t
+    lo, hi = 0, len(offsets) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if offsets[mid][0] <= t:
+            lo = mid
+        else:
+            hi = mid - 1
+    compact_start, original_start, length = offsets[lo]
+    return original_start + min(max(t - compact_start, 0.0), length)
+
+
+def intersect_regions(clips: List[Tuple[float, float]], regions: List[Tuple[float, float]],
+                      min_length: float = 0.5) -> List[Tuple[float, float]]:
+    """Clip (start, end) ranges to the parts that overlap speech regions."""
+    result = []
+    j = 0
+    regions = sorted(regions)
+    for start, end in sorted(clips):
+        while j < len(regions) and regions[j][1] <= start:
+            j += 1
+        k = j
+        while k < len(regions) and regions[k][0] < end:
+            s, e = max(start, regions[k][0]), min(end, regions[k][1])
+            if e - s >= min_length:
+                result.append((s, e))
+            k += 1
+    return result
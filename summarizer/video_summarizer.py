@@ -1,6 +1,7 @@
 import os
 import shutil
 import subprocess
+import sys
 import tempfile
 
 import cv2
@@ -111,9 +112,572 @@ def _reencode_h264_for_web(path):
             pass
 
 
-def summarize_video(input_path, output_path):
-    """Summarize video by extracting key frames. Returns summary text or raises exception."""
-    
+_libx264_available = None
+
+
+def _has_libx264():
+    """True if the resolved ffmpeg can encode libx264 (checked once per process)."""
+    global _libx264_available
+    if _libx264_available is None:
+        try:
+            r = subprocess.run(
+                [_get_ffmpeg_cmd(), "-hide_banner", "-encoders"],
+                capture_output=True, text=True, timeout=30,
+            )
+            _libx264_available = r.returncode == 0 and "libx264" in (r.stdout or "")
+        except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+            _libx264_available = False
+    return _libx264_available
+
+
+class _H264PipeWriter:
+    """
+    cv2.VideoWriter-like sink that pipes raw BGR frames into one ffmpeg libx264
+    process, producing a browser-ready (+faststart) MP4 in a single encode.
+    """
+
+    def __init__(self, output_path, fps, width, height):
+        self.output_path = output_path
+        self._stderr = tempfile.TemporaryFile()
+        self._error = None
+        self._proc = subprocess.Popen(
+            [
+                _get_ffmpeg_cmd(), "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "bgr24",
+                "-s", f"{width}x{height}", "-r", str(fps),
+                "-i", "-",
+                "-an",
+                # yuv420p needs even dimensions
+                "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                "-c:v", "libx264", "-pix_fmt", "yuv420p",
+                "-movflags", "+faststart",
+                output_path,
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=self._stderr,
+        )
+
+    def isOpened(self):
+        return self._proc.poll() is None and self._error is None
+
+    def write(self, frame):
+        if self._error is not None:
+            return
+        try:
+            self._proc.stdin.write(frame.tobytes())
+        except (BrokenPipeError, OSError) as e:
+            self._error = str(e)
+
+    def release(self, timeout=300):
+        """Finish encoding. Returns None on success, else an error message."""
+        try:
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            code = self._proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+            code = -1
+        self._stderr.seek(0)
+        detail = self._stderr.read().decode("utf-8", "replace").strip()[:400]
+        self._stderr.close()
+        if code != 0:
+            return detail or self._error or f"ffmpeg exited {code}"
+        return None
+
+
+def _open_summary_writer(output_path, fps, width, height):
+    """
+    Open the keyframe sink. Prefers a single-pass ffmpeg libx264 pipe; falls back to
+    cv2 mp4v (which then needs _reencode_h264_for_web). Returns (writer, piped).
+    """
+    if _has_libx264():
+        try:
+            return _H264PipeWriter(output_path, fps, width, height), True
+        except (FileNotFoundError, OSError) as e:
+            print(f"[WARNING] ffmpeg pipe unavailable ({e}), using OpenCV writer")
+    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    return cv2.VideoWriter(output_path, fourcc, fps, (width, height)), False
+
+
+SAMPLING_MODES = ("grab", "seek", "read")
+# A seek decodes forward from the previous keyframe, so nearby targets are
+# cheaper to reach by grabbing the frames in between
+_SEEK_MIN_GAP = 128
+DEFAULT_INTERVAL = 30
+
+
+def _iter_keyframes(cap, total_frames, interval=DEFAULT_INTERVAL, sampling="grab", max_read_errors=10,
+                    indices=None, start=0, stop=None):
+    """
+    Yield (frame_index, frame) for every `interval`-th frame of an open capture,
+    or for the sorted frame numbers in `indices` when given.
+    start/stop limit the scan to frames [start, stop); a non-zero start seeks first.
+
+    sampling:
+        "grab" - grab() every frame but retrieve() (convert + copy) only kept ones
+        "seek" - jump straight to each kept frame via CAP_PROP_POS_FRAMES (frames
+                 less than _SEEK_MIN_GAP ahead are grabbed to instead); fastest
+                 for large intervals, frame accuracy depends on the container
+        "read" - legacy path: fully decode every frame with read()
+    """
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode: {sampling}")
+    interval = max(1, int(interval))
+    wanted = set(indices) if indices is not None else None
+    last_wanted = max(wanted) if wanted else -1
+
+    end = total_frames if stop is None else min(stop, total_frames)
+    if sampling == "seek":
+        if wanted is not None:
+            targets = [i for i in sorted(wanted) if start <= i < end]
+        else:
+            targets = range(-(-start // interval) * interval, end, interval)
+        position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        for index in targets:
+            if index - position >= _SEEK_MIN_GAP or index < position:
+                if index and not cap.set(cv2.CAP_PROP_POS_FRAMES, index):
+                    break
+            else:
+                while position < index and cap.grab():
+                    position += 1
+            ret, frame = cap.read()
+            position = index + 1
+            if not ret:
+                print(f"[WARNING] Seek to frame {index} failed, stopping")
+                break
+            yield index, frame
+        return
+
+    if start and not cap.set(cv2.CAP_PROP_POS_FRAMES, start):
+        print(f"[WARNING] Seek to frame {start} failed")
+        return
+    frame_count = start
+    read_errors = 0
+    while cap.isOpened():
+        if stop is not None and frame_count >= stop:
+            break
+        if wanted is not None:
+            if frame_count > last_wanted:
+                break
+            keep = frame_count in wanted
+        else:
+            keep = frame_count % interval == 0
+        if keep or sampling == "read":
+            ret, frame = cap.read()
+        else:
+            ret, frame = cap.grab(), None
+        if not ret:
+            read_errors += 1
+            if read_errors > max_read_errors:
+                print(f"[WARNING] Too many read errors ({read_errors}), stopping at frame {frame_count}")
+                break
+            if frame_count >= total_frames:
+                # Natural end of video
+                break
+            continue
+
+        if keep:
+            yield frame_count, frame
+
+        frame_count += 1
+
+
+SELECTION_MODES = ("fixed", "scene")
+
+# Scene analysis works on tiny grayscale proxies of every frame
+_PROXY_SIZE = (64, 36)
+_SCENE_BATCH = 512
+
+
+def _iter_proxy_batches(input_path, cap, total_frames, batch=_SCENE_BATCH):
+    """
+    Yield uint8 arrays of shape (n, h, w) holding low-resolution grayscale proxies
+    of consecutive frames. ffmpeg scales while decoding and pipes only the proxies;
+    without ffmpeg, OpenCV frames are downscaled as they are read. If ffmpeg fails
+    partway, OpenCV resumes at the first frame ffmpeg did not deliver, so batch
+    rows always line up with frame indices.
+    """
+    import numpy as np
+
+    w, h = _PROXY_SIZE
+    frame_bytes = w * h
+    try:
+        proc = subprocess.Popen(
+            [
+                _get_ffmpeg_cmd(), "-loglevel", "error", "-i", input_path,
+                "-an", "-sn", "-vsync", "0",
+                "-vf", f"scale={w}:{h}:flags=fast_bilinear,format=gray",
+                "-f", "rawvideo", "-pix_fmt", "gray", "-",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except (FileNotFoundError, OSError):
+        proc = None
+
+    delivered = 0
+    if proc is not None:
+        try:
+            while True:
+                buf = proc.stdout.read(frame_bytes * batch)
+                n = len(buf) // frame_bytes
+                if n == 0:
+                    break
+                delivered += n
+                yield np.frombuffer(buf[:n * frame_bytes], dtype=np.uint8).reshape(n, h, w)
+        finally:
+            proc.stdout.close()
+            proc.wait()
+        if proc.returncode == 0:
+            return
+        print(f"[WARNING] ffmpeg proxy decode failed after {delivered} frames, continuing with OpenCV")
+
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    frames = []
+    for _index, frame in _iter_keyframes(cap, total_frames, interval=1, start=delivered):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        frames.append(cv2.resize(gray, _PROXY_SIZE, interpolation=cv2.INTER_AREA))
+        if len(frames) == batch:
+            yield np.stack(frames)
+            frames = []
+    if frames:
+        yield np.stack(frames)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+
+def _scene_scores(batches, bins=32):
+    """
+    Per-frame change score in [0, 2]: histogram distance plus mean absolute pixel
+    difference to the previous frame, computed with NumPy one batch at a time.
+    Returns a float32 array (score of frame 0 is 0).
+    """
+    import numpy as np
+
+    shift = 8 - int(np.log2(bins))
+    scores = []
+    prev_frame = None
+    prev_hist = None
+    for proxies in batches:
+        n = len(proxies)
+        flat = proxies.reshape(n, -1)
+        # One bincount for the whole batch: offset each frame's bins by frame * bins
+        codes = (flat >> shift).astype(np.int64) + (np.arange(n, dtype=np.int64) * bins)[:, None]
+        hist = np.bincount(codes.ravel(), minlength=n * bins).reshape(n, bins)
+        hist = hist.astype(np.float32) / flat.shape[1]
+        frames = flat.astype(np.int16)
+
+        if prev_frame is None:
+            prev_frame, prev_hist = frames[:1], hist[:1]
+        ref_frames = np.concatenate([prev_frame, frames[:-1]])
+        ref_hist = np.concatenate([prev_hist, hist[:-1]])
+
+        hist_diff = 0.5 * np.abs(hist - ref_hist).sum(axis=1)
+        pixel_diff = np.abs(frames - ref_frames).mean(axis=1) / 255.0
+        scores.append((hist_diff + pixel_diff).astype(np.float32))
+        prev_frame, prev_hist = frames[-1:], hist[-1:]
+
+    if not scores:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(scores)
+
+
+def _select_scene_keyframes(scores, budget, fps, max_gap_seconds=10.0):
+    """
+    Pick up to `budget` frame indices from change scores: frame 0, then shot
+    boundaries (scores far above the video's norm), then high-motion peaks, and
+    finally evenly spaced frames so no gap exceeds max_gap_seconds.
+    Returns (sorted indices, number of shot boundaries, number of motion peaks).
+    """
+    import numpy as np
+
+    n = len(scores)
+    if n == 0 or budget <= 0:
+        return [], 0, 0
+    budget = min(int(budget), n)
+
+    # Local maxima, at most one per half second
+    radius = max(1, int(fps // 4))
+    padded = np.pad(scores, radius, mode="constant", constant_values=-1.0)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1)
+    peaks = np.flatnonzero((scores >= windows.max(axis=1)) & (scores > 0))
+    peaks = peaks[np.argsort(-scores[peaks], kind="stable")]
+
+    # A shot boundary is a spike over the calm on at least one side of it
+    # (a cut into or out of a moving shot is still a cut)
+    span = max(1, int(fps))
+    csum = np.concatenate([[0.0], np.cumsum(scores, dtype=np.float64)])
+    idx = np.arange(n)
+    before = (csum[idx] - csum[np.maximum(idx - span, 0)]) / np.maximum(idx - np.maximum(idx - span, 0), 1)
+    after_end = np.minimum(idx + 1 + span, n)
+    after = (csum[after_end] - csum[idx + 1]) / np.maximum(after_end - idx - 1, 1)
+    calm = np.minimum(before, after)
+    floor = max(5.0 * float(np.median(scores)), 0.05)
+    is_boundary = (scores >= 4.0 * calm) & (scores >= floor)
+
+    boundaries = [int(i) for i in peaks if is_boundary[i]]
+    motion = [int(i) for i in peaks if not is_boundary[i] and scores[i] > 2.0 * scores.mean()]
+
+    selected = {0}
+    n_boundaries = n_motion = 0
+    for i in boundaries:
+        if len(selected) >= budget:
+            break
+        if i not in selected:
+            selected.add(i)
+            n_boundaries += 1
+    for i in motion:
+        if len(selected) >= budget:
+            break
+        if i not in selected:
+            selected.add(i)
+            n_motion += 1
+
+    # Cover long static stretches so the summary still spans the whole video
+    max_gap = max(1, int(max_gap_seconds * fps))
+    while len(selected) < budget:
+        ordered = sorted(selected) + [n]
+        gaps = np.diff(ordered)
+        widest = int(np.argmax(gaps))
+        if gaps[widest] <= max_gap:
+            break
+        selected.add(ordered[widest] + int(gaps[widest]) // 2)
+
+    return sorted(selected), n_boundaries, n_motion
+
+
+# Popcount of every byte value, for Hamming distances between packed hashes
+_POPCOUNT8 = None
+
+
+def _dhash(frame):
+    """64-bit difference hash of a BGR frame (9x8 grayscale, left > right per pixel)."""
+    import numpy as np
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return np.packbits(bits.ravel()).view(">u8")[0].astype(np.uint64)
+
+
+def _hamming_distance(a, b):
+    """Bitwise Hamming distance between uint64 hashes (scalars or arrays)."""
+    import numpy as np
+
+    global _POPCOUNT8
+    if _POPCOUNT8 is None:
+        _POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    x = np.bitwise_xor(np.asarray(a, dtype=np.uint64), np.asarray(b, dtype=np.uint64))
+    bytes_view = np.ascontiguousarray(x).reshape(-1).view(np.uint8).reshape(-1, 8)
+    return _POPCOUNT8[bytes_view].sum(axis=1, dtype=np.int64).reshape(np.shape(x))
+
+
+class _KeyframeDeduper:
+    """
+    Drops candidate keyframes whose dHash is within max_distance of the last kept
+    one, but keeps at least one every max_gap frames so static footage still
+    yields a playable summary.
+    """
+
+    def __init__(self, max_distance, expected=64, max_gap=None):
+        import numpy as np
+
+        self.max_distance = int(max_distance)
+        self.max_gap = max(1, int(max_gap)) if max_gap else None
+        self.hashes = np.zeros(max(1, expected), dtype=np.uint64)
+        self.last_index = None
+        self.kept = 0
+        self.collapsed = 0
+
+    def keep(self, frame, index):
+        return self.keep_hash(_dhash(frame), index)
+
+    def keep_hash(self, h, index):
+        import numpy as np
+
+        if (self.kept and _hamming_distance(h, self.hashes[self.kept - 1]) <= self.max_distance
+                and (self.max_gap is None or index - self.last_index < self.max_gap)):
+            self.collapsed += 1
+            return False
+        if self.kept == len(self.hashes):
+            self.hashes = np.concatenate([self.hashes, np.zeros_like(self.hashes)])
+        self.hashes[self.kept] = h
+        self.last_index = index
+        self.kept += 1
+        return True
+
+
+def _summarize_range(task):
+    """
+    Worker process: encode the keyframes of one frame range to its own H.264 part.
+    When task["seed"] is set, that frame (the previous range's last candidate) is
+    only hashed so deduplication continues across the range boundary. With dedup
+    on, every candidate's (index, hash) is returned so the caller can check the
+    kept frames against a sequential pass.
+    """
+    cap = cv2.VideoCapture(task["input_path"])
+    out = _H264PipeWriter(task["part_path"], task["fps"], task["width"], task["height"])
+    deduper = None
+    if task["dedup_distance"] is not None:
+        deduper = _KeyframeDeduper(task["dedup_distance"], max_gap=task["dedup_max_gap"])
+
+    seed = task["seed"]
+    saved = 0
+    candidates, kept = [], []
+    for index, frame in _iter_keyframes(
+        cap, task["total_frames"], task["interval"], task["sampling"],
+        indices=task["indices"], start=task["start"], stop=task["stop"],
+    ):
+        if index == seed:
+            if deduper is not None:
+                deduper.keep(frame, index)
+            continue
+        if deduper is not None:
+            h = _dhash(frame)
+            candidates.append((index, int(h)))
+            if not deduper.keep_hash(h, index):
+                continue
+        out.write(frame)
+        kept.append(index)
+        saved += 1
+
+    cap.release()
+    error = out.release()
+    if saved == 0:
+        error = None
+        try:
+            os.remove(task["part_path"])
+        except OSError:
+            pass
+    collapsed = deduper.collapsed if deduper is not None else 0
+    return {"part_path": task["part_path"], "saved": saved, "collapsed": collapsed, "error": error,
+            "candidates": candidates, "kept": kept}
+
+
+def _range_tasks(input_path, parts_dir, total_frames, fps, width, height, interval, sampling,
+                 indices, dedup_distance, dedup_max_gap, workers):
+    """Split the keyframe scan into contiguous frame ranges, one task per worker."""
+    base = {
+        "input_path": input_path, "total_frames": total_frames, "fps": fps,
+        "width": width, "height": height, "interval": interval,
+        "sampling": sampling, "dedup_distance": dedup_distance, "dedup_max_gap": dedup_max_gap,
+    }
+    tasks = []
+    if indices is not None:
+        per = -(-len(indices) // workers)
+        for k in range(0, len(indices), per):
+            chunk = list(indices[k:k + per])
+            seed = indices[k - 1] if k and dedup_distance is not None else None
+            tasks.append(dict(base, indices=([seed] if seed is not None else []) + chunk,
+                              start=seed if seed is not None else chunk[0], stop=None, seed=seed))
+    else:
+        keyframes = -(-total_frames // interval)
+        per = -(-keyframes // workers) * interval
+        for begin in range(0, total_frames, per):
+            seed = begin - interval if begin and dedup_distance is not None else None
+            last = begin + per >= total_frames
+            tasks.append(dict(base, indices=None, start=seed if seed is not None else begin,
+                              stop=None if last else begin + per, seed=seed))
+    for n, task in enumerate(tasks):
+        task["part_path"] = os.path.join(parts_dir, f"part{n:04d}.mp4")
+    return tasks
+
+
+def _summarize_parallel(input_path, output_path, total_frames, fps, width, height, interval,
+                        sampling, indices, dedup_distance, dedup_max_gap, workers):
+    """
+    Summarize frame ranges in worker processes and join the parts with ffmpeg's
+    concat demuxer (stream copy). The kept keyframes match the sequential path:
+    with dedup on, the candidates' hashes are replayed in order, and a range
+    whose first frames were decided against the wrong previous keyframe is
+    re-encoded with the frames the sequential pass keeps.
+    Returns (saved_frames, collapsed_frames).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    parts_dir = tempfile.mkdtemp(prefix="keyframe_parts_", dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        tasks = _range_tasks(input_path, parts_dir, total_frames, fps, width, height, interval,
+                             sampling, indices, dedup_distance, dedup_max_gap, workers)
+        print(f"[SUMMARY] Summarizing {len(tasks)} frame ranges in parallel...")
+        sys.stdout.flush()
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_summarize_range, tasks))
+
+            for r in results:
+                if r["error"]:
+                    raise ValueError(f"H.264 encoding failed: {r['error']}")
+
+            collapsed = 0
+            if dedup_distance is not None:
+                deduper = _KeyframeDeduper(dedup_distance, sum(len(r["candidates"]) for r in results),
+                                           dedup_max_gap)
+                redo = []
+                for n, r in enumerate(results):
+                    kept = [index for index, h in r["candidates"] if deduper.keep_hash(h, index)]
+                    if kept != r["kept"]:
+                        redo.append(n)
+                        tasks[n] = dict(tasks[n], indices=kept, start=kept[0] if kept else 0, stop=None,
+                                        seed=None, dedup_distance=None)
+                collapsed = deduper.collapsed
+                if redo:
+                    print(f"[SUMMARY] Re-encoding {len(redo)} frame ranges to match sequential dedup...")
+                    sys.stdout.flush()
+                    for n, r in zip(redo, pool.map(_summarize_range, [tasks[n] for n in redo])):
+                        if r["error"]:
+                            raise ValueError(f"H.264 encoding failed: {r['error']}")
+                        results[n] = r
+
+        parts = [r["part_path"] for r in results if r["saved"]]
+        if not parts:
+            raise ValueError(f"Failed to create valid output video: {output_path}")
+
+        list_path = os.path.join(parts_dir, "parts.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            for part in parts:
+                f.write("file '%s'\n" % os.path.abspath(part).replace("'", "'\\''"))
+        r = subprocess.run(
+            [
+                _get_ffmpeg_cmd(), "-y", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-c", "copy", "-movflags", "+faststart",
+                output_path,
+            ],
+            capture_output=True, text=True, timeout=300,
+        )
+        if r.returncode != 0:
+            raise ValueError("Joining summary parts failed: " + (r.stderr or "")[:400].strip())
+        return sum(r["saved"] for r in results), collapsed
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+
+def summarize_video(input_path, output_path, interval=DEFAULT_INTERVAL, sampling="grab",
+                    mode="fixed", target_keyframes=None, dedup_distance=None,
+                    dedup_max_gap_seconds=10.0, workers=1):
+    """
+    Summarize video by extracting key frames. Returns summary text or raises exception.
+
+    mode:
+        "fixed" - keep every `interval`-th frame
+        "scene" - keep up to `target_keyframes` frames (default: as many as "fixed"
+                  would) at shot boundaries and high-motion moments
+    `sampling` picks how the kept frames are read (see _iter_keyframes).
+    dedup_distance: when set, drop keyframes whose perceptual hash is within this
+    many bits (out of 64) of the previous kept keyframe, keeping at least one
+    keyframe every dedup_max_gap_seconds (None: no minimum).
+    workers: > 1 splits the video into that many frame ranges summarized in
+    parallel processes and joined without re-encoding (needs ffmpeg with libx264).
+    """
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode: {sampling}")
+    if mode not in SELECTION_MODES:
+        raise ValueError(f"Unknown keyframe selection mode: {mode}")
+    interval = max(1, int(interval))
+
     # Validate input file exists
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"Input video not found: {input_path}")
@@ -147,40 +711,65 @@ def summarize_video(input_path, output_path):
     # Calculate original duration
     original_duration = total_frames / fps if fps > 0 else 0
 
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-    
-    if not out.isOpened():
+    indices = None
+    technique = f"Key-frame extraction every {interval} frames to preserve important visual moments while reducing video length."
+    if mode == "scene":
+        budget = target_keyframes or max(1, total_frames // interval)
+        scores = _scene_scores(_iter_proxy_batches(input_path, cap, total_frames))
+        if len(scores):
+            indices, n_boundaries, n_motion = _select_scene_keyframes(scores, budget, fps)
+            # The proxy pass already decoded every frame; fetch only the selected ones
+            # instead of grab-decoding the whole file a second time
+            if sampling == "grab":
+                sampling = "seek"
+            technique = (
+                f"Scene-change keyframe selection: {n_boundaries} shot boundaries and {n_motion} "
+                f"high-motion moments detected on low-resolution proxies, so static stretches "
+                f"use fewer frames and fast cuts are not missed."
+            )
+        else:
+            print("[WARNING] Scene analysis produced no frames, using fixed interval")
+
+    workers = max(1, int(workers or 1))
+    if workers > 1 and not _has_libx264():
+        print("[WARNING] Parallel summary needs ffmpeg with libx264, running sequentially")
+        workers = 1
+
+    dedup_max_gap = int(round(dedup_max_gap_seconds * fps)) if dedup_max_gap_seconds else None
+    collapsed = None
+    if workers > 1:
         cap.release()
-        out.release()
-        raise ValueError(f"Cannot create output video: {output_path}")
+        piped = True
+        saved_frames, collapsed = _summarize_parallel(
+            input_path, output_path, total_frames, fps, width, height, interval,
+            sampling, indices, dedup_distance, dedup_max_gap, workers,
+        )
+    else:
+        out, piped = _open_summary_writer(output_path, fps, width, height)
 
-    frame_count = 0
-    saved_frames = 0
-    read_errors = 0
-    max_read_errors = 10  # Allow some errors but not too many
+        if not out.isOpened():
+            cap.release()
+            out.release()
+            raise ValueError(f"Cannot create output video: {output_path}")
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            read_errors += 1
-            if read_errors > max_read_errors:
-                print(f"[WARNING] Too many read errors ({read_errors}), stopping at frame {frame_count}")
-                break
-            if frame_count >= total_frames:
-                # Natural end of video
-                break
-            continue
+        deduper = None
+        if dedup_distance is not None:
+            expected = len(indices) if indices is not None else total_frames // interval + 1
+            deduper = _KeyframeDeduper(dedup_distance, expected, dedup_max_gap)
 
-        # every 30th frame = key frame
-        if frame_count % 30 == 0:
+        saved_frames = 0
+        for index, frame in _iter_keyframes(cap, total_frames, interval, sampling, indices=indices):
+            if deduper is not None and not deduper.keep(frame, index):
+                continue
             out.write(frame)
             saved_frames += 1
 
-        frame_count += 1
-
-    cap.release()
-    out.release()
+        cap.release()
+        encode_error = out.release()
+        if piped and encode_error:
+            raise ValueError(f"H.264 encoding failed: {encode_error}")
+        if deduper is not None:
+            collapsed = deduper.collapsed
     
     # Validate output was created
     if not os.path.exists(output_path) or os.path.getsize(output_path) < 1024:
@@ -191,7 +780,8 @@ def summarize_video(input_path, output_path):
     reduction_percentage = ((original_duration - summarized_duration) / original_duration * 100) if original_duration > 0 else 0
 
     # Re-encode to H.264 so the file plays in browsers (mp4v often fails in Chrome/Edge/Firefox)
-    _reencode_h264_for_web(output_path)
+    if not piped:
+        _reencode_h264_for_web(output_path)
 
     # Format durations
     def format_duration(seconds):
@@ -202,15 +792,19 @@ def summarize_video(input_path, output_path):
         return f"{secs}s"
 
     # 🔥 PROFESSIONAL CAPTION-STYLE SUMMARY
+    dedup_line = ""
+    if dedup_distance is not None:
+        dedup_line = f"\n• Near-duplicates Removed: {collapsed} keyframes collapsed (perceptual hash)"
+
     summary_text = f"""
 📌 Video Summary Statistics:
 
 • Original Duration: {format_duration(original_duration)} ({total_frames} frames)
 • Summary Duration: {format_duration(summarized_duration)} ({saved_frames} keyframes)
-• Reduction: {reduction_percentage:.1f}% shorter
+• Reduction: {reduction_percentage:.1f}% shorter{dedup_line}
 
 🧠 Technique Used:
-Key-frame extraction every 30 frames to preserve important visual moments while reducing video length.
+{technique}
 
 ✓ The summarized video maintains visual continuity while being significantly shorter.
 """
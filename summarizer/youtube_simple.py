@@ -158,6 +158,86 @@ def validate_telugu_speech(text, min_total_chars=40, min_telugu_chars=20):
     }
 
 
+# Language / speech-presence probe run before the full transcription
+LANGUAGE_PROBE_WINDOWS = max(1, int(os.getenv("LANGUAGE_PROBE_WINDOWS", "3")))
+NO_SPEECH_THRESHOLD = 0.6
+
+
+def _whisper_model_id():
+    """Transcript cache model key for whisper_transcribe (model and dtype)."""
+    from .auto_caption import WHISPER_DTYPE
+    return 'openai-whisper/base/%s' % WHISPER_DTYPE
+
+
+def probe_language(model, audio, windows=LANGUAGE_PROBE_WINDOWS):
+    """Detect language and speech presence on a few sampled 30 s windows.
+    
+    WHY: Deciding the language (or rejecting a music-only video) up front means
+    the full audio is transcribed once, instead of once per language.
+    
+    Args:
+        model: openai-whisper model
+        audio: 16 kHz float32 array from whisper.load_audio
+        windows: Number of evenly spaced windows to sample
+    
+    Returns:
+        dict with 'language_probs' (averaged over windows), 'no_speech_probs'
+        (one per window) and 'speech_windows' (windows below NO_SPEECH_THRESHOLD)
+    """
+    import whisper
+    
+    n = whisper.audio.N_SAMPLES  # 30 s at 16 kHz
+    if len(audio) <= n:
+        starts = [0]
+    else:
+        span = len(audio) - n
+        count = min(windows, max(1, len(audio) // n))
+        starts = [int(span * (i + 0.5) / count) for i in range(count)]
+    
+    language_probs = {}
+    no_speech_probs = []
+    n_mels = getattr(model.dims, 'n_mels', 80)
+    for start in starts:
+        segment = whisper.pad_or_trim(audio[start:start + n])
+        mel = whisper.log_mel_spectrogram(segment, n_mels).to(model.device)
+        _, probs = model.detect_language(mel)
+        for lang, p in probs.items():
+            language_probs[lang] = language_probs.get(lang, 0.0) + p / len(starts)
+        # One decoding step is enough: no_speech_prob comes from the first logits
+        top = max(probs, key=probs.get)
+        options = whisper.DecodingOptions(language=top, without_timestamps=True, fp16=False, sample_len=1)
+        no_speech_probs.append(whisper.decode(model, mel, options).no_speech_prob)
+    
+    return {
+        'starts': starts,
+        'language_probs': language_probs,
+        'no_speech_probs': no_speech_probs,
+        'speech_windows': sum(1 for p in no_speech_probs if p < NO_SPEECH_THRESHOLD),
+    }
+
+
+def transcribe_probe_windows(model, audio, probe, language):
+    """Transcribe only the probe's speech windows (a few 30 s windows) in language.
+    
+    WHY: Checking that the speech really is Telugu on these windows decides the
+    language before the full pass, so the full audio is never transcribed twice.
+    
+    Returns: The windows' text joined with spaces
+    """
+    import whisper
+    
+    n = whisper.audio.N_SAMPLES
+    n_mels = getattr(model.dims, 'n_mels', 80)
+    options = whisper.DecodingOptions(language=language, without_timestamps=True, fp16=False)
+    texts = []
+    for start, no_speech_prob in zip(probe['starts'], probe['no_speech_probs']):
+        if no_speech_prob >= NO_SPEECH_THRESHOLD:
+            continue
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio[start:start + n]), n_mels).to(model.device)
+        texts.append(whisper.decode(model, mel, options).text.strip())
+    return ' '.join(t for t in texts if t)
+
+
 def whisper_transcribe(audio_path, language='english'):
     """Transcribe audio using Whisper with speech validation.
     
@@ -166,6 +246,8 @@ def whisper_transcribe(audio_path, language='english'):
     FIX 3: Add no_speech_threshold to detect music-only videos
     FIX 4: Validate Telugu speech to prevent hallucinations
     FIX 5: Clean output to remove junk unicode based on language
+    FIX 6: Probe language / speech on sampled windows first so the audio is
+           transcribed once (Telugu is confirmed on the probe windows, not by a full pass)
     
     Args:
         audio_path: Path to audio file
@@ -176,6 +258,8 @@ def whisper_transcribe(audio_path, language='english'):
     """
     try:
         import whisper
+        from .auto_caption import WHISPER_DTYPE
+        from .model_registry import OPENAI_WHISPER, get_model
         
         # Convert language names to Whisper codes
         lang_map = {
@@ -183,11 +267,70 @@ def whisper_transcribe(audio_path, language='english'):
             'english': 'en'
         }
         whisper_lang = lang_map.get(language.lower(), 'en')  # Default to English if unknown
+        requested_language = language.lower()
         lang_display = language.upper()
         
         print(f"[WHISPER] Loading Whisper model...")
         sys.stdout.flush()
-        model = whisper.load_model("base")  # You can use "small", "medium", "large" for better accuracy
+        # Shared across requests; "small", "medium", "large" give better accuracy
+        model = get_model(OPENAI_WHISPER, "base", WHISPER_DTYPE)
+        model_id = _whisper_model_id()
+        
+        # Decode once; the probe and the transcription share the array
+        audio = whisper.load_audio(audio_path)
+        
+        # Same audio, model and language transcribed before: reuse it
+        from . import transcript_store
+        fingerprint = transcript_store.audio_fingerprint(audio) if transcript_store.TRANSCRIPT_CACHE_ENABLED else None
+        cached = transcript_store.get(fingerprint, model_id, requested_language)
+        if cached is not None:
+            return cached
+        
+        # FIX 6: Probe sampled windows before the full transcription
+        probe = probe_language(model, audio)
+        top_lang = max(probe['language_probs'], key=probe['language_probs'].get)
+        print(f"[WHISPER] Probe: detected '{top_lang}' "
+              f"(te={probe['language_probs'].get('te', 0.0):.2f}, en={probe['language_probs'].get('en', 0.0):.2f}), "
+              f"speech in {probe['speech_windows']}/{len(probe['no_speech_probs'])} windows")
+        sys.stdout.flush()
+        
+        if probe['speech_windows'] == 0:
+            print("[WHISPER] ✗ No speech in any sampled window - music-only video")
+            sys.stdout.flush()
+            return {
+                'success': False,
+                'text': '',
+                'error': 'ఈ వీడియోలో స్పీచ్ గుర్తించబడలేదు. (Speech not detected)' if language.lower() == 'telugu' else 'No speech detected in this video.',
+                'is_music_only': True
+            }
+        
+        # Telugu selected but the probe hears another language: switch to English before transcribing
+        if language.lower() == 'telugu' and top_lang != 'te':
+            print(f"[WHISPER] 🔄 Audio is not Telugu - switching to ENGLISH transcription...")
+            sys.stdout.flush()
+            language = 'english'
+            whisper_lang = 'en'
+            lang_display = 'ENGLISH'
+        
+        # FIX 4 on the probe windows: confirm the speech is really Telugu before the full pass
+        if language.lower() == 'telugu':
+            validation = validate_telugu_speech(transcribe_probe_windows(model, audio, probe, 'te'))
+            if not validation['valid']:
+                print(f"[WHISPER] ⚠ Telugu check on probe windows failed: {validation['reason']}")
+                sys.stdout.flush()
+                english = clean_english_text(transcribe_probe_windows(model, audio, probe, 'en'))
+                if len(english.strip()) < 10:
+                    return {
+                        'success': False,
+                        'text': '',
+                        'error': validation['reason'],
+                        'is_music_only': False
+                    }
+                print(f"[WHISPER] 🔄 Probe windows are English speech - switching to ENGLISH transcription...")
+                sys.stdout.flush()
+                language = 'english'
+                whisper_lang = 'en'
+                lang_display = 'ENGLISH'
         
         print(f"[WHISPER] Transcribing audio in {lang_display} with speech detection...")
         sys.stdout.flush()
@@ -195,10 +338,10 @@ def whisper_transcribe(audio_path, language='english'):
         # FIX 1, 2, 3: Use selected language, disable FP16, enable speech detection
         # WHY no_speech_threshold: Detects music-only videos and prevents hallucinations
         result = model.transcribe(
-            audio_path,
+            audio,
             language=whisper_lang,    # FORCE selected language
             fp16=False,               # CPU compatibility
-            no_speech_threshold=0.6   # Detect music-only (higher = stricter)
+            no_speech_threshold=NO_SPEECH_THRESHOLD   # Detect music-only (higher = stricter)
         )
         
         # Get raw transcription
@@ -211,38 +354,17 @@ def whisper_transcribe(audio_path, language='english'):
         if language.lower() == 'telugu':
             validation = validate_telugu_speech(raw_transcript)
             if not validation['valid']:
+                # The probe windows passed, so this is not worth a second full pass
                 print(f"[WHISPER] ⚠ Telugu speech validation failed: {validation['reason']}")
-                print(f"[WHISPER] 🔄 Auto-switching to ENGLISH transcription...")
-                sys.stdout.flush()
-                
-                # AUTO-FALLBACK: Retry with English instead of failing
-                try:
-                    result_en = model.transcribe(
-                        audio_path,
-                        language='en',    # Switch to English
-                        fp16=False,
-                        no_speech_threshold=0.6
-                    )
-                    raw_transcript = result_en["text"]
-                    print(f"[WHISPER] ✓ Auto-switched to English transcription ({len(raw_transcript)} chars)")
-                    sys.stdout.flush()
-                    
-                    # Update language to English for rest of processing
-                    language = 'english'
-                    whisper_lang = 'en'
-                    lang_display = 'ENGLISH'
-                except Exception as retry_error:
-                    print(f"[WHISPER] ✗ English fallback also failed: {retry_error}")
-                    sys.stdout.flush()
-                    return {
-                        'success': False,
-                        'text': '',
-                        'error': 'ఈ వీడియోలో స్పీచ్ గుర్తించబడలేదు. (Speech not detected)',
-                        'is_music_only': True
-                    }
-            else:
-                print(f"[WHISPER] ✓ Telugu speech validated ({count_telugu_characters(raw_transcript)} Telugu chars)")
                 sys.stdout.flush()
+                return {
+                    'success': False,
+                    'text': '',
+                    'error': validation['reason'],
+                    'is_music_only': False
+                }
+            print(f"[WHISPER] ✓ Telugu speech validated ({count_telugu_characters(raw_transcript)} Telugu chars)")
+            sys.stdout.flush()
         
         # FIX 5: Clean the transcript based on language
         if language.lower() == 'telugu':
@@ -255,7 +377,7 @@ def whisper_transcribe(audio_path, language='english'):
                     'success': False,
                     'text': '',
                     'error': 'ఈ వీడియోలో తెలుగు స్పీచ్ కనుగొనబడలేదు. దయచేసి తెలుగు వీడియోను ఎంచుకోండి.',
-                    'is_music_only': True
+                    'is_music_only': False
                 }
         else:
             cleaned_transcript = clean_english_text(raw_transcript)
@@ -276,12 +398,14 @@ def whisper_transcribe(audio_path, language='english'):
         print(f"[WHISPER] ✓ {lang_display} transcription complete")
         sys.stdout.flush()
         
-        return {
+        result = {
             'success': True,
             'text': cleaned_transcript,
             'error': '',
             'is_music_only': False
         }
+        transcript_store.put(fingerprint, model_id, requested_language, result)
+        return result
     except Exception as e:
         print(f"[ERROR] Whisper transcription failed: {e}")
         sys.stdout.flush()
@@ -424,7 +548,22 @@ def _video_id_from_url(url):
 
 
 def _get_transcript(video_id):
-    """Fetch transcript for a YouTube video - tries multiple languages"""
+    """Fetch transcript for a YouTube video - tries multiple languages.
+    Fetched captions are kept in the transcript store, keyed by video id."""
+    from . import transcript_store
+    
+    cached = transcript_store.get('youtube:%s' % video_id, 'youtube-captions', 'any')
+    if cached is not None:
+        return cached.get('text')
+    
+    text = _fetch_transcript(video_id)
+    if text:
+        transcript_store.put('youtube:%s' % video_id, 'youtube-captions', 'any', {'text': text})
+    return text
+
+
+def _fetch_transcript(video_id):
+    """Fetch captions from YouTube, trying preferred languages first."""
     try:
         from youtube_transcript_api import YouTubeTranscriptApi
         
@@ -498,39 +637,9 @@ def _get_video_title(video_id):
 
 
 def _extract_key_points(text, num_points=5):
-    """Extract key points from text using sentence importance"""
-    sentences = [s.strip() for s in text.replace('\n', ' ').split('.') if len(s.strip()) > 20]
-    
-    if not sentences:
-        return []
-    
-    # Simple heuristic: longer sentences often contain more information
-    # and sentences with certain keywords are more important
-    # FIX 4: Added Telugu keywords for better Telugu summary extraction
-    important_keywords = [
-        # English keywords
-        'important', 'key', 'main', 'first', 'second', 'finally', 
-        'conclusion', 'summary', 'example', 'because', 'therefore',
-        # Telugu keywords (transliterated)
-        'ముఖ్యమైన', 'ముఖ్య', 'మొదటి', 'రెండవ', 'చివరగా',
-        'ఉదాహరణ', 'ఎందుకంటే', 'కారణంగా', 'అంటే', 'సారాంశం'
-    ]
-    
-    scored_sentences = []
-    for sent in sentences:
-        score = len(sent.split())  # Length score
-        sent_lower = sent.lower()
-        # Bonus for important keywords
-        for keyword in important_keywords:
-            if keyword in sent_lower or keyword in sent:  # Check both for Telugu
-                score += 10
-        scored_sentences.append((score, sent))
-    
-    # Sort by score and take top N
-    scored_sentences.sort(reverse=True, key=lambda x: x[0])
-    key_points = [sent for score, sent in scored_sentences[:num_points]]
-    
-    return key_points
+    """Extract key points from text using sentence importance (TF-IDF TextRank)"""
+    from .extractive import SentenceIndex
+    return SentenceIndex(text).key_points(num_points)
 
 
 def _generate_simple_summary(transcript, video_title=None, language='english'):
@@ -546,22 +655,22 @@ def _generate_simple_summary(transcript, video_title=None, language='english'):
     - Specific constraints: No timestamps, no personal opinions.
     """
     try:
+        from .extractive import SentenceIndex
+        
         # Clean transcript of any timestamp-like patterns
         clean_transcript = re.sub(r'\[\d+:\d+\]', '', transcript)
         
-        # Extract key points from original transcript (extractive approach)
-        key_points = _extract_key_points(clean_transcript, num_points=8)
-        
-        # Create a concise summary from the first part of transcript
-        sentences = [s.strip() + '.' for s in clean_transcript.split('.') if len(s.strip()) > 30]
-        main_idea_sentences = sentences[:3] if len(sentences) >= 3 else sentences
-        main_idea = ' '.join(main_idea_sentences)
+        # Tokenize and rank the sentences once; every section is read from the index
+        index = SentenceIndex(clean_transcript)
+        main_idea = index.main_idea(3)
+        key_points = index.key_points(8, skip_main_idea=3)
+        facts = index.facts(3)
         
         # Format based on language
         if language == 'telugu':
-            return _format_telugu_summary(main_idea, key_points, clean_transcript, video_title)
+            return _format_telugu_summary(main_idea, key_points, facts, video_title)
         else:
-            return _format_english_summary(main_idea, key_points, clean_transcript, video_title)
+            return _format_english_summary(main_idea, key_points, facts, video_title)
 
     except Exception as e:
         print(f"[ERROR] Summary generation failed: {e}")
@@ -569,83 +678,55 @@ def _generate_simple_summary(transcript, video_title=None, language='english'):
         return "(Could not generate detailed summary)"
 
 
-def _format_telugu_summary(main_idea, key_points, transcript, video_title=None):
-    """Format summary in Telugu language"""
+def _as_sentence(text):
+    text = text.strip()
+    return text if text.endswith(('.', '!', '?', '\u0964')) else text + '.'
+
+
+def _format_summary(labels, main_idea, key_points, facts, video_title=None):
+    """Lay out the summary sections under the given headings"""
     output = []
     
     if video_title:
-        output.append(f"వీడియో శీర్షిక: {video_title}\n")
+        output.append(f"{labels['title']}: {video_title}\n")
     
-    output.append("ముఖ్య విషయం:")
+    output.append(labels['main_idea'])
     output.append(f"  {main_idea}")
     output.append("")
     
     if key_points:
-        output.append("ముఖ్య అంశాలు:")
-        for i, point in enumerate(key_points, 1):
-            point = point.strip()
-            if not point.endswith('.'):
-                point += '.'
-            output.append(f"  • {point}")
+        output.append(labels['key_points'])
+        for point in key_points:
+            output.append(f"  • {_as_sentence(point)}")
         output.append("")
     
-    # Extract important facts
-    first_part = ' '.join(transcript.split()[:500])
-    facts = [s.strip() + '.' for s in first_part.split('.') 
-            if any(word in s.lower() for word in ['fact', 'discovered', 'result', 'research', 'shows', 'found'])]
-    
-    if not facts:
-        facts = [s.strip() + '.' for s in first_part.split('.') 
-                if any(word in s.lower() for word in ['example', 'for instance', 'such as'])]
-
     if facts:
-        output.append("ముఖ్యమైన వాస్తవాలు & ఉదాహరణలు:")
-        for fact in facts[:3]:
-            if len(fact) > 10:
-                output.append(f"  • {fact}")
+        output.append(labels['facts'])
+        for fact in facts:
+            output.append(f"  • {_as_sentence(fact)}")
         output.append("")
     
     return '\n'.join(output)
 
 
-def _format_english_summary(main_idea, key_points, transcript, video_title=None):
-    """Format summary in English language"""
-    output = []
-    
-    if video_title:
-        output.append(f"VIDEO TITLE: {video_title}\n")
-    
-    output.append("MAIN IDEA:")
-    output.append(f"  {main_idea}")
-    output.append("")
-    
-    if key_points:
-        output.append("KEY POINTS:")
-        for i, point in enumerate(key_points, 1):
-            point = point.strip()
-            if not point.endswith('.'):
-                point += '.'
-            output.append(f"  • {point}")
-        output.append("")
-    
-    # Highlight important facts
-    first_part = ' '.join(transcript.split()[:500])
-    facts = [s.strip() + '.' for s in first_part.split('.') 
-            if any(word in s.lower() for word in ['fact', 'discovered', 'result', 'research', 'shows', 'found'])]
-    
-    if not facts:
-        facts = [s.strip() + '.' for s in first_part.split('.') 
-                if any(word in s.lower() for word in ['example', 'for instance', 'such as'])]
+def _format_telugu_summary(main_idea, key_points, facts, video_title=None):
+    """Format summary in Telugu language"""
+    return _format_summary({
+        'title': "వీడియో శీర్షిక",
+        'main_idea': "ముఖ్య విషయం:",
+        'key_points': "ముఖ్య అంశాలు:",
+        'facts': "ముఖ్యమైన వాస్తవాలు & ఉదాహరణలు:",
+    }, main_idea, key_points, facts, video_title)
 
-    if facts:
-        output.append("IMPORTANT FACTS & EXAMPLES:")
-        for fact in facts[:3]:
-            if len(fact) > 10:
-                output.append(f"  • {fact}")
-        output.append("")
-    
-    return '\n'.join(output)
 
+def _format_english_summary(main_idea, key_points, facts, video_title=None):
+    """Format summary in English language"""
+    return _format_summary({
+        'title': "VIDEO TITLE",
+        'main_idea': "MAIN IDEA:",
+        'key_points': "KEY POINTS:",
+        'facts': "IMPORTANT FACTS & EXAMPLES:",
+    }, main_idea, key_points, facts, video_title)
 
 
 def summarize_youtube_simple(url_or_video_id, language='english'):
@@ -671,6 +752,13 @@ def summarize_youtube_simple(url_or_video_id, language='english'):
             sys.stdout.flush()
             transcript_text = None
 
+        if not transcript_text:
+            # Whisper ran on this video before: no need to download the audio again
+            from . import transcript_store
+            cached = transcript_store.get('youtube:%s' % video_id, _whisper_model_id(), language.lower())
+            if cached is not None:
+                transcript_text = cached.get('text', '')
+        
         if not transcript_text:
             print("[YOUTUBE] Captions not available. Attempting Whisper transcription...")
             sys.stdout.flush()
@@ -704,6 +792,8 @@ def summarize_youtube_simple(url_or_video_id, language='english'):
                 
                 # Extract validated transcript text
                 transcript_text = whisper_result.get('text', '')
+                transcript_store.put('youtube:%s' % video_id, _whisper_model_id(), language.lower(),
+                                     {'text': transcript_text})
                 
                 # Clean up audio file safely
                 try:
@@ -0,0 +1,49 @@
+"""Shard split points for multi-process ASR land in the quiet gaps between speech."""
+import os
+import sys
+
+import numpy as np
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from summarizer.asr_shards import find_split_points
+
+SR = 16000
+
+
+def _speech_with_gaps(duration, gaps, sr=SR):
+    """Loud noise everywhere except the given (start, end) silent gaps in seconds."""
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 0.2, int(duration * sr)).astype(np.float32)
+    for start, end in gaps:
+        audio[int(start * sr):int(end * sr)] = 0.0
+    return audio
+
+
+def test_cuts_move_to_nearby_silence():
+    # Ideal cuts at 60 s and 120 s; the quiet gaps are a few seconds off
+    gaps = [(66.0, 67.0), (111.0, 112.0)]
+    cuts = find_split_points(_speech_with_gaps(180.0, gaps), SR, 3)
+
+    assert len(cuts) == 2
+    for cut, (start, end) in zip(cuts, gaps):
+        assert start <= cut / float(SR) <= end
+
+
+def test_cuts_are_increasing_and_inside_the_audio():
+    audio = _speech_with_gaps(300.0, [])
+    cuts = find_split_points(audio, SR, 8)
+
+    assert len(cuts) == 7
+    assert cuts == sorted(set(cuts))
+    assert 0 < cuts[0] and cuts[-1] < len(audio)
+    # Without silence to pull them, cuts stay within the search radius of the ideal split
+    for k, cut in enumerate(cuts, 1):
+        assert abs(cut / float(SR) - k * 300.0 / 8) <= 300.0 / 8 / 4 + 0.1
+
+
+def test_single_shard_or_empty_audio_has_no_cuts():
+    assert find_split_points(_speech_with_gaps(120.0, []), SR, 1) == []
+    assert find_split_points(np.zeros(0, dtype=np.float32), SR, 4) == []
@@ -0,0 +1,75 @@
+"""ffmpeg trim/concat graph, keyframe snapping and a small end-to-end render."""
+import os
+import subprocess
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from summarizer import ffmpeg_render
+
+
+def test_graph_trims_and_concatenates_every_clip():
+    graph = ffmpeg_render.build_trim_concat_graph([(1.0, 2.5), (4.25, 6.0)])
+
+    assert graph.split(";") == [
+        "[0:v]trim=start=1.000:end=2.500,setpts=PTS-STARTPTS[v0]",
+        "[0:a]atrim=start=1.000:end=2.500,asetpts=PTS-STARTPTS[a0]",
+        "[0:v]trim=start=4.250:end=6.000,setpts=PTS-STARTPTS[v1]",
+        "[0:a]atrim=start=4.250:end=6.000,asetpts=PTS-STARTPTS[a1]",
+        "[v0][a0][v1][a1]concat=n=2:v=1:a=1[outv][outa]",
+    ]
+
+
+def test_graph_without_audio():
+    graph = ffmpeg_render.build_trim_concat_graph([(0.0, 1.0), (2.0, 3.0)], with_audio=False)
+
+    assert "atrim" not in graph
+    assert graph.endswith("[v0][v1]concat=n=2:v=1:a=0[outv]")
+
+
+def test_snap_moves_starts_back_to_keyframes_and_merges():
+    keyframes = [0.0, 2.0, 4.0, 6.0]
+    clips = [(6.5, 7.0), (2.5, 3.0), (3.5, 4.5), (4.0, 5.0)]
+
+    # 2.5 and 3.5 snap to 2.0 and overlap; 4.0 is already a keyframe and joins them
+    assert ffmpeg_render.snap_clips_to_keyframes(clips, keyframes) == [(2.0, 5.0), (6.0, 7.0)]
+    # Starts a hair before a keyframe are treated as on it
+    assert ffmpeg_render.snap_clips_to_keyframes([(3.9995, 5.0)], keyframes) == [(4.0, 5.0)]
+    assert ffmpeg_render.snap_clips_to_keyframes([(0.5, 1.0)], [1.0]) == [(0.0, 1.0)]
+    assert ffmpeg_render.snap_clips_to_keyframes([(1.0, 2.0)], []) == [(1.0, 2.0)]
+
+
+def _test_clip(path, seconds=6, gop=25):
+    subprocess.run(
+        [
+            ffmpeg_render._get_ffmpeg_cmd(), "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc=size=160x120:rate=25:duration={seconds}",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+            "-c:v", "libx264", "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0",
+            "-pix_fmt", "yuv420p", "-c:a", "aac", "-shortest", path,
+        ],
+        check=True,
+    )
+
+
+def test_keyframe_times_and_renders(tmp_path):
+    src = str(tmp_path / "src.mp4")
+    _test_clip(src)
+
+    keyframes = ffmpeg_render.keyframe_times(src)
+    assert [round(t, 2) for t in keyframes] == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+
+    out = str(tmp_path / "out.mp4")
+    assert ffmpeg_render.render_clips(src, [(0.5, 1.5), (3.0, 4.0)], out) is None
+    info = ffmpeg_render.probe_media(out)
+    assert info["has_video"] and info["has_audio"]
+    assert abs(info["duration"] - 2.0) < 0.15
+
+    fast = str(tmp_path / "fast.mp4")
+    assert ffmpeg_render.render_clips(src, [(1.5, 2.5), (4.2, 5.0)], fast, fast_cut=True) is None
+    # Snapped to (1.0, 2.5) and (4.0, 5.0); stream copy may run a few frames past each end
+    assert 2.45 < ffmpeg_render.probe_media(fast)["duration"] < 3.0
+    # Temporary render dirs are cleaned up
+    assert sorted(os.listdir(tmp_path)) == ["fast.mp4", "out.mp4", "src.mp4"]
@@ -0,0 +1,122 @@
+"""Keyframe deduplication on synthetic clips (needs OpenCV and ffmpeg)."""
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from summarizer.video_summarizer import summarize_video
+
+
+def _write_clip(path, frames, fps=24, size=(160, 120)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+def _frame_count(path):
+    cap = cv2.VideoCapture(path)
+    count = 0
+    while cap.grab():
+        count += 1
+    cap.release()
+    return count
+
+
+def _static_frames(n, size=(160, 120)):
+    # A gradient with some texture so the encoded clip is not trivially small
+    w, h = size
+    base = np.tile(np.linspace(0, 255, w, dtype=np.uint8), (h, 1))
+    frame = cv2.merge([base, base[::-1], np.full_like(base, 90)])
+    cv2.putText(frame, "static", (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+    return [frame.copy() for _ in range(n)]
+
+
+def test_static_clip_keeps_one_keyframe_per_max_gap(tmp_path):
+    clip = str(tmp_path / "static.mp4")
+    _write_clip(clip, _static_frames(24 * 30))  # 30 s of one still image
+    output = str(tmp_path / "summary.mp4")
+
+    summary = summarize_video(clip, output, interval=24, dedup_distance=4, dedup_max_gap_seconds=10)
+
+    assert os.path.getsize(output) >= 1024
+    # Candidates at 0, 1, ..., 29 s; everything but one per 10 s collapses
+    assert _frame_count(output) == 3
+    assert "27 keyframes collapsed" in summary
+
+
+def test_static_clip_without_max_gap_collapses_to_one_frame(tmp_path):
+    clip = str(tmp_path / "static.mp4")
+    _write_clip(clip, _static_frames(24 * 10))
+    output = str(tmp_path / "summary.mp4")
+
+    summary = summarize_video(clip, output, interval=24, dedup_distance=4, dedup_max_gap_seconds=None)
+
+    assert _frame_count(output) == 1
+    assert "9 keyframes collapsed" in summary
+
+
+def test_dedup_is_off_by_default(tmp_path, monkeypatch):
+    import importlib
+
+    from summarizer import pipeline
+
+    monkeypatch.delenv("KEYFRAME_DEDUP_DISTANCE", raising=False)
+    assert importlib.reload(pipeline).KEYFRAME_DEDUP_DISTANCE is None
+
+    clip = str(tmp_path / "static.mp4")
+    _write_clip(clip, _static_frames(24 * 10))
+    output = str(tmp_path / "summary.mp4")
+    summary = summarize_video(clip, output, interval=24)
+
+    assert _frame_count(output) == 10
+    assert "collapsed" not in summary
+
+
+def _drifting_frames(n, size=(160, 120)):
+    # A bar that slides slowly (small dHash steps) with a cut every 100 frames
+    w, h = size
+    frames = []
+    for i in range(n):
+        frame = np.full((h, w, 3), 40 + 60 * ((i // 100) % 3), dtype=np.uint8)
+        x = (i * 2) % (w - 20)
+        cv2.rectangle(frame, (x, 20), (x + 20, h - 20), (230, 230, 230), -1)
+        frames.append(frame)
+    return frames
+
+
+def _frame_means(path):
+    cap = cv2.VideoCapture(path)
+    means = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        means.append(float(frame.mean()))
+    cap.release()
+    return means
+
+
+def test_parallel_dedup_matches_sequential(tmp_path):
+    from summarizer.video_summarizer import _has_libx264
+
+    if not _has_libx264():
+        pytest.skip("parallel summary needs ffmpeg with libx264")
+    clip = str(tmp_path / "drift.mp4")
+    _write_clip(clip, _drifting_frames(24 * 20))
+    sequential = str(tmp_path / "sequential.mp4")
+    parallel = str(tmp_path / "parallel.mp4")
+
+    seq_summary = summarize_video(clip, sequential, interval=4, dedup_distance=6, workers=1)
+    par_summary = summarize_video(clip, parallel, interval=4, dedup_distance=6, workers=4)
+
+    assert par_summary == seq_summary
+    seq_means, par_means = _frame_means(sequential), _frame_means(parallel)
+    assert len(par_means) == len(seq_means)
+    assert np.allclose(par_means, seq_means, atol=3.0)
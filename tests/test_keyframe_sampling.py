@@ -0,0 +1,43 @@
+"""Keyframe sampling modes return the same frames (needs OpenCV)."""
+import os
+import sys
+
+import cv2
+import numpy as np
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from summarizer.video_summarizer import _SEEK_MIN_GAP, _iter_keyframes
+
+
+def _numbered_clip(path, n, size=(160, 120)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 24, size)
+    for i in range(n):
+        frame = np.full((size[1], size[0], 3), (i * 7) % 256, dtype=np.uint8)
+        cv2.putText(frame, str(i), (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+        writer.write(frame)
+    writer.release()
+
+
+def _frames(path, sampling, indices):
+    cap = cv2.VideoCapture(path)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    frames = dict(_iter_keyframes(cap, total, sampling=sampling, indices=indices))
+    cap.release()
+    return frames
+
+
+def test_seek_matches_grab_for_near_and_far_indices(tmp_path):
+    path = str(tmp_path / "numbered.mp4")
+    _numbered_clip(path, 3 * _SEEK_MIN_GAP)
+    # Gaps below _SEEK_MIN_GAP are grabbed, larger ones seek
+    indices = [3, 4, 20, _SEEK_MIN_GAP + 50, _SEEK_MIN_GAP + 51, 3 * _SEEK_MIN_GAP - 1]
+
+    grabbed = _frames(path, "grab", indices)
+    sought = _frames(path, "seek", indices)
+
+    assert sorted(sought) == sorted(grabbed) == indices
+    for i in indices:
+        assert np.abs(sought[i].astype(int) - grabbed[i]).mean() < 1.0
@@ -0,0 +1,84 @@
+"""Model server batching and client behaviour with a fake pipeline (no models)."""
+import os
+import sys
+import threading
+import time
+from multiprocessing.connection import Listener
+
+import pytest
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from summarizer import model_server
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    calls = []
+
+    def factory(op):
+        def pipe(items, **kwargs):
+            calls.append((op, list(items), kwargs.get("batch_size")))
+            if items and items[0] == "slow":
+                time.sleep(2.5)
+            return ["out:%s" % i for i in items]
+        return pipe
+
+    monkeypatch.setattr(model_server, "_local_pipeline", factory)
+    return calls
+
+
+def test_batcher_merges_requests_with_caller_batch_size(fake_pipeline):
+    batcher = model_server._Batcher("summarize", 8, 0.1)
+    results = {}
+
+    def submit(i):
+        results[i] = batcher.submit(["a%d" % i, "b%d" % i], {"batch_size": 2})
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(fake_pipeline) == 1
+    _op, items, batch_size = fake_pipeline[0]
+    assert len(items) == 6 and batch_size == 2
+    assert results == {i: ["out:a%d" % i, "out:b%d" % i] for i in range(3)}
+
+
+def test_slow_reply_is_awaited_not_rerun_locally(fake_pipeline, tmp_path, monkeypatch):
+    address = str(tmp_path / "models.sock")
+    threading.Thread(target=model_server.serve, args=(address,), daemon=True).start()
+    while not os.path.exists(address):
+        time.sleep(0.05)
+    monkeypatch.setenv("MODEL_SERVER_SOCKET", address)
+    monkeypatch.setattr(model_server, "MODEL_SERVER_PING_S", 0.5)
+    model_server._drop_connection()
+
+    assert model_server.remote_pipeline("summarize")(["slow"]) == ["out:slow"]
+    # Only the server ran it
+    assert [items for _op, items, _bs in fake_pipeline] == [["slow"]]
+    model_server._drop_connection()
+
+
+def test_unresponsive_server_fails_without_local_run(fake_pipeline, tmp_path, monkeypatch):
+    address = str(tmp_path / "wedged.sock")
+    listener = Listener(address, family="AF_UNIX", authkey=model_server._authkey())
+    held = []
+
+    def accept_once():
+        held.append(listener.accept())
+        held[0].recv()  # takes the request, then never answers or accepts again
+
+    threading.Thread(target=accept_once, daemon=True).start()
+    monkeypatch.setenv("MODEL_SERVER_SOCKET", address)
+    monkeypatch.setattr(model_server, "MODEL_SERVER_PING_S", 0.3)
+    model_server._drop_connection()
+
+    with pytest.raises(RuntimeError, match="stopped responding"):
+        model_server.remote_pipeline("summarize")(["x"])
+    assert fake_pipeline == []
+    listener.close()
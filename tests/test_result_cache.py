@@ -0,0 +1,124 @@
+"""Result cache storage, lookup and eviction on a temporary uploads folder."""
+import io
+import json
+import os
+import sys
+import time
+import uuid
+
+import pytest
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from summarizer import jobs, result_cache
+
+
+class _Upload:
+    """Minimal stand-in for werkzeug's FileStorage."""
+
+    def __init__(self, data, filename="clip.mp4"):
+        self.stream = io.BytesIO(data)
+        self.filename = filename
+
+
+def _age(path, seconds):
+    """Backdate every file and folder under path."""
+    when = time.time() - seconds
+    for dirpath, _dirs, files in os.walk(path):
+        for name in files:
+            os.utime(os.path.join(dirpath, name), (when, when))
+        os.utime(dirpath, (when, when))
+
+
+def _write(path, size):
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+
+
+def _job_folder(upload_folder):
+    """Output folder of a finished job, as the job worker would use it."""
+    path = jobs.job_dir(upload_folder, uuid.uuid4().hex)
+    os.makedirs(path)
+    return path
+
+
+def _store_entry(upload_folder, size, age_s=None):
+    """Store one upload with a stage artifact of `size` bytes; returns its hash."""
+    _path, digest = result_cache.save_upload(_Upload(os.urandom(1024)), upload_folder)
+    output_dir = _job_folder(upload_folder)
+    _write(os.path.join(output_dir, "summary_video.mp4"), size)
+    result_cache.store(upload_folder, digest, "keyframes", {"interval": 30}, {"summary": "s"},
+                       output_dir, artifacts=("summary_video.mp4",))
+    if age_s is not None:
+        _age(os.path.join(result_cache.cache_root(upload_folder), digest), age_s)
+        _age(output_dir, age_s)
+    return digest, output_dir
+
+
+def test_identical_uploads_are_stored_once(tmp_path):
+    folder = str(tmp_path)
+    first, digest = result_cache.save_upload(_Upload(b"x" * 5000), folder)
+    second, digest2 = result_cache.save_upload(_Upload(b"x" * 5000), folder)
+    assert first == second and digest == digest2
+    assert os.listdir(os.path.dirname(first)) == ["source.mp4"]
+
+
+def test_store_and_lookup_link_artifacts(tmp_path):
+    folder = str(tmp_path)
+    digest, output_dir = _store_entry(folder, 4096)
+
+    target = _job_folder(folder)
+    hit = result_cache.lookup(folder, digest, "keyframes", {"interval": 30}, target)
+    assert hit == {"summary": "s"}
+    assert os.path.samefile(os.path.join(target, "summary_video.mp4"),
+                            os.path.join(output_dir, "summary_video.mp4"))
+    assert result_cache.lookup(folder, digest, "keyframes", {"interval": 60}, target) is None
+
+
+def test_eviction_skips_recent_entries(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_MIN_AGE_S", 3600)
+    old, _ = _store_entry(folder, 200_000, age_s=7200)
+    new, _ = _store_entry(folder, 200_000)
+
+    result_cache.enforce_size_limit(folder, max_bytes=250_000)
+
+    cache = os.listdir(result_cache.cache_root(folder))
+    assert old not in cache and new in cache
+
+
+def test_eviction_skips_uploads_of_active_jobs(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_MIN_AGE_S", 0)
+    busy, _ = _store_entry(folder, 200_000, age_s=7200)
+    idle, _ = _store_entry(folder, 200_000, age_s=3600)
+    job_id = uuid.uuid4().hex
+    os.makedirs(os.path.join(folder, "jobs", job_id))
+    with open(os.path.join(folder, "jobs", job_id, "job.json"), "w", encoding="utf-8") as f:
+        json.dump({"id": job_id, "status": "running", "upload_hash": busy,
+                   "owner_pid": os.getpid(), "created": time.time()}, f)
+
+    result_cache.enforce_size_limit(folder, max_bytes=250_000)
+
+    cache = os.listdir(result_cache.cache_root(folder))
+    assert busy in cache and idle not in cache
+
+
+def test_eviction_counts_only_freed_hard_links(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_MIN_AGE_S", 0)
+    # Two uploads whose artifacts are also linked from their job folders
+    first, first_out = _store_entry(folder, 300_000, age_s=7200)
+    second, second_out = _store_entry(folder, 300_000, age_s=3600)
+    # Make the job folders the most recently used, so cache entries go first
+    _age(first_out, 10)
+    _age(second_out, 10)
+
+    result_cache.enforce_size_limit(folder, max_bytes=350_000)
+
+    # Removing a cache entry frees nothing while its job folder still links the
+    # file, so eviction must go on until the disk really is under the limit
+    usage, _ = result_cache._tree_usage(folder, set())
+    assert usage <= 350_000
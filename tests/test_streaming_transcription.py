@@ -0,0 +1,61 @@
+"""Streaming transcription with a stub transcriber (needs ffmpeg, no models)."""
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from summarizer import auto_caption
+
+
+def _write_tone(path, seconds, sr=16000):
+    t = np.arange(int(seconds * sr)) / float(sr)
+    samples = (0.3 * np.sin(2 * np.pi * 440 * t) * 32767).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sr)
+        f.writeframes(samples.tobytes())
+
+
+def test_slow_window_does_not_trip_idle_timeout(tmp_path, monkeypatch):
+    path = str(tmp_path / "tone.wav")
+    _write_tone(path, 35)
+    calls = []
+
+    def slow_transcribe(audio, **kwargs):
+        # Much longer than the idle timeout while ffmpeg sits on a full pipe
+        time.sleep(1.2)
+        calls.append(len(audio["array"]))
+        duration = len(audio["array"]) / float(audio["sampling_rate"])
+        return {"text": "x", "srt": "", "segments": [{"text": "x", "timestamp": (0.0, duration)}],
+                "error": None}
+
+    monkeypatch.setattr(auto_caption, "AUDIO_IDLE_TIMEOUT", 0.5)
+    monkeypatch.setattr(auto_caption, "transcribe_audio", slow_transcribe)
+
+    segments = list(auto_caption.iter_transcript_segments(path, window_s=5))
+
+    assert len(segments) == len(calls) >= 2
+    assert sum(calls) == 35 * 16000
+    assert segments[-1]["timestamp"][1] == 35.0
+
+
+def test_speech_regions_cover_windows_without_vad(tmp_path, monkeypatch):
+    path = str(tmp_path / "tone.wav")
+    _write_tone(path, 30)
+
+    def transcribe(audio, **kwargs):
+        return {"text": "", "srt": "", "segments": [], "error": None}
+
+    monkeypatch.setattr(auto_caption, "transcribe_audio", transcribe)
+    regions = []
+    list(auto_caption.iter_transcript_segments(path, window_s=5, speech_regions=regions))
+
+    assert regions[0][0] == 0.0 and regions[-1][1] == 30.0
+    assert all(a[1] == b[0] for a, b in zip(regions, regions[1:]))
@@ -0,0 +1,92 @@
+"""Transcript cache keying, TTL invalidation and LRU eviction against a temporary SQLite file."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from summarizer import transcript_store
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(transcript_store, "TRANSCRIPT_CACHE_DB", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(transcript_store, "TRANSCRIPT_CACHE_ENABLED", True)
+    monkeypatch.setattr(transcript_store, "TRANSCRIPT_CACHE_TTL_DAYS", 1.0)
+    monkeypatch.setattr(transcript_store.time, "time", clock.time)
+    transcript_store._local.conn = None
+    yield clock
+    conn = getattr(transcript_store._local, "conn", None)
+    if conn is not None:
+        conn.close()
+    transcript_store._local.conn = None
+
+
+def test_fingerprint_matches_incremental_pcm():
+    rng = np.random.default_rng(1)
+    audio = rng.uniform(-1.0, 1.0, 50000).astype(np.float32)
+    fp = transcript_store.PcmFingerprint()
+    pcm = np.clip(np.rint(audio * 32768.0), -32768, 32767).astype(np.int16)
+    for i in range(0, len(pcm), 7000):
+        fp.update(pcm[i:i + 7000])
+
+    assert fp.hexdigest() == transcript_store.audio_fingerprint(audio)
+    assert transcript_store.audio_fingerprint(audio[:-1]) != fp.hexdigest()
+
+
+def test_entries_are_keyed_by_source_model_and_language(store):
+    transcript_store.put("audio-1", "small", "auto", {"text": "hello"})
+
+    assert transcript_store.get("audio-1", "small") == {"text": "hello"}
+    assert transcript_store.get("audio-1", "base") is None
+    assert transcript_store.get("audio-1", "small", "en") is None
+    assert transcript_store.get("audio-2", "small") is None
+
+    transcript_store.put("audio-1", "small", "auto", {"text": "updated"})
+    assert transcript_store.get("audio-1", "small") == {"text": "updated"}
+
+
+def test_expired_entries_are_dropped(store):
+    transcript_store.put("audio-1", "small", "auto", {"text": "old"})
+    store.now += 86400 + 1
+
+    assert transcript_store.get("audio-1", "small") is None
+    conn = transcript_store._connect()
+    assert conn.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0] == 0
+
+
+def test_least_recently_used_entries_are_evicted(store, monkeypatch):
+    blob = {"text": "x" * 400}
+    # Room for two ~410-byte entries but not three
+    monkeypatch.setattr(transcript_store, "TRANSCRIPT_CACHE_MAX_MB", 1000 / (1024.0 * 1024.0))
+    transcript_store.put("a", "small", "auto", blob)
+    store.now += 1
+    transcript_store.put("b", "small", "auto", blob)
+    store.now += 1
+    assert transcript_store.get("a", "small") == blob  # "b" is now the least recently used
+    store.now += 1
+    transcript_store.put("c", "small", "auto", blob)
+
+    assert transcript_store.get("b", "small") is None
+    assert transcript_store.get("a", "small") == blob
+    assert transcript_store.get("c", "small") == blob
+
+
+def test_disabled_cache_is_a_no_op(store, monkeypatch):
+    monkeypatch.setattr(transcript_store, "TRANSCRIPT_CACHE_ENABLED", False)
+    transcript_store.put("audio-1", "small", "auto", {"text": "hello"})
+    assert transcript_store.get("audio-1", "small") is None
+    assert not os.path.exists(transcript_store.TRANSCRIPT_CACHE_DB)
@@ -0,0 +1,66 @@
+"""Energy VAD and the compact/remap timeline round trip on synthetic audio."""
+import os
+import sys
+
+import numpy as np
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from summarizer.vad import compact_audio, detect_speech, intersect_regions, remap_time, speech_coverage
+
+SR = 16000
+
+
+def _bursts(spans, duration, sr=SR):
+    """Faint noise with 300 Hz tone bursts at the given (start, end) seconds."""
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 1e-3, int(duration * sr)).astype(np.float32)
+    for start, end in spans:
+        t = np.arange(int(start * sr), int(end * sr)) / float(sr)
+        audio[int(start * sr):int(end * sr)] += 0.3 * np.sin(2 * np.pi * 300 * t)
+    return audio
+
+
+def test_detect_speech_finds_bursts():
+    spans = [(1.0, 2.5), (5.0, 6.0), (8.0, 9.5)]
+    regions = detect_speech(_bursts(spans, 10.0), SR, pad=0.0)
+
+    assert len(regions) == 3
+    for (s, e), (rs, re_) in zip(spans, regions):
+        assert abs(rs - s) < 0.1 and abs(re_ - e) < 0.1
+    assert 0.35 < speech_coverage(regions, 10.0) < 0.45
+
+
+def test_detect_speech_ignores_silence():
+    assert detect_speech(np.zeros(SR * 5, dtype=np.float32), SR) == []
+    assert detect_speech(np.zeros(0, dtype=np.float32), SR) == []
+
+
+def test_compact_and_remap_round_trip():
+    audio = np.arange(SR * 10, dtype=np.float32)
+    regions = [(1.0, 2.5), (5.0, 6.0), (8.0, 9.5)]
+    compact, offsets = compact_audio(audio, SR, regions)
+
+    assert len(compact) == int(4.0 * SR)
+    assert [o[0] for o in offsets] == [0.0, 1.5, 2.5]
+    # Every compact sample maps back to the original sample it was copied from
+    for t in (0.0, 0.75, 1.5, 2.2, 2.5, 3.99):
+        original = remap_time(t, offsets)
+        assert compact[int(round(t * SR))] == audio[int(round(original * SR))]
+    assert remap_time(1.5, offsets) == 5.0
+    assert remap_time(4.0, offsets) == 9.5  # clamped to the end of the last region
+    assert remap_time(None, offsets) is None
+
+
+def test_compact_without_regions_is_empty():
+    compact, offsets = compact_audio(np.ones(SR, dtype=np.float32), SR, [])
+    assert len(compact) == 0 and offsets == []
+    assert remap_time(3.0, offsets) == 3.0
+
+
+def test_intersect_regions_trims_clips_to_speech():
+    clips = [(0.0, 4.0), (7.0, 10.0)]
+    regions = [(1.0, 2.0), (3.8, 8.0), (9.0, 9.2)]
+    assert intersect_regions(clips, regions) == [(1.0, 2.0), (7.0, 8.0)]